@@ -0,0 +1,131 @@
+"""
+Benchmark de la analítica de clústeres: las funciones densas del notebook
+(X.toarray() + PCA) frente a cluster_analytics (CSR + TruncatedSVD), y KMeans
+frente a MiniBatchKMeans, con 10k, 100k y 1M documentos.
+
+El corpus es el sintético de benchmark_search.py, vectorizado como en el notebook
+(TfidfVectorizer con max_features=3000). El pico de memoria es el de tracemalloc
+durante cada operación (numpy y scipy le informan de sus arrays). Las funciones
+densas se omiten cuando X.toarray() pasaría de --max-dense-gb.
+
+Uso:
+    python benchmark_clusters.py --docs 10000 100000 1000000 --k 6
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmark_search import make_corpus
+from cluster_analytics import cluster_documents, medoid_titles_per_cluster, project_2d, top_terms_per_cluster
+
+
+# Funciones del notebook, tal cual
+
+def notebook_top_terms_per_cluster(X, labels, vectorizer, top_n=6):
+    X_dense = X.toarray()
+    terms = np.array(vectorizer.get_feature_names_out())
+    rows = []
+    for c in sorted(set(labels)):
+        mask = labels == c
+        mean_vec = X_dense[mask].mean(axis=0)
+        top_idx = np.argsort(-mean_vec)[:top_n]
+        rows.append({"cluster": c, "top_terms": ", ".join(terms[top_idx])})
+    return pd.DataFrame(rows)
+
+
+def notebook_medoid_titles_per_cluster(X, labels, titles):
+    X_dense = X.toarray()
+    out = []
+    for c in sorted(set(labels)):
+        mask = labels == c
+        Xc = X_dense[mask]
+        centroid = Xc.mean(axis=0, keepdims=True)
+        sims = cosine_similarity(Xc, centroid).ravel()
+        best_local_idx = int(np.argmax(sims))
+        global_idxs = np.where(labels == c)[0]
+        best_global_idx = int(global_idxs[best_local_idx])
+        out.append({
+            "cluster": int(c),
+            "medoid_title": titles[best_global_idx],
+            "similarity_to_center": float(sims[best_local_idx])
+        })
+    return pd.DataFrame(out).sort_values("cluster")
+
+
+def notebook_pca(X):
+    return PCA(n_components=2, random_state=42).fit_transform(X.toarray())
+
+
+def measure(function, *args):
+    """(segundos, MB de pico, resultado) de function(*args)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analítica de clústeres densa frente a dispersa")
+    parser.add_argument("--docs", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--max-features", type=int, default=3000)
+    parser.add_argument("--max-dense-gb", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'docs':>9} {'operación':44} {'s':>8} {'MB pico':>9}")
+    for n_docs in args.docs:
+        docs = make_corpus(n_docs)
+        titles = [f"Documento {i}" for i in range(n_docs)]
+        vectorizer = TfidfVectorizer(max_features=args.max_features)
+        X = vectorizer.fit_transform(docs)
+        del docs
+        dense_gb = X.shape[0] * X.shape[1] * 8 / 2**30
+        csr_mb = (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 2**20
+
+        rows = []
+        for name, method in (("KMeans (n_init=10)", "kmeans"), ("MiniBatchKMeans", "minibatch")):
+            seconds, peak, labels = measure(cluster_documents, X, args.k, method)
+            rows.append((name, seconds, peak))
+
+        dense_rows = [
+            ("top_terms_per_cluster", notebook_top_terms_per_cluster, (X, labels, vectorizer)),
+            ("medoid_titles_per_cluster", notebook_medoid_titles_per_cluster, (X, labels, titles)),
+            ("proyección 2D (PCA)", notebook_pca, (X,)),
+        ]
+        sparse_rows = [
+            ("top_terms_per_cluster", top_terms_per_cluster, (X, labels, vectorizer)),
+            ("medoid_titles_per_cluster", medoid_titles_per_cluster, (X, labels, titles)),
+            ("proyección 2D (TruncatedSVD)", project_2d, (X,)),
+        ]
+        for (name, dense, dense_args), (sparse_name, sparse, sparse_args) in zip(dense_rows, sparse_rows):
+            if dense_gb <= args.max_dense_gb:
+                seconds, peak, expected = measure(dense, *dense_args)
+                rows.append((f"notebook  {name}", seconds, peak))
+            else:
+                rows.append((f"notebook  {name}", None, f"omitido: X denso = {dense_gb:.1f} GB"))
+                expected = None
+            seconds, peak, result = measure(sparse, *sparse_args)
+            rows.append((f"disperso  {sparse_name}", seconds, peak))
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(result, expected)
+
+        print(f"{n_docs:>9} X: {X.shape[0]} × {X.shape[1]}, nnz {X.nnz}, CSR {csr_mb:.0f} MB")
+        for name, seconds, peak in rows:
+            if seconds is None:
+                print(f"{'':9} {name:44} {'':>8} {peak}")
+            else:
+                print(f"{'':9} {name:44} {seconds:8.2f} {peak:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
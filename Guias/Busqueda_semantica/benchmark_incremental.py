@@ -0,0 +1,71 @@
+"""
+Benchmark de la indexación incremental: tiempo de añadir lotes de documentos a
+un corpus ya indexado con IncrementalIndex.add, frente a rehacer lo que hace el
+notebook (TfidfVectorizer + KMeans(n_init=10) + índice exacto) con el corpus completo.
+
+El corpus es el sintético de benchmark_search.py. El reajuste del notebook se
+mide con --refit-docs documentos como máximo (con 1M documentos y n_init=10
+tarda varios minutos); se indica con cuántos.
+
+Uso:
+    python benchmark_incremental.py --docs 1000000 --batch 1000 --batches 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from benchmark_search import make_corpus, timed
+from incremental_index import IncrementalIndex
+from search_index import ExactIndex
+
+
+def notebook_refit(docs, k):
+    """Lo que haría el notebook al cambiar `docs`: vectorizar, agrupar e indexar de nuevo."""
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    X = vectorizer.fit_transform(docs)
+    labels = KMeans(n_clusters=k, n_init=10, random_state=42).fit_predict(X)
+    return vectorizer, labels, ExactIndex(X)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Añadir documentos a un índice frente a reconstruirlo")
+    parser.add_argument("--docs", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--refit-docs", type=int, default=200000,
+                        help="documentos como máximo para medir el reajuste del notebook")
+    args = parser.parse_args()
+
+    docs = make_corpus(args.docs + args.batch * args.batches)
+    titles = [f"Documento {i}" for i in range(len(docs))]
+    base = slice(0, args.docs)
+
+    incremental = IncrementalIndex(n_clusters=args.k)
+    seconds, _ = timed(incremental.fit, titles[base], docs[base])
+    print(f"Construcción inicial ({args.docs} documentos): {seconds:.1f} s")
+
+    print(f"{'lote':>5} {'documentos':>11} {'add (s)':>9} {'deriva':>8} {'reconstruido':>13}")
+    for batch in range(args.batches):
+        new = slice(args.docs + batch * args.batch, args.docs + (batch + 1) * args.batch)
+        rebuilds = incremental.rebuilds
+        seconds, _ = timed(incremental.add, titles[new], docs[new])
+        print(f"{batch + 1:>5} {len(incremental):>11} {seconds:9.2f} {incremental.drift():8.4f} "
+              f"{'sí' if incremental.rebuilds > rebuilds else 'no':>13}")
+
+    top = incremental.search(docs[args.docs], top_k=1)
+    print(f"Búsqueda de un documento añadido: {top['titulo'][0]} (score {top['score'][0]:.3f})")
+
+    refit_docs = min(args.refit_docs, len(docs))
+    seconds, _ = timed(notebook_refit, docs[:refit_docs], args.k)
+    print(f"Reajuste del notebook ({refit_docs} documentos): {seconds:.1f} s")
+    if refit_docs < len(docs):
+        print(f"  (con {len(docs)} documentos crece al menos {len(docs) / refit_docs:.0f} veces)")
+
+
+if __name__ == "__main__":
+    main()
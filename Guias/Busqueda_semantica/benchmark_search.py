@@ -0,0 +1,112 @@
+"""
+Benchmark de la búsqueda semántica: la función del notebook (cosine_similarity +
+argsort por consulta) frente a ExactIndex e IVFIndex con consultas por lotes.
+
+El corpus es sintético: cada documento toma la mayoría de sus palabras del
+vocabulario propio de un tema y el resto del vocabulario común (las dos con
+distribución de Zipf), de modo que el TF-IDF tiene la estructura de temas que
+aprovecha el IVF. Las consultas son documentos cortos de
+los mismos temas. Se mide consultas/s y recall@k respecto a la búsqueda exacta
+(un resultado empatado en score con el k-ésimo exacto cuenta como acierto).
+
+Uso:
+    python benchmark_search.py --docs 200000 --queries 1000 --top-k 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from search_index import ExactIndex, IVFIndex, load_index
+
+
+def make_corpus(n_docs, n_topics=100, vocabulary=50000, topic_words=2000, words=40, general=0.25, seed=0):
+    """
+    Documentos sintéticos de `words` palabras: la mayoría del vocabulario propio de
+    un tema elegido al azar y una fracción `general` del vocabulario común.
+    """
+    rng = np.random.default_rng(seed)
+    layout = np.random.default_rng(1000)
+    # Cada tema tiene su subconjunto de palabras (los temas pueden compartir algunas)
+    topics_vocabulary = np.stack([layout.choice(vocabulary, size=topic_words, replace=False)
+                                  for _ in range(n_topics)])
+    zipf_topic = 1 / np.arange(1, topic_words + 1) ** 1.1
+    zipf_general = 1 / np.arange(1, vocabulary + 1) ** 1.1
+    topics = rng.integers(0, n_topics, size=n_docs)
+    tokens = topics_vocabulary[topics[:, None],
+                               rng.choice(topic_words, size=(n_docs, words), p=zipf_topic / zipf_topic.sum())]
+    from_general = rng.random((n_docs, words)) < general
+    tokens[from_general] = rng.choice(vocabulary, size=int(from_general.sum()), p=zipf_general / zipf_general.sum())
+    return [" ".join(f"w{token}" for token in row) for row in tokens]
+
+
+def notebook_search(q_vec, X, top_k):
+    """El núcleo de semantic_search del notebook, para una consulta."""
+    sims = cosine_similarity(q_vec, X)[0]
+    idx_sorted = np.argsort(-sims)[:top_k]
+    return sims[idx_sorted], idx_sorted
+
+
+def recall_at_k(exact_scores, scores):
+    # Aciertos: resultados con score al menos el del k-ésimo exacto
+    threshold = exact_scores[:, -1:] - 1e-6
+    return float(np.mean(np.minimum((scores >= threshold).sum(axis=1), exact_scores.shape[1]) / exact_scores.shape[1]))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas/s y recall@k de los índices de búsqueda")
+    parser.add_argument("--docs", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--notebook-queries", type=int, default=50, help="consultas medidas con la función del notebook")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    docs = make_corpus(args.docs)
+    queries = [" ".join(doc.split()[:8]) for doc in make_corpus(args.queries, seed=1)]
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    X = vectorizer.fit_transform(docs)
+    Q = vectorizer.transform(queries)
+    print(f"{args.docs} documentos, vocabulario {X.shape[1]}, nnz {X.nnz}; {args.queries} consultas, top_k={args.top_k}\n")
+
+    n = args.notebook_queries
+    seconds, results = timed(lambda: [notebook_search(Q[i], X, args.top_k) for i in range(n)])
+    rows = [("notebook (cosine_similarity + argsort)", "", n / seconds, None)]
+
+    build, exact = timed(ExactIndex, X)
+    seconds, (exact_scores, exact_ids) = timed(exact.search, Q, args.top_k)
+    assert np.allclose(exact_scores[:n], np.array([scores for scores, _ in results]), atol=1e-5)
+    rows.append(("ExactIndex (argpartition, por lotes)", f"{build:.1f} s", args.queries / seconds, 1.0))
+
+    build, ivf = timed(IVFIndex, X)
+    for n_probe in args.n_probe:
+        ivf.n_probe = n_probe
+        seconds, (scores, _) = timed(ivf.search, Q, args.top_k)
+        rows.append((f"IVFIndex n_lists={ivf.n_lists} n_probe={n_probe}", f"{build:.1f} s",
+                     args.queries / seconds, recall_at_k(exact_scores, scores)))
+
+    print(f"{'':42} {'construcción':>12} {'consultas/s':>12} {'recall@' + str(args.top_k):>10}")
+    for name, build, qps, recall in rows:
+        print(f"{name:42} {build:>12} {qps:12.0f} {'' if recall is None else f'{recall:.3f}':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "indice.npz")
+        seconds_save, _ = timed(ivf.save, path)
+        seconds_load, _ = timed(load_index, path)
+        print(f"\nIVFIndex: save {seconds_save:.2f} s, load_index {seconds_load:.2f} s, "
+              f"{os.path.getsize(path) / 2**20:.0f} MB en disco")
+
+
+if __name__ == "__main__":
+    main()
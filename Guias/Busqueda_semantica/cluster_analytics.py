@@ -0,0 +1,136 @@
+"""
+Análisis de clústeres sobre la matriz TF-IDF dispersa, sin X.toarray().
+
+Las funciones top_terms_per_cluster, medoid_titles_per_cluster y la celda de PCA
+del notebook convierten X en una matriz densa N × V: con 100.000 documentos y
+3.000 términos son 2,4 GB. Aquí todo se calcula sobre la matriz CSR:
+
+- cluster_means: medias por clúster como un producto disperso indicadora × X (k × V).
+- top_terms_per_cluster y medoid_titles_per_cluster: mismos DataFrames que el
+  notebook, a partir de esas medias. El medoide es, como en el notebook, el
+  documento con mayor similitud coseno con la media de su clúster.
+- project_2d: TruncatedSVD, que trabaja sobre la matriz dispersa. A diferencia
+  de PCA no centra los datos (centrar X la haría densa); en TF-IDF la primera
+  componente recoge esa media y el dibujo se parece al de PCA, no es idéntico.
+- cluster_documents: KMeans como en el notebook, o MiniBatchKMeans para corpus
+  grandes.
+
+Uso:
+    clusters = cluster_documents(X, k=6)                      # o method="minibatch"
+    top_terms_per_cluster(X, clusters, vectorizer, top_n=6)
+    medoid_titles_per_cluster(X, clusters, titles)
+    coords_2d = project_2d(X)
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.utils.extmath import row_norms
+
+CLUSTERING_METHODS = ("kmeans", "minibatch")
+# Filas de X que se multiplican por las medias de una vez (bloques N × k densos)
+BLOCK_ROWS = 65536
+
+
+def cluster_documents(X, k, method="kmeans", random_state=42):
+    """
+    Asigna un clúster a cada documento.
+
+    Args:
+        X: Matriz documentos × vocabulario (TF-IDF)
+        k: Número de clústeres
+        method: "kmeans" (KMeans, n_init=10, como el notebook) o "minibatch"
+            (MiniBatchKMeans: cada paso usa un lote de documentos, para corpus grandes)
+        random_state: Semilla
+
+    Returns:
+        Etiqueta de clúster de cada documento (array de N enteros)
+    """
+    if method == "kmeans":
+        model = KMeans(n_clusters=k, n_init=10, random_state=random_state)
+    elif method == "minibatch":
+        model = MiniBatchKMeans(n_clusters=k, n_init=3, batch_size=4096, random_state=random_state)
+    else:
+        raise ValueError(f"method debe ser uno de {CLUSTERING_METHODS}, no {method!r}")
+    return model.fit_predict(X)
+
+
+def cluster_means(X, labels):
+    """
+    Media de los documentos de cada clúster, sin densificar X.
+
+    Args:
+        X: Matriz documentos × vocabulario (dispersa o densa)
+        labels: Clúster de cada documento
+
+    Returns:
+        (clusters, means): etiquetas ordenadas y matriz densa k × vocabulario
+    """
+    labels = np.asarray(labels)
+    clusters, positions, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    # Indicadora k × N con 1/tamaño del clúster: su producto por X da las medias
+    weights = sp.csr_matrix((1 / counts[positions], (positions, np.arange(labels.shape[0]))),
+                            shape=(clusters.shape[0], labels.shape[0]))
+    means = weights @ X
+    return clusters, means.toarray() if sp.issparse(means) else np.asarray(means)
+
+
+def top_terms_per_cluster(X, labels, vectorizer, top_n=6):
+    """Términos con mayor peso medio en cada clúster (mismo DataFrame que el notebook)."""
+    import pandas as pd
+
+    terms = np.array(vectorizer.get_feature_names_out())
+    clusters, means = cluster_means(X, labels)
+    rows = []
+    for c, mean_vec in zip(clusters, means):
+        top_idx = np.argsort(-mean_vec)[:top_n]
+        rows.append({"cluster": c, "top_terms": ", ".join(terms[top_idx])})
+    return pd.DataFrame(rows)
+
+
+def similarity_to_centers(X, labels):
+    """
+    Similitud coseno de cada documento con la media de su clúster.
+
+    Returns:
+        (clusters, sims): etiquetas ordenadas y un array de N similitudes
+    """
+    labels = np.asarray(labels)
+    clusters, means = cluster_means(X, labels)
+    positions = np.searchsorted(clusters, labels)
+    X = sp.csr_matrix(X)
+    mean_norms = np.linalg.norm(means, axis=1)
+
+    dots = np.empty(labels.shape[0])
+    for start in range(0, labels.shape[0], BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        products = np.asarray(X[block] @ means.T)
+        dots[block] = products[np.arange(products.shape[0]), positions[block]]
+    norms = row_norms(X) * mean_norms[positions]
+    # cosine_similarity da 0 para un documento vacío
+    sims = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return clusters, sims
+
+
+def medoid_titles_per_cluster(X, labels, titles):
+    """Documento más parecido a la media de cada clúster (mismo DataFrame que el notebook)."""
+    import pandas as pd
+
+    labels = np.asarray(labels)
+    clusters, sims = similarity_to_centers(X, labels)
+    # Orden por clúster y, dentro de cada uno, por similitud descendente; a igualdad,
+    # el primer documento, como np.argmax en el notebook
+    order = np.lexsort((np.arange(labels.shape[0]), -sims, labels))
+    firsts = order[np.searchsorted(labels[order], clusters)]
+    out = [{
+        "cluster": int(c),
+        "medoid_title": titles[best_global_idx],
+        "similarity_to_center": float(sims[best_global_idx])
+    } for c, best_global_idx in zip(clusters, firsts)]
+    return pd.DataFrame(out).sort_values("cluster")
+
+
+def project_2d(X, random_state=42):
+    """Proyección 2D de los documentos con TruncatedSVD (N × 2)."""
+    return TruncatedSVD(n_components=2, random_state=random_state).fit_transform(X)
@@ -0,0 +1,160 @@
+"""
+Indexación incremental del corpus de la búsqueda semántica.
+
+El notebook vuelve a ajustar TfidfVectorizer y KMeans sobre toda la lista `docs`
+cada vez que cambia. IncrementalIndex añade documentos sin reajustar nada:
+
+- HashingVectorizer en lugar de vocabulario: cada término va siempre a la misma
+  columna (hash), así que los documentos nuevos no cambian las columnas de los
+  que ya están. Las frecuencias de documento se acumulan con cada lote.
+- Los vectores indexados usan la IDF congelada en la última reconstrucción: un
+  documento añadido se pondera igual que los que ya están.
+- Los clústeres se actualizan con MiniBatchKMeans.partial_fit sobre el lote nuevo.
+- El índice de búsqueda (search_index) recibe solo las filas nuevas con add().
+- drift() mide cuánto se ha alejado la IDF actual de la congelada. Si supera
+  drift_threshold después de un add(), se reconstruye todo: TF-IDF con la IDF
+  actual, KMeans e índice.
+
+Uso:
+    index = IncrementalIndex(n_clusters=6, stop_words=spanish_stopwords)
+    index.fit(titles, texts)
+    index.add(new_titles, new_texts)     # segundos, aunque el corpus tenga 1M documentos
+    index.search("energía solar", top_k=5)
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from search_index import ExactIndex, semantic_search
+
+# Columnas del espacio de hashing: con ~50.000 términos distintos apenas hay colisiones
+N_FEATURES = 2**18
+DRIFT_THRESHOLD = 0.05
+
+
+class IncrementalIndex:
+    """
+    Corpus indexado que admite documentos nuevos sin reajustar el vectorizador,
+    los clústeres ni el índice de búsqueda.
+    """
+
+    def __init__(self, n_clusters=6, n_features=N_FEATURES, drift_threshold=DRIFT_THRESHOLD,
+                 index_factory=ExactIndex, stop_words=None, ngram_range=(1, 1), random_state=42):
+        """
+        Args:
+            n_clusters: Número de clústeres (k del notebook)
+            n_features: Columnas del HashingVectorizer
+            drift_threshold: Deriva de la IDF (ver drift) a partir de la cual add() reconstruye
+            index_factory: Construye el índice de búsqueda a partir de X, p. ej. ExactIndex o
+                lambda X: IVFIndex(X, n_probe=8). Con IVFIndex los centroides son densos
+                (n_lists × n_features): conviene reducir n_features
+            stop_words, ngram_range: Como en el TfidfVectorizer del notebook
+            random_state: Semilla de MiniBatchKMeans
+        """
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                            stop_words=stop_words, ngram_range=ngram_range,
+                                            dtype=np.float32)
+        self.n_clusters = n_clusters
+        self.drift_threshold = drift_threshold
+        self.index_factory = index_factory
+        self.random_state = random_state
+        self.rebuilds = 0
+
+    def __len__(self):
+        return len(self.titles)
+
+    @staticmethod
+    def _idf(doc_freq, n_docs):
+        # La IDF suavizada de TfidfTransformer (smooth_idf=True)
+        return (np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32)
+
+    def _weight(self, counts, idf):
+        X = counts.copy()
+        X.data *= idf[X.indices]
+        return normalize(X, copy=False)
+
+    def transform(self, texts):
+        """
+        TF-IDF de `texts` con la IDF congelada: los mismos pesos que los documentos
+        indexados. Sirve de `vectorizer` para search_index.semantic_search.
+        """
+        return self._weight(self.vectorizer.transform(texts), self.idf)
+
+    def fit(self, titles, texts):
+        """Indexa desde cero el corpus completo."""
+        titles, texts = list(titles), list(texts)
+        counts = self.vectorizer.transform(texts)
+        self._fit_counts(counts, np.bincount(counts.indices, minlength=counts.shape[1]))
+        self.titles, self.texts = titles, texts
+        return self
+
+    def rebuild(self):
+        """Congela la IDF actual y vuelve a calcular la TF-IDF, los clústeres y el índice."""
+        counts = sp.vstack(self._counts, format="csr") if len(self._counts) > 1 else self._counts[0]
+        self._fit_counts(counts, self.doc_freq)
+
+    def _fit_counts(self, counts, doc_freq):
+        # Todo se calcula antes de asignar: si algo falla, el estado anterior sigue intacto
+        idf = self._idf(doc_freq, counts.shape[0])
+        X = self._weight(counts, idf)
+        kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, n_init=3, batch_size=4096,
+                                 random_state=self.random_state)
+        labels = kmeans.fit_predict(X)
+        index = self.index_factory(X)
+        self._counts, self.doc_freq, self.idf = [counts], doc_freq, idf
+        self.kmeans, self.labels, self.index = kmeans, labels, index
+        self.rebuilds += 1
+
+    def add(self, titles, texts):
+        """
+        Añade documentos: se vectorizan con la IDF congelada, actualizan los
+        clústeres con partial_fit y se añaden al índice. Si después la deriva
+        supera drift_threshold, se reconstruye todo. El corpus solo cambia
+        cuando el índice ya tiene los documentos nuevos.
+
+        Returns:
+            Clúster de cada documento añadido (vacío si el lote está vacío)
+        """
+        titles, texts = list(titles), list(texts)
+        if len(titles) != len(texts):
+            raise ValueError(f"{len(titles)} títulos para {len(texts)} textos")
+        if not texts:
+            return self.labels[:0]
+
+        counts = self.vectorizer.transform(texts)
+        # indices de cada fila son únicos (HashingVectorizer suma los duplicados)
+        doc_freq = self.doc_freq + np.bincount(counts.indices, minlength=counts.shape[1])
+
+        if self._drift(doc_freq, len(self) + len(texts)) > self.drift_threshold:
+            self._fit_counts(sp.vstack(self._counts + [counts], format="csr"), doc_freq)
+            labels = self.labels[-len(texts):]
+        else:
+            X = self._weight(counts, self.idf)
+            labels = self.kmeans.partial_fit(X).predict(X)
+            self.index.add(X)
+            self._counts.append(counts)
+            self.doc_freq = doc_freq
+            self.labels = np.concatenate([self.labels, labels])
+        self.titles.extend(titles)
+        self.texts.extend(texts)
+        return labels
+
+    def drift(self):
+        """
+        Deriva de la IDF: cambio relativo entre la IDF actual y la congelada,
+        ponderado por la frecuencia de documento de cada término.
+        0 justo después de reconstruir; 0.05 = los pesos han cambiado un 5 % de media.
+        """
+        return self._drift(self.doc_freq, len(self))
+
+    def _drift(self, doc_freq, n_docs):
+        current = self._idf(doc_freq, n_docs)
+        weights = doc_freq.astype(np.float64)
+        return float(weights @ np.abs(current - self.idf) / (weights @ self.idf))
+
+    def search(self, query, top_k=5):
+        """semantic_search del notebook sobre el corpus indexado."""
+        return semantic_search(query, self, self.index, self.titles, self.texts, top_k)
@@ -0,0 +1,80 @@
+"""
+Pruebas de la analítica de clústeres dispersa frente a las funciones densas del notebook.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.decomposition import PCA
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from benchmark_clusters import notebook_medoid_titles_per_cluster, notebook_top_terms_per_cluster
+from benchmark_search import make_corpus
+from cluster_analytics import (
+    cluster_documents,
+    cluster_means,
+    medoid_titles_per_cluster,
+    project_2d,
+    top_terms_per_cluster,
+)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    docs = make_corpus(1500, n_topics=8, vocabulary=5000, topic_words=500)
+    vectorizer = TfidfVectorizer(max_features=3000)
+    X = vectorizer.fit_transform(docs)
+    titles = [f"Documento {i}" for i in range(len(docs))]
+    return vectorizer, X, titles, cluster_documents(X, 8)
+
+
+def test_cluster_means(corpus):
+    _, X, _, labels = corpus
+    clusters, means = cluster_means(X, labels)
+    assert clusters.tolist() == list(range(8))
+    X_dense = X.toarray()
+    for c, mean in zip(clusters, means):
+        np.testing.assert_allclose(mean, X_dense[labels == c].mean(axis=0), atol=1e-12)
+
+
+def test_top_terms_match_notebook(corpus):
+    vectorizer, X, _, labels = corpus
+    pd.testing.assert_frame_equal(top_terms_per_cluster(X, labels, vectorizer),
+                                  notebook_top_terms_per_cluster(X, labels, vectorizer))
+
+
+def test_medoids_match_notebook(corpus, monkeypatch):
+    _, X, titles, labels = corpus
+    expected = notebook_medoid_titles_per_cluster(X, labels, titles)
+    pd.testing.assert_frame_equal(medoid_titles_per_cluster(X, labels, titles), expected)
+    # Mismo resultado multiplicando por bloques pequeños
+    monkeypatch.setattr("cluster_analytics.BLOCK_ROWS", 100)
+    pd.testing.assert_frame_equal(medoid_titles_per_cluster(X, labels, titles), expected)
+
+
+def test_minibatch_finds_the_topics(corpus):
+    _, X, _, labels = corpus
+    minibatch = cluster_documents(X, 8, method="minibatch")
+    # Cada clúster de KMeans corresponde a uno de MiniBatchKMeans
+    pairs = set(zip(labels.tolist(), minibatch.tolist()))
+    assert len(pairs) == 8
+
+
+def test_unknown_method(corpus):
+    _, X, _, _ = corpus
+    with pytest.raises(ValueError):
+        cluster_documents(X, 3, method="dbscan")
+
+
+def test_project_2d_separates_like_pca(corpus):
+    _, X, _, labels = corpus
+    coords = project_2d(X)
+    assert coords.shape == (X.shape[0], 2)
+    # TruncatedSVD no centra: comparada con PCA, la proyección de cada clúster se
+    # mantiene agrupada (misma razón entre varianza dentro y entre clústeres)
+    def spread(points):
+        centers = np.array([points[labels == c].mean(axis=0) for c in range(8)])
+        within = np.mean([points[labels == c].var(axis=0).sum() for c in range(8)])
+        return within / centers.var(axis=0).sum()
+    pca = PCA(n_components=2, random_state=42).fit_transform(X.toarray())
+    assert spread(coords) < 2 * spread(pca)
@@ -0,0 +1,81 @@
+"""
+Pruebas de la indexación incremental.
+"""
+
+import numpy as np
+import pytest
+
+from benchmark_search import make_corpus
+from incremental_index import IncrementalIndex
+from search_index import IVFIndex
+
+
+@pytest.fixture(scope="module")
+def docs():
+    return make_corpus(2000, n_topics=10)
+
+
+def titles_for(docs, offset=0):
+    return [f"Documento {offset + i}" for i in range(len(docs))]
+
+
+def test_add_uses_frozen_idf(docs):
+    incremental = IncrementalIndex(n_clusters=5, n_features=2**14, drift_threshold=1.0)
+    incremental.fit(titles_for(docs[:1500]), docs[:1500])
+    idf = incremental.idf.copy()
+    labels = incremental.add(titles_for(docs[1500:], 1500), docs[1500:])
+
+    assert incremental.rebuilds == 1 and len(incremental) == 2000
+    assert labels.shape == (500,) and incremental.labels.shape == (2000,)
+    np.testing.assert_array_equal(incremental.idf, idf)
+    # Los documentos añadidos tienen los mismos vectores que con transform
+    scores, ids = incremental.index.search(incremental.transform(docs[1500:1510]), 1)
+    np.testing.assert_allclose(scores[:, 0], 1.0, atol=1e-5)
+    np.testing.assert_array_equal(ids[:, 0], np.arange(1500, 1510))
+
+
+def test_drift_triggers_rebuild(docs):
+    incremental = IncrementalIndex(n_clusters=5, n_features=2**14, drift_threshold=0.05)
+    incremental.fit(titles_for(docs[:200]), docs[:200])
+    assert incremental.drift() == 0.0
+    incremental.add(titles_for(docs[200:210], 200), docs[200:210])
+    assert incremental.rebuilds == 1 and 0 < incremental.drift() < 0.05
+
+    # Un lote grande de otro corpus cambia mucho la IDF
+    other = make_corpus(2000, n_topics=10, seed=7)
+    incremental.add(titles_for(other, 210), other)
+    assert incremental.rebuilds == 2 and incremental.drift() == 0.0
+    assert len(incremental.index) == len(incremental) == 2210
+
+
+@pytest.mark.parametrize("index_factory", [None, lambda X: IVFIndex(X, n_lists=10, n_probe=10)])
+def test_search_finds_added_documents(docs, index_factory):
+    options = {"index_factory": index_factory} if index_factory else {}
+    incremental = IncrementalIndex(n_clusters=5, n_features=2**14, drift_threshold=1.0, **options)
+    incremental.fit(titles_for(docs[:1000]), docs[:1000])
+    index = incremental.index
+    incremental.add(["Nuevo"], [docs[1999]])
+    # El índice crece en el sitio, sin reconstruirse
+    assert incremental.index is index and len(index) == 1001
+
+    df = incremental.search(docs[1999], top_k=3)
+    assert df["titulo"][0] == "Nuevo" and df["score"][0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_empty_and_failed_batches_leave_state_intact(docs, monkeypatch):
+    incremental = IncrementalIndex(n_clusters=5, n_features=2**14, drift_threshold=1.0)
+    incremental.fit(titles_for(docs[:500]), docs[:500])
+    doc_freq = incremental.doc_freq.copy()
+
+    assert incremental.add([], []).shape == (0,)
+    assert len(incremental) == len(incremental.index) == 500
+
+    def fail(X):
+        raise MemoryError
+    monkeypatch.setattr(incremental.index, "add", fail)
+    with pytest.raises(MemoryError):
+        incremental.add(titles_for(docs[500:510], 500), docs[500:510])
+    with pytest.raises(ValueError):
+        incremental.add(["Sin texto"], [])
+    assert len(incremental) == len(incremental.index) == incremental.labels.shape[0] == 500
+    np.testing.assert_array_equal(incremental.doc_freq, doc_freq)
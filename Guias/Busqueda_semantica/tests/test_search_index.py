@@ -0,0 +1,109 @@
+"""
+Pruebas de los índices de búsqueda frente a la búsqueda del notebook.
+"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmark_search import make_corpus, recall_at_k
+from search_index import ExactIndex, IVFIndex, load_index, semantic_search, top_k_rows
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    docs = make_corpus(3000, n_topics=20)
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    X = vectorizer.fit_transform(docs)
+    queries = [" ".join(doc.split()[:8]) for doc in make_corpus(40, n_topics=20, seed=1)]
+    return docs, vectorizer, X, vectorizer.transform(queries)
+
+
+def notebook_scores(Q, X, top_k):
+    sims = cosine_similarity(Q, X)
+    return -np.sort(-sims, axis=1)[:, :top_k]
+
+
+def test_top_k_rows():
+    S = np.array([[0.1, 0.9, 0.5, 0.7], [3.0, 1.0, 2.0, 0.0]])
+    values, columns = top_k_rows(S, 2)
+    assert columns.tolist() == [[1, 3], [0, 2]]
+    np.testing.assert_array_equal(values, [[0.9, 0.7], [3.0, 2.0]])
+    assert top_k_rows(S, 10)[1].shape == (2, 4)
+
+
+def test_exact_index_matches_notebook(corpus):
+    _, _, X, Q = corpus
+    scores, ids = ExactIndex(X).search(Q, 10)
+    np.testing.assert_allclose(scores, notebook_scores(Q, X, 10), atol=1e-6)
+    # Los ids devueltos tienen esas similitudes
+    sims = cosine_similarity(Q, X)
+    np.testing.assert_allclose(np.take_along_axis(sims, ids, axis=1), scores, atol=1e-6)
+
+
+def test_exact_index_small_blocks(corpus, monkeypatch):
+    _, _, X, Q = corpus
+    expected = ExactIndex(X).search(Q, 5)
+    monkeypatch.setattr("search_index.BLOCK_ELEMENTS", 1)
+    np.testing.assert_array_equal(ExactIndex(X).search(Q, 5)[1], expected[1])
+
+
+def test_ivf_recall_grows_with_n_probe(corpus):
+    _, _, X, Q = corpus
+    exact_scores, _ = ExactIndex(X).search(Q, 10)
+    index = IVFIndex(X, n_lists=30, n_probe=1)
+    recalls = []
+    for n_probe in (1, 4, 30):
+        index.n_probe = n_probe
+        recalls.append(recall_at_k(exact_scores, index.search(Q, 10)[0]))
+    assert recalls[0] > 0.5
+    assert recalls == sorted(recalls) and recalls[-1] == 1.0
+
+
+def test_ivf_returns_original_ids(corpus):
+    _, _, X, Q = corpus
+    scores, ids = IVFIndex(X, n_lists=30, n_probe=4).search(Q, 5)
+    sims = cosine_similarity(Q, X)
+    np.testing.assert_allclose(np.take_along_axis(sims, ids, axis=1), scores, atol=1e-6)
+
+
+@pytest.mark.parametrize("build", [ExactIndex, lambda X: IVFIndex(X, n_lists=30, n_probe=3)])
+def test_save_and_load(corpus, tmp_path, build):
+    _, _, X, Q = corpus
+    index = build(X)
+    index.save(tmp_path / "indice.npz")
+    loaded = load_index(tmp_path / "indice.npz")
+    assert type(loaded) is type(index) and len(loaded) == len(index)
+    for expected, actual in zip(index.search(Q, 5), loaded.search(Q, 5)):
+        np.testing.assert_array_equal(expected, actual)
+
+
+@pytest.mark.parametrize("build", [ExactIndex, lambda X: IVFIndex(X, n_lists=30, n_probe=30)])
+def test_add_matches_full_build(corpus, tmp_path, build, monkeypatch):
+    _, _, X, Q = corpus
+    monkeypatch.setattr("search_index.MAX_SEGMENTS", 2)
+    index = build(X[:1000])
+    for start in range(1000, X.shape[0], 500):
+        index.add(X[start:start + 500])
+    index.add(X[:0])
+    assert len(index) == X.shape[0]
+    scores, ids = index.search(Q, 10)
+    np.testing.assert_allclose(scores, notebook_scores(Q, X, 10), atol=1e-6)
+    sims = cosine_similarity(Q, X)
+    np.testing.assert_allclose(np.take_along_axis(sims, ids, axis=1), scores, atol=1e-6)
+
+    index.save(tmp_path / "indice.npz")
+    np.testing.assert_array_equal(load_index(tmp_path / "indice.npz").search(Q, 10)[1], ids)
+
+
+def test_semantic_search_dataframe(corpus):
+    docs, vectorizer, X, _ = corpus
+    titles = [f"Documento {i}" for i in range(len(docs))]
+    index = ExactIndex(X)
+    df = semantic_search(docs[7], vectorizer, index, titles, docs, top_k=3)
+    assert list(df.columns) == ["rank", "score", "titulo", "texto"]
+    assert df["titulo"][0] == "Documento 7" and df["score"][0] == pytest.approx(1.0)
+
+    frames = semantic_search([docs[7], docs[8]], vectorizer, index, titles, docs, top_k=3)
+    assert [frame["titulo"][0] for frame in frames] == ["Documento 7", "Documento 8"]
@@ -0,0 +1,18 @@
+"""
+📁 asgi.py
+Punto de entrada para uvicorn que elige la aplicación según DB_MODE:
+    sync   app.main (Session en el threadpool de FastAPI, por defecto)
+    async  app.main_async (AsyncSession con aiosqlite)
+
+Uso:
+    DB_MODE=async uvicorn app.asgi:app
+"""
+
+from .database import DB_MODE
+
+if DB_MODE == "async":
+    from .main_async import app
+else:
+    from .main import app
+
+__all__ = ["app"]
@@ -0,0 +1,152 @@
+"""
+📁 bulk.py
+Utilidades para las operaciones masivas sobre tareas.
+Lee lotes en JSON (array) o NDJSON (un objeto por línea) y valida cada
+elemento por separado para poder informar errores sin abortar todo el lote.
+"""
+
+import json
+from typing import Any, AsyncIterator, List, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+
+from . import schemas
+
+# Límite de elementos por petición para acotar memoria y duración de la transacción
+MAX_BULK_ITEMS = 50_000
+# Límite del cuerpo en bytes: unos 2,7 KB de media por elemento con MAX_BULK_ITEMS
+MAX_BULK_BYTES = 128 * 1024 * 1024
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    """Convierte un ValidationError de Pydantic en un mensaje de una línea."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+async def iter_lines(request: Request) -> AsyncIterator[bytes]:
+    """Devuelve las líneas del cuerpo de la petición según van llegando."""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+def _check_content_length(request: Request):
+    """Rechaza el cuerpo por su Content-Length, antes de leerlo."""
+    try:
+        length = int(request.headers.get("content-length", ""))
+    except ValueError:
+        return
+    if length > MAX_BULK_BYTES:
+        raise _too_large(f"Máximo {MAX_BULK_BYTES} bytes por petición")
+
+
+async def _read_ndjson(request: Request) -> List[Any]:
+    """Lee NDJSON línea a línea y corta en cuanto se supera MAX_BULK_ITEMS."""
+    items = []
+    async for line in iter_lines(request):
+        if not line.strip():
+            continue
+        if len(items) == MAX_BULK_ITEMS:
+            raise _too_large(f"Máximo {MAX_BULK_ITEMS} elementos por petición")
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError:
+            items.append(None)
+    return items
+
+
+async def _read_json_array(request: Request) -> List[Any]:
+    """Lee un array JSON; sin Content-Length, el tamaño se comprueba al recibirlo."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BULK_BYTES:
+            raise _too_large(f"Máximo {MAX_BULK_BYTES} bytes por petición")
+    try:
+        items = json.loads(body or b"[]")
+    except json.JSONDecodeError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El cuerpo debe ser un array JSON o NDJSON"
+        )
+    if len(items) > MAX_BULK_ITEMS:
+        raise _too_large(f"Máximo {MAX_BULK_ITEMS} elementos por petición")
+    return items
+
+
+async def read_bulk_items(request: Request) -> List[Any]:
+    """
+    Dependencia que lee el cuerpo de una petición masiva.
+
+    Acepta un array JSON o NDJSON (Content-Type application/x-ndjson).
+    Las líneas NDJSON que no son JSON válido se devuelven como None para que
+    la validación las reporte con su índice. El NDJSON se lee en streaming y
+    el array JSON solo se acumula si su Content-Length cabe en MAX_BULK_BYTES;
+    ambos responden 413 en cuanto se pasa de un límite.
+    """
+    _check_content_length(request)
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        return await _read_ndjson(request)
+    return await _read_json_array(request)
+
+
+def validate_items(
+    items: List[Any],
+    schema: Type[BaseModel]
+) -> Tuple[List[Tuple[int, BaseModel]], List[schemas.BulkItemError]]:
+    """
+    Valida cada elemento con `schema` de forma independiente.
+
+    Returns:
+        (elementos válidos como pares (índice, modelo), errores por elemento)
+    """
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        if item is None:
+            errors.append(schemas.BulkItemError(index=index, detail="JSON inválido"))
+            continue
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            item_id = item.get("id") if isinstance(item, dict) and isinstance(item.get("id"), int) else None
+            errors.append(schemas.BulkItemError(index=index, id=item_id, detail=_describe_validation_error(e)))
+    return valid, errors
+
+
+def report_missing(
+    valid: List[Tuple[int, BaseModel]],
+    found,
+    errors: List[schemas.BulkItemError]
+) -> List[schemas.BulkItemError]:
+    """
+    Añade a `errors` los elementos válidos cuyo ID no está en `found`.
+
+    Returns:
+        `errors` ordenados por índice
+    """
+    for index, item in valid:
+        if item.id not in found:
+            errors.append(schemas.BulkItemError(
+                index=index, id=item.id, detail=f"Tarea con ID {item.id} no encontrada"
+            ))
+    errors.sort(key=lambda error: error.index)
+    return errors
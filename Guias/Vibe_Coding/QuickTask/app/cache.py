@@ -0,0 +1,228 @@
+"""
+📁 cache.py
+Caché de lectura para GET /tasks/{task_id} y GET /tasks.
+Guarda la respuesta ya serializada (JSON) junto con su ETag, así que un acierto
+no toca SQLite ni Pydantic, y un cliente con If-None-Match recibe un 304 vacío.
+
+El backend tiene la interfaz mínima de Redis (get, set con ex, delete, incr)
+para poder cambiar MemoryBackend por un cliente Redis sin tocar TaskCache.
+
+Invalidación:
+- Cada tarea tiene su clave, que se borra al actualizarla o eliminarla.
+- Las listas llevan en la clave un contador de generación por filtro
+  (todas / completadas / pendientes); una escritura incrementa solo los
+  contadores de los filtros a los que afecta y las entradas viejas dejan de
+  consultarse hasta que las expulsan el LRU o el TTL.
+- Una lectura que se cruza con una escritura puede volver a guardar la tarea
+  anterior justo después de borrarse su clave; el TTL acota ese caso.
+
+Se configura con:
+    CACHE_BACKEND=memory|none
+    CACHE_TTL=30
+    CACHE_MAX_ENTRIES=10000
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional, Protocol
+
+from fastapi import Request, Response, status
+from . import schemas
+from .serialization import dump_tasks
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_TTL = float(os.environ.get("CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+
+
+class CacheBackend(Protocol):
+    """Subconjunto de la API de redis-py que usa TaskCache."""
+
+    def get(self, name: str) -> Optional[bytes]: ...
+
+    def set(self, name: str, value: bytes, ex: Optional[float] = None) -> None: ...
+
+    def delete(self, *names: str) -> int: ...
+
+    def incr(self, name: str) -> int: ...
+
+
+class MemoryBackend:
+    """
+    Backend en el proceso: un OrderedDict con expulsión LRU y expiración por TTL.
+    Con varios workers cada uno tiene su propia caché; las escrituras solo
+    invalidan la del worker que las atiende y el resto se pone al día con el TTL.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[name]
+                self.misses += 1
+                return None
+            self._data.move_to_end(name)
+            self.hits += 1
+            return value
+
+    def set(self, name: str, value: bytes, ex: Optional[float] = None) -> None:
+        expires = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._data[name] = (value, expires)
+            self._data.move_to_end(name)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            value, expires = self._data.get(name, (b"0", None))
+            value = str(int(value) + 1).encode()
+            self._data[name] = (value, expires)
+            self._data.move_to_end(name)
+            return int(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheEntry(NamedTuple):
+    """Respuesta serializada lista para enviar."""
+    body: bytes
+    etag: str
+    next_cursor: Optional[str] = None
+
+    def pack(self) -> bytes:
+        return f"{self.etag}\n{self.next_cursor or ''}\n".encode() + self.body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CacheEntry":
+        etag, next_cursor, body = data.split(b"\n", 2)
+        return cls(body, etag.decode(), next_cursor.decode() or None)
+
+
+def make_etag(body: bytes) -> str:
+    """ETag fuerte derivado del contenido de la respuesta."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def task_entry(task) -> CacheEntry:
+    """Serializa una tarea (ORM o fila) como TaskResponse."""
+    body = schemas.TaskResponse.model_validate(task).model_dump_json().encode()
+    return CacheEntry(body, make_etag(body))
+
+
+def task_list_entry(rows, next_cursor: Optional[str] = None) -> CacheEntry:
+    """Serializa una página de filas (id, title, description, completed) como List[TaskResponse]."""
+    body = dump_tasks(rows)
+    return CacheEntry(body, make_etag(body), next_cursor)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara la cabecera If-None-Match con un ETag (comparación débil, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def entry_response(request: Request, entry: CacheEntry) -> Response:
+    """Devuelve la entrada como JSON con su ETag, o un 304 si el cliente ya la tiene."""
+    headers = {"ETag": entry.etag}
+    if entry.next_cursor:
+        headers["X-Next-Cursor"] = entry.next_cursor
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _filter_name(completed: Optional[bool]) -> str:
+    return "all" if completed is None else str(completed).lower()
+
+
+class TaskCache:
+    """Caché de respuestas de tareas sobre cualquier CacheBackend."""
+
+    def __init__(self, backend: CacheBackend, ttl: float = CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        data = self.backend.get(key)
+        return CacheEntry.unpack(data) if data is not None else None
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        self.backend.set(key, entry.pack(), ex=self.ttl)
+
+    def get_task(self, task_id: int) -> Optional[CacheEntry]:
+        return self._get(f"task:{task_id}")
+
+    def set_task(self, task_id: int, entry: CacheEntry) -> None:
+        self._set(f"task:{task_id}", entry)
+
+    def list_key(self, skip: int, limit: int, completed: Optional[bool], after_id: Optional[int]) -> str:
+        """
+        Clave de una página. Incluye la generación de su filtro, así que cambia
+        en cuanto una escritura afecta a las tareas que puede contener.
+        """
+        name = _filter_name(completed)
+        generation = (self.backend.get(f"tasks:gen:{name}") or b"0").decode()
+        return f"tasks:{name}:{generation}:{skip}:{limit}:{after_id}"
+
+    def get_list(self, key: str) -> Optional[CacheEntry]:
+        return self._get(key)
+
+    def set_list(self, key: str, entry: CacheEntry) -> None:
+        self._set(key, entry)
+
+    def invalidate(self, task_ids: Iterable[int] = (), completed: Iterable[bool] = (True, False)) -> None:
+        """
+        Invalida las tareas `task_ids` y las listas afectadas.
+
+        Args:
+            task_ids: Tareas modificadas o eliminadas
+            completed: Estados (antes o después del cambio) de las tareas afectadas;
+                la lista sin filtro se invalida siempre
+        """
+        keys = [f"task:{task_id}" for task_id in task_ids]
+        if keys:
+            self.backend.delete(*keys)
+        self.backend.incr("tasks:gen:all")
+        for value in set(completed):
+            self.backend.incr(f"tasks:gen:{_filter_name(value)}")
+
+    def clear(self) -> None:
+        if hasattr(self.backend, "clear"):
+            self.backend.clear()
+
+
+def cache_from_env() -> Optional[TaskCache]:
+    """TaskCache según CACHE_BACKEND, o None si está desactivada."""
+    if CACHE_BACKEND == "none":
+        return None
+    if CACHE_BACKEND == "memory":
+        return TaskCache(MemoryBackend())
+    raise ValueError(f"CACHE_BACKEND desconocido: {CACHE_BACKEND}")
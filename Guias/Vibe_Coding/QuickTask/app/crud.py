@@ -4,9 +4,26 @@ Operaciones CRUD (Create, Read, Update, Delete) para las tareas.
 Contiene la lógica de negocio para interactuar con la base de datos.
 """
 
+from sqlalchemy import Row, delete, insert, select, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
 from . import models, schemas
+from .search import SEARCH_WINDOW, search_statement
+
+# Tamaño de los bloques de IDs en cláusulas IN (SQLite limita los parámetros por sentencia)
+BULK_CHUNK_SIZE = 500
+
+
+def task_columns():
+    """Columnas de la tabla tasks en el orden (id, title, description, completed)."""
+    table = models.Task.__table__
+    return (table.c.id, table.c.title, table.c.description, table.c.completed)
+
+
+def _chunks(values: List, size: int = BULK_CHUNK_SIZE):
+    """Divide una lista en bloques de como mucho `size` elementos."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
 
 def create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
@@ -49,16 +66,19 @@ def get_tasks(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
-    completed: Optional[bool] = None
+    completed: Optional[bool] = None,
+    after_id: Optional[int] = None
 ) -> List[models.Task]:
     """
-    Obtiene una lista de tareas con paginación opcional.
+    Obtiene una lista de tareas ordenadas por ID con paginación opcional.
     
     Args:
         db: Sesión de base de datos
-        skip: Número de registros a saltar (para paginación)
+        skip: Número de registros a saltar (paginación por OFFSET)
         limit: Número máximo de registros a devolver
         completed: Filtro opcional por estado (True/False/None)
+        after_id: Devolver solo tareas con ID mayor (paginación por clave);
+            a diferencia de OFFSET no recorre las filas anteriores
     
     Returns:
         Lista de tareas
@@ -69,17 +89,89 @@ def get_tasks(
     if completed is not None:
         query = query.filter(models.Task.completed == completed)
     
-    return query.offset(skip).limit(limit).all()
+    if after_id is not None:
+        query = query.filter(models.Task.id > after_id)
+    
+    return query.order_by(models.Task.id).offset(skip).limit(limit).all()
+
+
+def _update_task_statement(task_id: int, task_update: schemas.TaskUpdate):
+    """
+    Sentencia única para update_task: UPDATE ... RETURNING con los campos
+    proporcionados, o un SELECT por ID si no se proporciona ninguno.
+    Se usa la tabla de Core para no pasar por el identity map de la sesión.
+    """
+    table = models.Task.__table__
+    update_data = task_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return select(*table.c).where(table.c.id == task_id)
+    return update(table).where(table.c.id == task_id).values(**update_data).returning(*table.c)
+
+
+def _delete_task_statement(task_id: int):
+    """Sentencia única para delete_task: DELETE ... RETURNING id."""
+    table = models.Task.__table__
+    return delete(table).where(table.c.id == task_id).returning(table.c.id)
+
+
+def search_tasks(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    completed: Optional[bool] = None,
+    window: int = SEARCH_WINDOW
+) -> List[Row]:
+    """
+    Busca tareas por título y descripción en el índice FTS5.
+    
+    Args:
+        db: Sesión de base de datos
+        query: Expresión MATCH ya saneada (ver search.match_expression)
+        limit: Número máximo de resultados
+        completed: Filtro opcional por estado
+        window: Se ordenan por relevancia solo las `window` coincidencias más recientes
+    
+    Returns:
+        Filas (id, title, description, completed, snippet, rank) ordenadas por relevancia
+    """
+    params = {"query": query, "limit": limit, "completed": completed, "window": window}
+    return db.execute(search_statement(completed), params).all()
+
+
+def get_task_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    after_id: Optional[int] = None
+) -> List[Row]:
+    """
+    Igual que get_tasks pero devuelve tuplas de columnas en lugar de objetos ORM:
+    no hay identity map ni hidratación por fila. Es la consulta de GET /tasks,
+    que serializa las filas directamente (ver serialization.py).
+    
+    Returns:
+        Filas (id, title, description, completed) ordenadas por ID
+    """
+    table = models.Task.__table__
+    query = select(*task_columns())
+    if completed is not None:
+        query = query.where(table.c.completed == completed)
+    if after_id is not None:
+        query = query.where(table.c.id > after_id)
+    return db.execute(query.order_by(table.c.id).offset(skip).limit(limit)).all()
 
 
 def update_task(
     db: Session, 
     task_id: int, 
     task_update: schemas.TaskUpdate
-) -> Optional[models.Task]:
+) -> Optional[Row]:
     """
     Actualiza una tarea existente.
     Solo actualiza los campos que se proporcionan (actualización parcial).
+    Es una sola sentencia UPDATE ... WHERE id = ? RETURNING: si no devuelve
+    fila, la tarea no existía. No hay SELECT previo ni refresh posterior.
     
     Args:
         db: Sesión de base de datos
@@ -87,26 +179,18 @@ def update_task(
         task_update: Nuevos datos de la tarea
     
     Returns:
-        La tarea actualizada si existe, None en caso contrario
+        Fila (id, title, description, completed) de la tarea actualizada si existe,
+        None en caso contrario
     """
-    db_task = get_task(db, task_id)
-    
-    if db_task is None:
-        return None
-    
-    # Actualizar solo los campos proporcionados
-    update_data = task_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
-    
+    db_task = db.execute(_update_task_statement(task_id, task_update)).one_or_none()
     db.commit()
-    db.refresh(db_task)
     return db_task
 
 
 def delete_task(db: Session, task_id: int) -> bool:
     """
-    Elimina una tarea de la base de datos.
+    Elimina una tarea de la base de datos con una sola sentencia
+    DELETE ... WHERE id = ? RETURNING id.
     
     Args:
         db: Sesión de base de datos
@@ -115,11 +199,132 @@ def delete_task(db: Session, task_id: int) -> bool:
     Returns:
         True si la tarea fue eliminada, False si no existía
     """
-    db_task = get_task(db, task_id)
+    deleted = db.execute(_delete_task_statement(task_id)).scalar_one_or_none()
+    db.commit()
+    return deleted is not None
+
+
+def create_tasks_bulk(db: Session, tasks: List[schemas.TaskCreate]) -> List[Row]:
+    """
+    Crea varias tareas en una sola transacción.
+    SQLAlchemy agrupa las filas en sentencias INSERT ... VALUES (...), (...) RETURNING,
+    así que no hace falta un SELECT posterior para conocer los IDs.
     
-    if db_task is None:
-        return False
+    Args:
+        db: Sesión de base de datos
+        tasks: Tareas ya validadas a crear
     
-    db.delete(db_task)
+    Returns:
+        Filas (id, title, description, completed) de las tareas creadas, en el mismo orden
+    """
+    if not tasks:
+        return []
+    
+    table = models.Task.__table__
+    rows = [
+        {"title": task.title, "description": task.description, "completed": False}
+        for task in tasks
+    ]
+    # Se usa el INSERT de Core: el INSERT masivo del ORM con RETURNING va fila a fila en SQLite
+    created = db.execute(insert(table).returning(*table.c), rows).all()
     db.commit()
-    return True
+    # Los IDs autoincrementales siguen el orden de inserción
+    return sorted(created, key=lambda row: row.id)
+
+
+def update_tasks_bulk(
+    db: Session,
+    updates: List[schemas.TaskBulkUpdate]
+) -> Dict[int, models.Task]:
+    """
+    Aplica actualizaciones parciales a varias tareas en una sola transacción.
+    Los IDs inexistentes se ignoran; el llamador los detecta en el resultado.
+    
+    Args:
+        db: Sesión de base de datos
+        updates: Cambios por tarea (solo los campos proporcionados)
+    
+    Returns:
+        Diccionario {id: tarea actualizada} con las tareas que existían
+    """
+    ids = list({item.id for item in updates})
+    existing = set()
+    for chunk in _chunks(ids):
+        existing.update(db.scalars(select(models.Task.id).where(models.Task.id.in_(chunk))))
+    
+    # UPDATE por clave primaria con executemany; se agrupa por conjunto de campos
+    params = [
+        item.model_dump(exclude_unset=True)
+        for item in updates
+        if item.id in existing
+    ]
+    params = [p for p in params if len(p) > 1]
+    if params:
+        db.execute(update(models.Task), params)
+    db.commit()
+    
+    updated = {}
+    for chunk in _chunks(list(existing)):
+        for task in db.scalars(select(models.Task).where(models.Task.id.in_(chunk))):
+            updated[task.id] = task
+    return updated
+
+
+def delete_tasks_bulk(db: Session, task_ids: List[int]) -> List[int]:
+    """
+    Elimina varias tareas en una sola transacción usando DELETE ... RETURNING.
+    
+    Args:
+        db: Sesión de base de datos
+        task_ids: IDs de las tareas a eliminar
+    
+    Returns:
+        Lista de IDs que existían y fueron eliminados
+    """
+    deleted = []
+    for chunk in _chunks(list(set(task_ids))):
+        deleted.extend(db.scalars(
+            delete(models.Task).where(models.Task.id.in_(chunk)).returning(models.Task.id)
+        ))
+    db.commit()
+    return deleted
+
+
+def iter_task_rows(
+    db: Session,
+    completed: Optional[bool] = None,
+    batch_size: int = 1000
+) -> Iterator[Sequence[Row]]:
+    """
+    Recorre la tabla completa en bloques de filas sin crear objetos ORM.
+    Con yield_per el cursor de la base entrega `batch_size` filas cada vez,
+    así que la memoria usada no depende del tamaño de la tabla.
+    
+    Args:
+        db: Sesión de base de datos
+        completed: Filtro opcional por estado
+        batch_size: Filas por bloque
+    
+    Yields:
+        Bloques de filas (id, title, description, completed) ordenadas por ID
+    """
+    table = models.Task.__table__
+    query = select(*task_columns()).order_by(table.c.id)
+    if completed is not None:
+        query = query.where(table.c.completed == completed)
+    
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+
+def insert_task_rows(db: Session, rows: List[dict]) -> None:
+    """
+    Inserta un bloque de tareas con un executemany, sin RETURNING ni commit.
+    El llamador decide cuándo confirmar la transacción.
+    
+    Args:
+        db: Sesión de base de datos
+        rows: Diccionarios con title, description y completed
+    """
+    if rows:
+        db.execute(insert(models.Task.__table__), rows)
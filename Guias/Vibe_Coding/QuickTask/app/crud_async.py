@@ -0,0 +1,255 @@
+"""
+📁 crud_async.py
+Operaciones CRUD sobre AsyncSession para el modo DB_MODE=async.
+Mismas funciones y resultados que crud.py; cada consulta se espera con await
+en lugar de ocupar un hilo del threadpool.
+"""
+
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from . import models, schemas
+from .crud import _chunks, _delete_task_statement, _update_task_statement, task_columns
+from .search import SEARCH_WINDOW, search_statement
+
+
+async def create_task(db: AsyncSession, task: schemas.TaskCreate) -> models.Task:
+    """
+    Crea una nueva tarea en la base de datos.
+
+    Args:
+        db: Sesión async de base de datos
+        task: Datos de la tarea a crear
+
+    Returns:
+        La tarea creada con su ID asignado
+    """
+    db_task = models.Task(
+        title=task.title,
+        description=task.description,
+        completed=False
+    )
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    return db_task
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[models.Task]:
+    """
+    Obtiene una tarea específica por su ID.
+
+    Args:
+        db: Sesión async de base de datos
+        task_id: ID de la tarea a buscar
+
+    Returns:
+        La tarea si existe, None en caso contrario
+    """
+    return await db.get(models.Task, task_id)
+
+
+async def get_tasks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    after_id: Optional[int] = None
+) -> Sequence[models.Task]:
+    """
+    Obtiene una lista de tareas ordenadas por ID con paginación opcional.
+    Ver crud.get_tasks.
+
+    Returns:
+        Lista de tareas
+    """
+    query = select(models.Task)
+
+    if completed is not None:
+        query = query.where(models.Task.completed == completed)
+
+    if after_id is not None:
+        query = query.where(models.Task.id > after_id)
+
+    result = await db.scalars(query.order_by(models.Task.id).offset(skip).limit(limit))
+    return result.all()
+
+
+async def get_task_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    after_id: Optional[int] = None
+) -> List[Row]:
+    """
+    Igual que get_tasks pero con tuplas de columnas. Ver crud.get_task_rows.
+
+    Returns:
+        Filas (id, title, description, completed) ordenadas por ID
+    """
+    table = models.Task.__table__
+    query = select(*task_columns())
+    if completed is not None:
+        query = query.where(table.c.completed == completed)
+    if after_id is not None:
+        query = query.where(table.c.id > after_id)
+    return (await db.execute(query.order_by(table.c.id).offset(skip).limit(limit))).all()
+
+
+async def search_tasks(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    completed: Optional[bool] = None,
+    window: int = SEARCH_WINDOW
+) -> List[Row]:
+    """
+    Busca tareas por título y descripción en el índice FTS5. Ver crud.search_tasks.
+
+    Returns:
+        Filas (id, title, description, completed, snippet, rank) ordenadas por relevancia
+    """
+    params = {"query": query, "limit": limit, "completed": completed, "window": window}
+    return (await db.execute(search_statement(completed), params)).all()
+
+
+async def update_task(
+    db: AsyncSession,
+    task_id: int,
+    task_update: schemas.TaskUpdate
+) -> Optional[Row]:
+    """
+    Actualiza una tarea existente (actualización parcial) con una sola sentencia
+    UPDATE ... RETURNING. Ver crud.update_task.
+
+    Args:
+        db: Sesión async de base de datos
+        task_id: ID de la tarea a actualizar
+        task_update: Nuevos datos de la tarea
+
+    Returns:
+        Fila de la tarea actualizada si existe, None en caso contrario
+    """
+    db_task = (await db.execute(_update_task_statement(task_id, task_update))).one_or_none()
+    await db.commit()
+    return db_task
+
+
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
+    """
+    Elimina una tarea con una sola sentencia DELETE ... RETURNING id.
+
+    Args:
+        db: Sesión async de base de datos
+        task_id: ID de la tarea a eliminar
+
+    Returns:
+        True si la tarea fue eliminada, False si no existía
+    """
+    deleted = (await db.execute(_delete_task_statement(task_id))).scalar_one_or_none()
+    await db.commit()
+    return deleted is not None
+
+
+async def create_tasks_bulk(db: AsyncSession, tasks: List[schemas.TaskCreate]) -> List[Row]:
+    """
+    Crea varias tareas en una sola transacción. Ver crud.create_tasks_bulk.
+
+    Returns:
+        Filas (id, title, description, completed) de las tareas creadas, en el mismo orden
+    """
+    if not tasks:
+        return []
+
+    table = models.Task.__table__
+    rows = [
+        {"title": task.title, "description": task.description, "completed": False}
+        for task in tasks
+    ]
+    created = (await db.execute(insert(table).returning(*table.c), rows)).all()
+    await db.commit()
+    return sorted(created, key=lambda row: row.id)
+
+
+async def update_tasks_bulk(
+    db: AsyncSession,
+    updates: List[schemas.TaskBulkUpdate]
+) -> Dict[int, models.Task]:
+    """
+    Aplica actualizaciones parciales a varias tareas en una sola transacción.
+    Ver crud.update_tasks_bulk.
+
+    Returns:
+        Diccionario {id: tarea actualizada} con las tareas que existían
+    """
+    ids = list({item.id for item in updates})
+    existing = set()
+    for chunk in _chunks(ids):
+        existing.update(await db.scalars(select(models.Task.id).where(models.Task.id.in_(chunk))))
+
+    params = [
+        item.model_dump(exclude_unset=True)
+        for item in updates
+        if item.id in existing
+    ]
+    params = [p for p in params if len(p) > 1]
+    if params:
+        await db.execute(update(models.Task), params)
+    await db.commit()
+
+    updated = {}
+    for chunk in _chunks(list(existing)):
+        # populate_existing: las tareas ya cargadas en la sesión se refrescan con los cambios
+        result = await db.scalars(
+            select(models.Task).where(models.Task.id.in_(chunk)).execution_options(populate_existing=True)
+        )
+        for task in result:
+            updated[task.id] = task
+    return updated
+
+
+async def delete_tasks_bulk(db: AsyncSession, task_ids: List[int]) -> List[int]:
+    """
+    Elimina varias tareas en una sola transacción usando DELETE ... RETURNING.
+
+    Returns:
+        Lista de IDs que existían y fueron eliminados
+    """
+    deleted = []
+    for chunk in _chunks(list(set(task_ids))):
+        deleted.extend(await db.scalars(
+            delete(models.Task).where(models.Task.id.in_(chunk)).returning(models.Task.id)
+        ))
+    await db.commit()
+    return deleted
+
+
+async def iter_task_rows(
+    db: AsyncSession,
+    completed: Optional[bool] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Recorre la tabla completa en bloques de filas sin crear objetos ORM.
+    Ver crud.iter_task_rows.
+
+    Yields:
+        Bloques de filas (id, title, description, completed) ordenadas por ID
+    """
+    table = models.Task.__table__
+    query = select(*task_columns()).order_by(table.c.id)
+    if completed is not None:
+        query = query.where(table.c.completed == completed)
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def insert_task_rows(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Inserta un bloque de tareas con un executemany, sin RETURNING ni commit.
+    """
+    if rows:
+        await db.execute(insert(models.Task.__table__), rows)
@@ -4,7 +4,8 @@ Configuración de la base de datos SQLite con SQLAlchemy.
 Gestiona la conexión y las sesiones de base de datos.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -17,19 +18,140 @@ os.makedirs("/app/data", exist_ok=True) if os.path.exists("/app") else None
 
 # Usar /app/data en Docker, o directorio actual en desarrollo local
 if os.path.exists("/app/data"):
-    SQLALCHEMY_DATABASE_URL = "sqlite:////app/data/quicktask.db"
+    DEFAULT_DATABASE_URL = "sqlite:////app/data/quicktask.db"
 else:
-    SQLALCHEMY_DATABASE_URL = "sqlite:///./quicktask.db"
+    DEFAULT_DATABASE_URL = "sqlite:///./quicktask.db"
 
-# Crear el motor de base de datos
-# check_same_thread=False es necesario para SQLite con FastAPI
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL)
+
+# Perfiles de PRAGMAs que se aplican a cada conexión nueva.
+# - default: la configuración de fábrica de SQLite (journal de rollback, synchronous=FULL)
+# - performance: WAL para que lectores y escritor no se bloqueen entre sí,
+#   synchronous=NORMAL (en WAL solo se pierde la última transacción si cae el
+#   sistema, nunca se corrompe la base), mmap y caché de páginas más grandes y
+#   busy_timeout para esperar el bloqueo de escritura en lugar de fallar.
+SQLITE_PROFILES = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # en KiB cuando es negativo
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "performance")
+
+# Conexiones de cada pool. SQLite admite un solo escritor a la vez, pero pysqlite
+# solo abre la transacción al llegar al INSERT/UPDATE/DELETE, así que varias
+# conexiones de escritura pueden adelantar las lecturas previas de cada petición.
+WRITE_POOL_SIZE = int(os.environ.get("DB_WRITE_POOL_SIZE", "5"))
+READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "8"))
+# Conexiones extra en los picos (-1: sin límite); se cierran al devolverse al pool.
+# Con un límite, los hilos del threadpool de FastAPI pueden quedarse todos esperando
+# una conexión mientras las peticiones que las tienen esperan un hilo libre para
+# serializar la respuesta y cerrar la sesión: el pool se bloquea hasta pool_timeout.
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "-1"))
+
+# Capa de acceso: sync (Session en el threadpool de FastAPI) o async (AsyncSession con aiosqlite)
+DB_MODE = os.environ.get("DB_MODE", "sync")
+
+
+def configure_sqlite(engine: Engine, pragmas: dict, read_only: bool = False) -> Engine:
+    """
+    Aplica `pragmas` a cada conexión que abra `engine`.
+
+    Args:
+        engine: Motor SQLite a configurar
+        pragmas: Nombre y valor de cada PRAGMA
+        read_only: Activa query_only para que la conexión rechace escrituras
+
+    Returns:
+        El mismo motor, para poder encadenar la llamada
+    """
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return engine
+
+
+def create_sqlite_engine(
+    url: str = SQLALCHEMY_DATABASE_URL,
+    profile: str = SQLITE_PROFILE,
+    read_only: bool = False,
+    pool_size: int = None
+) -> Engine:
+    """
+    Crea un motor SQLite con el perfil de PRAGMAs `profile`.
+
+    Args:
+        url: URL de la base de datos
+        profile: Clave de SQLITE_PROFILES
+        read_only: Motor para el pool de lectura (query_only)
+        pool_size: Conexiones del pool; por defecto WRITE_POOL_SIZE o READ_POOL_SIZE
+
+    Returns:
+        Motor configurado
+    """
+    pragmas = SQLITE_PROFILES[profile]
+    options = {}
+    if pragmas:
+        options["pool_size"] = pool_size or (READ_POOL_SIZE if read_only else WRITE_POOL_SIZE)
+        options["max_overflow"] = MAX_OVERFLOW
+
+    # check_same_thread=False es necesario para SQLite con FastAPI
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **options)
+    if not pragmas:
+        return engine
+    return configure_sqlite(engine, pragmas, read_only=read_only)
+
+
+def create_async_sqlite_engine(
+    url: str = SQLALCHEMY_DATABASE_URL,
+    profile: str = SQLITE_PROFILE,
+    read_only: bool = False,
+    pool_size: int = None
+):
+    """
+    Versión async de create_sqlite_engine con el driver aiosqlite.
+    Los PRAGMAs se aplican igual, a través del motor síncrono subyacente.
+
+    Returns:
+        AsyncEngine configurado
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    pragmas = SQLITE_PROFILES[profile]
+    options = {}
+    if pragmas:
+        # aiosqlite usa NullPool por defecto: abriría una conexión (y un hilo) por petición
+        options["poolclass"] = AsyncAdaptedQueuePool
+        options["pool_size"] = pool_size or (READ_POOL_SIZE if read_only else WRITE_POOL_SIZE)
+        options["max_overflow"] = MAX_OVERFLOW
+
+    async_url = make_url(url).set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(async_url, connect_args={"check_same_thread": False}, **options)
+    if pragmas:
+        configure_sqlite(engine.sync_engine, pragmas, read_only=read_only)
+    return engine
+
+
+# Crear los motores de base de datos: uno para escrituras y otro para las rutas de solo lectura.
+# Con el perfil default se comparte el mismo motor, como antes.
+engine = create_sqlite_engine()
+read_engine = create_sqlite_engine(read_only=True) if SQLITE_PROFILES[SQLITE_PROFILE] else engine
 
 # Crear una sesión local para interactuar con la base de datos
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Base para los modelos ORM
 Base = declarative_base()
@@ -46,3 +168,63 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependencia que proporciona una sesión del pool de lectura.
+    Se usa en las rutas que no escriben para que no esperen al escritor.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Motores y sesiones async: solo se crean con DB_MODE=async, aiosqlite es opcional
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_async_sqlite_engine()
+    async_read_engine = (
+        create_async_sqlite_engine(read_only=True) if SQLITE_PROFILES[SQLITE_PROFILE] else async_engine
+    )
+    # expire_on_commit=False: tras el commit los atributos no pueden recargarse de forma perezosa
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    Dependencia que proporciona una AsyncSession (DB_MODE=async).
+    Asegura que la sesión se cierre después de cada request.
+    """
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db():
+    """
+    Dependencia que proporciona una AsyncSession del pool de lectura (DB_MODE=async).
+    """
+    db = AsyncReadSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engines():
+    """
+    Cierra las conexiones de los motores async al apagar la aplicación.
+    Cada conexión de aiosqlite vive en su propio hilo y, abierta, impide que el proceso termine.
+    """
+    if DB_MODE != "async":
+        return
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
@@ -4,15 +4,27 @@ Aplicación principal de FastAPI.
 Define los endpoints REST y la configuración de la aplicación QuickTask.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from .database import engine, get_db, Base
+from .database import engine, get_db, get_read_db, Base
 from . import crud, schemas
+from .bulk import read_bulk_items, report_missing, validate_items
+from .cache import cache_from_env, entry_response, task_entry, task_list_entry
+from .pagination import encode_cursor, resolve_cursor
+from .migrations import migrate
+from .search import match_expression
+from .streaming import EXPORT_FORMATS, export_rows, import_ndjson
 
 # Crear las tablas en la base de datos
 Base.metadata.create_all(bind=engine)
+# Índices y tablas que create_all no añade a una base existente
+migrate(engine)
+
+# Caché de respuestas de lectura (None con CACHE_BACKEND=none)
+task_cache = cache_from_env()
 
 # Inicializar la aplicación FastAPI
 app = FastAPI(
@@ -24,6 +36,12 @@ app = FastAPI(
 )
 
 
+def _invalidate(task_ids=(), completed=(True, False)):
+    """Invalida la caché tras una escritura, si está activa."""
+    if task_cache:
+        task_cache.invalidate(task_ids, completed)
+
+
 @app.get("/", tags=["Root"])
 def read_root():
     """
@@ -53,7 +71,9 @@ def create_task(
     - **title**: Título de la tarea (obligatorio)
     - **description**: Descripción detallada (opcional)
     """
-    return crud.create_task(db=db, task=task)
+    db_task = crud.create_task(db=db, task=task)
+    _invalidate(completed=(False,))
+    return db_task
 
 
 @app.get(
@@ -63,20 +83,203 @@ def create_task(
     summary="Listar todas las tareas"
 )
 def read_tasks(
+    request: Request,
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
     completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor)"),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Obtiene una lista de tareas con opciones de paginación y filtrado.
+    Obtiene una lista de tareas ordenadas por ID con opciones de paginación y filtrado.
     
-    - **skip**: Saltar N primeros registros (paginación)
+    - **skip**: Saltar N primeros registros (paginación por OFFSET)
     - **limit**: Limitar resultados a N registros
     - **completed**: Filtrar por estado completado (opcional)
+    - **cursor**: Continuar desde la página anterior (paginación por clave)
+    
+    Si puede haber más resultados, la respuesta incluye la cabecera **X-Next-Cursor**
+    con el cursor de la página siguiente. A diferencia de **skip**, el coste de
+    pedir una página con cursor no crece con la profundidad.
+    
+    La respuesta lleva **ETag**; con `If-None-Match` se devuelve 304 sin cuerpo
+    si la página no ha cambiado.
+    """
+    try:
+        after_id, completed = resolve_cursor(cursor, skip, completed)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    key = task_cache.list_key(skip, limit, completed, after_id) if task_cache else None
+    entry = task_cache.get_list(key) if task_cache else None
+    if entry is None:
+        tasks = crud.get_task_rows(db=db, skip=skip, limit=limit, completed=completed, after_id=after_id)
+        # Página llena: puede haber más, se indica desde dónde seguir
+        next_cursor = encode_cursor(tasks[-1].id, completed) if len(tasks) == limit else None
+        entry = task_list_entry(tasks, next_cursor)
+        if task_cache:
+            task_cache.set_list(key, entry)
+    return entry_response(request, entry)
+
+
+# ==================== OPERACIONES MASIVAS ====================
+# Se declaran antes de /tasks/{task_id} para que "bulk" no se tome como un ID.
+# Aceptan un array JSON o NDJSON (Content-Type: application/x-ndjson).
+
+@app.post(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Bulk"],
+    summary="Crear varias tareas"
+)
+def create_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: Session = Depends(get_db)
+):
+    """
+    Crea varias tareas en una sola transacción.
+    Los elementos inválidos se reportan en **errors** y no impiden crear el resto.
+    
+    - Cada elemento tiene el formato de `POST /tasks` (**title**, **description**)
     """
-    tasks = crud.get_tasks(db=db, skip=skip, limit=limit, completed=completed)
-    return tasks
+    valid, errors = validate_items(items, schemas.TaskCreate)
+    created = crud.create_tasks_bulk(db=db, tasks=[task for _, task in valid])
+    if created:
+        _invalidate(completed=(False,))
+    return schemas.TaskBulkResponse(items=created, errors=errors)
+
+
+@app.patch(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkResponse,
+    tags=["Bulk"],
+    summary="Actualizar varias tareas"
+)
+def update_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: Session = Depends(get_db)
+):
+    """
+    Actualiza parcialmente varias tareas en una sola transacción.
+    Los IDs inexistentes y los elementos inválidos se reportan en **errors**.
+    
+    - Cada elemento lleva **id** y los campos a cambiar (**title**, **description**, **completed**)
+    """
+    valid, errors = validate_items(items, schemas.TaskBulkUpdate)
+    updated = crud.update_tasks_bulk(db=db, updates=[update for _, update in valid])
+    if updated:
+        _invalidate(updated)
+    
+    tasks = [updated[update.id] for _, update in valid if update.id in updated]
+    return schemas.TaskBulkResponse(items=tasks, errors=report_missing(valid, updated, errors))
+
+
+@app.delete(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkDeleteResponse,
+    tags=["Bulk"],
+    summary="Eliminar varias tareas"
+)
+def delete_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: Session = Depends(get_db)
+):
+    """
+    Elimina varias tareas en una sola transacción.
+    Los IDs inexistentes se reportan en **errors**.
+    
+    - Cada elemento es un ID o un objeto con **id**
+    """
+    items = [
+        {"id": item} if isinstance(item, int) and not isinstance(item, bool) else item
+        for item in items
+    ]
+    valid, errors = validate_items(items, schemas.TaskBulkDelete)
+    deleted = set(crud.delete_tasks_bulk(db=db, task_ids=[item.id for _, item in valid]))
+    if deleted:
+        _invalidate(deleted)
+    return schemas.TaskBulkDeleteResponse(deleted=sorted(deleted), errors=report_missing(valid, deleted, errors))
+
+
+# ==================== EXPORTACIÓN / IMPORTACIÓN ====================
+# Transmiten la tabla en streaming: la memoria no crece con el número de tareas.
+
+@app.get(
+    "/tasks/export",
+    tags=["Export"],
+    summary="Exportar todas las tareas",
+    response_class=StreamingResponse
+)
+def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida: ndjson o csv"),
+    completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Exporta las tareas ordenadas por ID sin paginar.
+    Las filas se leen del cursor de la base por bloques y se escriben tal cual,
+    sin pasar por objetos ORM ni por Pydantic.
+    
+    - **format**: `ndjson` (un objeto JSON por línea) o `csv` (con cabecera)
+    - **completed**: Filtro opcional por estado
+    """
+    return StreamingResponse(
+        export_rows(db, format, completed=completed),
+        media_type=EXPORT_FORMATS[format][2],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+
+@app.post(
+    "/tasks/import",
+    response_model=schemas.TaskImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Export"],
+    summary="Importar tareas desde NDJSON"
+)
+async def import_tasks(request: Request, db: Session = Depends(get_db)):
+    """
+    Importa tareas desde un cuerpo NDJSON leído en streaming.
+    Se insertan por bloques en una sola transacción; las líneas inválidas se
+    cuentan y no impiden importar el resto.
+    
+    - Cada línea lleva **title** y opcionalmente **description** y **completed**
+    - El **id** de cada línea se ignora: la base asigna uno nuevo
+    """
+    report = await import_ndjson(request, db)
+    if report.imported:
+        _invalidate()
+    return report
+
+
+# ==================== BÚSQUEDA ====================
+
+@app.get(
+    "/tasks/search",
+    response_model=List[schemas.TaskSearchResult],
+    tags=["Search"],
+    summary="Buscar tareas por texto"
+)
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Palabras a buscar; `palabra*` busca por prefijo"),
+    limit: int = Query(20, ge=1, le=100, description="Número máximo de resultados"),
+    completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Busca tareas por título y descripción en el índice de texto completo (FTS5).
+    Los resultados se ordenan por relevancia (BM25, el título pesa más que la
+    descripción) e incluyen un fragmento con las coincidencias marcadas.
+    
+    - **q**: Deben aparecer todas las palabras; sin distinguir mayúsculas ni tildes
+    - **limit**: Limitar resultados a N tareas
+    - **completed**: Filtrar por estado completado (opcional)
+    """
+    query = match_expression(q)
+    if query is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La búsqueda no contiene ninguna palabra")
+    return crud.search_tasks(db=db, query=query, limit=limit, completed=completed)
 
 
 @app.get(
@@ -87,22 +290,30 @@ def read_tasks(
 )
 def read_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtiene una tarea específica por su ID.
+    La respuesta lleva **ETag**; con `If-None-Match` se devuelve 304 sin cuerpo
+    si la tarea no ha cambiado.
     
     - **task_id**: ID único de la tarea
     """
-    db_task = crud.get_task(db=db, task_id=task_id)
-    
-    if db_task is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tarea con ID {task_id} no encontrada"
-        )
-    
-    return db_task
+    entry = task_cache.get_task(task_id) if task_cache else None
+    if entry is None:
+        db_task = crud.get_task(db=db, task_id=task_id)
+        
+        if db_task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tarea con ID {task_id} no encontrada"
+            )
+        
+        entry = task_entry(db_task)
+        if task_cache:
+            task_cache.set_task(task_id, entry)
+    return entry_response(request, entry)
 
 
 @app.put(
@@ -133,6 +344,8 @@ def update_task(
             detail=f"Tarea con ID {task_id} no encontrada"
         )
     
+    # Si cambia el estado, la tarea sale de una lista filtrada y entra en la otra
+    _invalidate([task_id], completed=(True, False) if task.completed is not None else (db_task.completed,))
     return db_task
 
 
@@ -159,6 +372,7 @@ def delete_task(
             detail=f"Tarea con ID {task_id} no encontrada"
         )
     
+    _invalidate([task_id])
     return None
 
 
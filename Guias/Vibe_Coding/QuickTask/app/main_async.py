@@ -0,0 +1,369 @@
+"""
+📁 main_async.py
+Aplicación FastAPI con acceso async a la base de datos (DB_MODE=async).
+Mismas rutas y respuestas que main.py, pero los endpoints son `async def` y
+usan AsyncSession con aiosqlite: una petición que espera a SQLite no ocupa un
+hilo del threadpool, así que la concurrencia no queda limitada por su tamaño.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional
+
+from .database import engine, dispose_async_engines, get_async_db, get_async_read_db, Base
+from . import crud_async, schemas
+from .bulk import read_bulk_items, report_missing, validate_items
+from .cache import cache_from_env, entry_response, task_entry, task_list_entry
+from .pagination import encode_cursor, resolve_cursor
+from .migrations import migrate
+from .search import match_expression
+from .streaming import EXPORT_FORMATS, export_rows_async, import_ndjson_async
+
+# Crear las tablas en la base de datos
+Base.metadata.create_all(bind=engine)
+# Índices y tablas que create_all no añade a una base existente
+migrate(engine)
+
+# Caché de respuestas de lectura (None con CACHE_BACKEND=none)
+task_cache = cache_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Al apagar cierra las conexiones de aiosqlite para que el proceso pueda terminar."""
+    yield
+    await dispose_async_engines()
+
+
+# Inicializar la aplicación FastAPI
+app = FastAPI(
+    title="QuickTask API",
+    description="API REST minimalista para gestión de tareas personales",
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+
+def _invalidate(task_ids=(), completed=(True, False)):
+    """Invalida la caché tras una escritura, si está activa."""
+    if task_cache:
+        task_cache.invalidate(task_ids, completed)
+
+
+@app.get("/", tags=["Root"])
+async def read_root():
+    """
+    Endpoint raíz de bienvenida.
+    """
+    return {
+        "message": "Bienvenido a QuickTask API",
+        "version": "1.0.0",
+        "docs": "/docs"
+    }
+
+
+@app.post(
+    "/tasks",
+    response_model=schemas.TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Tasks"],
+    summary="Crear una nueva tarea"
+)
+async def create_task(
+    task: schemas.TaskCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crea una nueva tarea en el sistema.
+
+    - **title**: Título de la tarea (obligatorio)
+    - **description**: Descripción detallada (opcional)
+    """
+    db_task = await crud_async.create_task(db=db, task=task)
+    _invalidate(completed=(False,))
+    return db_task
+
+
+@app.get(
+    "/tasks",
+    response_model=List[schemas.TaskResponse],
+    tags=["Tasks"],
+    summary="Listar todas las tareas"
+)
+async def read_tasks(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
+    completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (cabecera X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Obtiene una lista de tareas ordenadas por ID con opciones de paginación y filtrado.
+
+    - **skip**: Saltar N primeros registros (paginación por OFFSET)
+    - **limit**: Limitar resultados a N registros
+    - **completed**: Filtrar por estado completado (opcional)
+    - **cursor**: Continuar desde la página anterior (paginación por clave)
+    """
+    try:
+        after_id, completed = resolve_cursor(cursor, skip, completed)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    key = task_cache.list_key(skip, limit, completed, after_id) if task_cache else None
+    entry = task_cache.get_list(key) if task_cache else None
+    if entry is None:
+        tasks = await crud_async.get_task_rows(db=db, skip=skip, limit=limit, completed=completed, after_id=after_id)
+        next_cursor = encode_cursor(tasks[-1].id, completed) if len(tasks) == limit else None
+        entry = task_list_entry(tasks, next_cursor)
+        if task_cache:
+            task_cache.set_list(key, entry)
+    return entry_response(request, entry)
+
+
+# ==================== OPERACIONES MASIVAS ====================
+# Se declaran antes de /tasks/{task_id} para que "bulk" no se tome como un ID.
+
+@app.post(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Bulk"],
+    summary="Crear varias tareas"
+)
+async def create_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Crea varias tareas en una sola transacción.
+    Los elementos inválidos se reportan en **errors** y no impiden crear el resto.
+    """
+    valid, errors = validate_items(items, schemas.TaskCreate)
+    created = await crud_async.create_tasks_bulk(db=db, tasks=[task for _, task in valid])
+    if created:
+        _invalidate(completed=(False,))
+    return schemas.TaskBulkResponse(items=created, errors=errors)
+
+
+@app.patch(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkResponse,
+    tags=["Bulk"],
+    summary="Actualizar varias tareas"
+)
+async def update_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualiza parcialmente varias tareas en una sola transacción.
+    Los IDs inexistentes y los elementos inválidos se reportan en **errors**.
+    """
+    valid, errors = validate_items(items, schemas.TaskBulkUpdate)
+    updated = await crud_async.update_tasks_bulk(db=db, updates=[update for _, update in valid])
+    if updated:
+        _invalidate(updated)
+
+    tasks = [updated[update.id] for _, update in valid if update.id in updated]
+    return schemas.TaskBulkResponse(items=tasks, errors=report_missing(valid, updated, errors))
+
+
+@app.delete(
+    "/tasks/bulk",
+    response_model=schemas.TaskBulkDeleteResponse,
+    tags=["Bulk"],
+    summary="Eliminar varias tareas"
+)
+async def delete_tasks_bulk(
+    items: List[Any] = Depends(read_bulk_items),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Elimina varias tareas en una sola transacción.
+    Los IDs inexistentes se reportan en **errors**.
+    """
+    items = [
+        {"id": item} if isinstance(item, int) and not isinstance(item, bool) else item
+        for item in items
+    ]
+    valid, errors = validate_items(items, schemas.TaskBulkDelete)
+    deleted = set(await crud_async.delete_tasks_bulk(db=db, task_ids=[item.id for _, item in valid]))
+    if deleted:
+        _invalidate(deleted)
+    return schemas.TaskBulkDeleteResponse(deleted=sorted(deleted), errors=report_missing(valid, deleted, errors))
+
+
+# ==================== EXPORTACIÓN / IMPORTACIÓN ====================
+
+@app.get(
+    "/tasks/export",
+    tags=["Export"],
+    summary="Exportar todas las tareas",
+    response_class=StreamingResponse
+)
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida: ndjson o csv"),
+    completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Exporta las tareas ordenadas por ID sin paginar, en streaming.
+
+    - **format**: `ndjson` (un objeto JSON por línea) o `csv` (con cabecera)
+    - **completed**: Filtro opcional por estado
+    """
+    return StreamingResponse(
+        export_rows_async(db, format, completed=completed),
+        media_type=EXPORT_FORMATS[format][2],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+
+@app.post(
+    "/tasks/import",
+    response_model=schemas.TaskImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Export"],
+    summary="Importar tareas desde NDJSON"
+)
+async def import_tasks(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Importa tareas desde un cuerpo NDJSON leído en streaming, por bloques y
+    en una sola transacción.
+    """
+    report = await import_ndjson_async(request, db)
+    if report.imported:
+        _invalidate()
+    return report
+
+
+# ==================== BÚSQUEDA ====================
+
+@app.get(
+    "/tasks/search",
+    response_model=List[schemas.TaskSearchResult],
+    tags=["Search"],
+    summary="Buscar tareas por texto"
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Palabras a buscar; `palabra*` busca por prefijo"),
+    limit: int = Query(20, ge=1, le=100, description="Número máximo de resultados"),
+    completed: Optional[bool] = Query(None, description="Filtrar por estado (true/false)"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Busca tareas por título y descripción en el índice de texto completo (FTS5),
+    ordenadas por relevancia (BM25).
+    """
+    query = match_expression(q)
+    if query is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La búsqueda no contiene ninguna palabra")
+    return await crud_async.search_tasks(db=db, query=query, limit=limit, completed=completed)
+
+
+@app.get(
+    "/tasks/{task_id}",
+    response_model=schemas.TaskResponse,
+    tags=["Tasks"],
+    summary="Obtener una tarea específica"
+)
+async def read_task(
+    task_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Obtiene una tarea específica por su ID, con **ETag** como en main.py.
+
+    - **task_id**: ID único de la tarea
+    """
+    entry = task_cache.get_task(task_id) if task_cache else None
+    if entry is None:
+        db_task = await crud_async.get_task(db=db, task_id=task_id)
+
+        if db_task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tarea con ID {task_id} no encontrada"
+            )
+
+        entry = task_entry(db_task)
+        if task_cache:
+            task_cache.set_task(task_id, entry)
+    return entry_response(request, entry)
+
+
+@app.put(
+    "/tasks/{task_id}",
+    response_model=schemas.TaskResponse,
+    tags=["Tasks"],
+    summary="Actualizar una tarea"
+)
+async def update_task(
+    task_id: int,
+    task: schemas.TaskUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualiza una tarea existente.
+    Solo se actualizan los campos proporcionados.
+
+    - **task_id**: ID de la tarea a actualizar
+    """
+    db_task = await crud_async.update_task(db=db, task_id=task_id, task_update=task)
+
+    if db_task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tarea con ID {task_id} no encontrada"
+        )
+
+    _invalidate([task_id], completed=(True, False) if task.completed is not None else (db_task.completed,))
+    return db_task
+
+
+@app.delete(
+    "/tasks/{task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Tasks"],
+    summary="Eliminar una tarea"
+)
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Elimina una tarea del sistema.
+
+    - **task_id**: ID de la tarea a eliminar
+    """
+    success = await crud_async.delete_task(db=db, task_id=task_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tarea con ID {task_id} no encontrada"
+        )
+
+    _invalidate([task_id])
+    return None
+
+
+@app.get("/health", tags=["Health"])
+async def health_check():
+    """
+    Endpoint de verificación de salud de la aplicación.
+    """
+    return {"status": "healthy", "service": "QuickTask API"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("app.main_async:app", host="0.0.0.0", port=8000, reload=True)
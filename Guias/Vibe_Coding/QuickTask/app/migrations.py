@@ -0,0 +1,108 @@
+"""
+📁 migrations.py
+Migraciones del esquema de SQLite numeradas con PRAGMA user_version.
+
+`create_all` solo crea las tablas que faltan: no añade índices ni cambia tablas
+que ya existen. Cada migración lleva una base existente de la versión N-1 a la N
+dentro de una transacción; las bases nuevas las aplican igual, y por eso cada
+paso es idempotente (IF NOT EXISTS / IF EXISTS).
+
+Uso:
+    python -m app.migrations          # aplica las pendientes
+    python -m app.migrations status   # muestra la versión actual
+"""
+
+import argparse
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy.engine import Connection, Engine
+
+from .search import install_search, rebuild_search_index
+
+
+class Migration(NamedTuple):
+    """Paso de migración: la base queda en `version` al aplicarlo."""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _add_search_index(connection: Connection) -> None:
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).first()
+    install_search(connection)
+    if not exists:
+        rebuild_search_index(connection)
+
+
+def _add_status_index(connection: Connection) -> None:
+    # (completed, id): el filtro por estado es una igualdad y el orden por ID sale
+    # del propio índice, sin recorrer la tabla ni ordenar después. Un índice parcial
+    # por estado (WHERE completed = 1) no sirve: la consulta usa un parámetro y
+    # SQLite no puede demostrar que coincide con la condición del índice.
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_completed_id ON tasks (completed, id)")
+    # El ID es el rowid: el índice ix_tasks_id duplicaba la clave primaria
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_tasks_id")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Índice de búsqueda FTS5 y sus triggers", _add_search_index),
+    Migration(2, "Índice (completed, id) para listar por estado", _add_status_index),
+]
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(connection: Connection) -> int:
+    """Versión del esquema guardada en la base."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Aplica las migraciones pendientes, cada una en su transacción.
+
+    Args:
+        engine: Motor de la base a migrar (con la tabla tasks ya creada)
+
+    Returns:
+        Versiones aplicadas, en orden
+    """
+    applied = []
+    for migration in MIGRATIONS:
+        with engine.begin() as connection:
+            # pysqlite no abre transacción antes de un CREATE/DROP: se abre a mano para
+            # que el paso sea atómico. IMMEDIATE toma el bloqueo de escritura antes de
+            # leer la versión, así dos workers que arrancan a la vez no migran los dos.
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            if schema_version(connection) >= migration.version:
+                continue
+            migration.apply(connection)
+            # PRAGMA no admite parámetros; la versión es un entero de esta lista
+            connection.exec_driver_sql(f"PRAGMA user_version = {migration.version:d}")
+        applied.append(migration.version)
+    return applied
+
+
+def main():
+    from .database import Base, engine
+
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de QuickTask")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    args = parser.parse_args()
+
+    if args.command == "status":
+        with engine.connect() as connection:
+            print(f"Versión del esquema: {schema_version(connection)} (última: {SCHEMA_VERSION})")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    applied = migrate(engine)
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            print(f"{migration.version}: {migration.description}")
+    print(f"Esquema en la versión {SCHEMA_VERSION}" if applied else "El esquema ya estaba al día")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Modelos ORM de la base de datos usando SQLAlchemy.
 Define la estructura de la tabla Task en la base de datos.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Index, Integer, String, Boolean
 from .database import Base
 
 
@@ -19,8 +19,12 @@ class Task(Base):
         completed: Estado de la tarea (pendiente=False / completada=True)
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Listados filtrados por estado y ordenados o paginados por ID (migración 2)
+        Index("ix_tasks_completed_id", "completed", "id"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False, index=True)
     description = Column(String, nullable=True)
     completed = Column(Boolean, default=False, nullable=False)
@@ -0,0 +1,70 @@
+"""
+📁 pagination.py
+Cursores opacos para la paginación por clave (keyset) de GET /tasks.
+El cursor guarda el último ID devuelto y el filtro de la consulta, de modo
+que la página siguiente se obtiene con WHERE id > :ultimo en lugar de OFFSET.
+"""
+
+import base64
+import json
+from typing import Optional, Tuple
+
+
+def encode_cursor(last_id: int, completed: Optional[bool]) -> str:
+    """
+    Codifica el cursor de la página siguiente.
+    
+    Args:
+        last_id: ID de la última tarea de la página actual
+        completed: Filtro por estado usado en la consulta
+    
+    Returns:
+        Cadena opaca en base64 url-safe
+    """
+    data = json.dumps({"id": last_id, "completed": completed}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[bool]]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+    
+    Returns:
+        (último ID, filtro por estado)
+    
+    Raises:
+        ValueError: si el cursor no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id, completed = data["id"], data["completed"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or completed not in (None, True, False):
+        raise ValueError("Cursor inválido")
+    return last_id, completed
+
+
+def resolve_cursor(
+    cursor: Optional[str],
+    skip: int,
+    completed: Optional[bool]
+) -> Tuple[Optional[int], Optional[bool]]:
+    """
+    Combina el cursor recibido con los parámetros de la consulta.
+    
+    Returns:
+        (ID a partir del cual seguir o None, filtro por estado a aplicar)
+    
+    Raises:
+        ValueError: si el cursor no es válido o contradice skip/completed
+    """
+    if cursor is None:
+        return None, completed
+    if skip:
+        raise ValueError("No se puede combinar skip con cursor")
+    after_id, cursor_completed = decode_cursor(cursor)
+    if completed is not None and completed != cursor_completed:
+        raise ValueError("El filtro completed no coincide con el del cursor")
+    return after_id, cursor_completed
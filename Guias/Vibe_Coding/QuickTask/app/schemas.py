@@ -4,8 +4,8 @@ Esquemas de validación usando Pydantic.
 Define los modelos de datos para requests y responses de la API.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 
 
 class TaskBase(BaseModel):
@@ -46,3 +46,74 @@ class TaskResponse(TaskBase):
     class Config:
         """Configuración para permitir la conversión desde modelos ORM"""
         from_attributes = True  # Anteriormente orm_mode = True en Pydantic v1
+
+
+class TaskSearchResult(TaskResponse):
+    """
+    Resultado de la búsqueda de texto completo.
+    """
+    snippet: str = Field(..., description="Fragmento con las coincidencias marcadas con <mark>")
+    rank: float = Field(..., description="Puntuación BM25 (menor es más relevante)")
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """
+    Esquema de un elemento de actualización masiva.
+    Igual que TaskUpdate pero indicando el ID de la tarea a modificar.
+    """
+    id: int = Field(..., description="ID de la tarea a actualizar")
+
+    @field_validator("title", "completed")
+    @classmethod
+    def reject_null(cls, value):
+        """
+        Un null explícito en un campo NOT NULL se rechaza aquí, como error del
+        elemento: en el UPDATE masivo haría fallar el lote entero.
+        (Solo se ejecuta si el campo viene en el JSON.)
+        """
+        if value is None:
+            raise ValueError("no puede ser null")
+        return value
+
+
+class TaskBulkDelete(BaseModel):
+    """
+    Esquema de un elemento de eliminación masiva.
+    """
+    id: int = Field(..., description="ID de la tarea a eliminar")
+
+
+class BulkItemError(BaseModel):
+    """
+    Error de un elemento concreto dentro de una operación masiva.
+    El resto del lote se procesa igualmente.
+    """
+    index: int = Field(..., description="Posición del elemento en el lote (desde 0)")
+    id: Optional[int] = Field(None, description="ID de la tarea afectada, si se conoce")
+    detail: str = Field(..., description="Motivo del error")
+
+
+class TaskBulkResponse(BaseModel):
+    """
+    Respuesta de creación o actualización masiva.
+    """
+    items: List[TaskResponse] = Field(default_factory=list, description="Tareas creadas o actualizadas")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Elementos que no se procesaron")
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    """
+    Respuesta de eliminación masiva.
+    """
+    deleted: List[int] = Field(default_factory=list, description="IDs eliminados")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Elementos que no se procesaron")
+
+
+class TaskImportResponse(BaseModel):
+    """
+    Respuesta de la importación en streaming.
+    Solo se detallan los primeros errores; **error_count** los cuenta todos.
+    """
+    imported: int = Field(..., description="Tareas importadas")
+    error_count: int = Field(0, description="Líneas que no se importaron")
+    errors: List[BulkItemError] = Field(default_factory=list, description="Primeros errores encontrados")
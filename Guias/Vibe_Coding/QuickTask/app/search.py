@@ -0,0 +1,154 @@
+"""
+📁 search.py
+Búsqueda de texto completo sobre título y descripción con SQLite FTS5.
+
+`tasks_fts` es una tabla FTS5 de contenido externo: el índice invertido apunta a
+las filas de `tasks` por su ID y no duplica el texto. Tres triggers lo mantienen
+sincronizado con cualquier INSERT, UPDATE o DELETE, incluidos los masivos y la
+importación. Las bases creadas antes de la búsqueda lo reciben con la migración 1
+(ver migrations.py); para reconstruirlo desde cero:
+
+    python -m app.search rebuild
+"""
+
+import argparse
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+
+from . import models
+
+# Peso de cada columna en BM25: una coincidencia en el título cuenta más
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+# Coincidencias más recientes que se puntúan. BM25 tiene que puntuar cada fila que
+# coincide antes de ordenar: con una palabra presente en 400.000 tareas eso es ~1 s.
+# Si hay más coincidencias que SEARCH_WINDOW, solo se ordenan por relevancia las
+# SEARCH_WINDOW con ID más alto; por debajo del límite el ranking es exacto.
+SEARCH_WINDOW = 2000
+# Tokens de contexto alrededor de las coincidencias en el fragmento
+SNIPPET_TOKENS = 12
+SNIPPET_MARKS = ("<mark>", "</mark>")
+
+# unicode61 con remove_diacritics: "canción" coincide con "cancion".
+# prefix='2 3': índices extra para que "ta*" o "tar*" no recorran todo el vocabulario.
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+)
+"""
+
+# Pesos por defecto de la columna oculta `rank`; se guardan en la propia tabla FTS
+CONFIGURE_RANK = f"INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})')"
+
+CREATE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    # Cambiar solo `completed` no toca el índice
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+# La subconsulta busca el ID de la coincidencia número :window (recorriendo el
+# índice de mayor a menor ID, sin puntuar); FTS5 aplica rowid >= como rango y solo
+# calcula BM25 y el fragmento de las filas a partir de ahí. El filtro por estado se
+# aplica también dentro de la subconsulta: la ventana cuenta solo las coincidencias
+# que pueden devolverse.
+SEARCH_SQL = f"""
+SELECT tasks.id, tasks.title, tasks.description, tasks.completed,
+       snippet(tasks_fts, -1, '{SNIPPET_MARKS[0]}', '{SNIPPET_MARKS[1]}', '…', {SNIPPET_TOKENS}) AS snippet,
+       tasks_fts.rank AS rank
+FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid
+WHERE tasks_fts MATCH :query
+  AND tasks_fts.rowid >= coalesce((
+      SELECT tasks_fts.rowid FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid
+      WHERE tasks_fts MATCH :query {{filter}}
+      ORDER BY tasks_fts.rowid DESC LIMIT 1 OFFSET :window - 1
+  ), 0)
+  {{filter}}
+ORDER BY tasks_fts.rank
+LIMIT :limit
+"""
+
+_TERM = re.compile(r"(\w+)(\*?)")
+
+
+def match_expression(q: str) -> Optional[str]:
+    """
+    Traduce el texto del usuario a una expresión MATCH de FTS5.
+    Cada palabra se entrecomilla, así que la sintaxis de FTS5 (NEAR, OR, ^, :)
+    no puede inyectarse; todas las palabras deben aparecer y una palabra que
+    termina en `*` busca por prefijo.
+
+    Args:
+        q: Texto de búsqueda, p. ej. "informe tri*"
+
+    Returns:
+        Expresión MATCH, o None si `q` no contiene ninguna palabra
+    """
+    terms = [f'"{word}"{star}' for word, star in _TERM.findall(q)]
+    return " ".join(terms) or None
+
+
+def search_statement(completed: Optional[bool] = None):
+    """Consulta de búsqueda con el filtro opcional por estado."""
+    return text(SEARCH_SQL.format(filter="AND tasks.completed = :completed" if completed is not None else ""))
+
+
+def install_search(connection: Connection) -> None:
+    """Crea la tabla FTS5 y sus triggers si no existen (no indexa filas previas)."""
+    connection.exec_driver_sql(CREATE_FTS_TABLE)
+    connection.exec_driver_sql(CONFIGURE_RANK)
+    for trigger in CREATE_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Reconstruye el índice completo a partir de la tabla tasks."""
+    connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+# Las bases nuevas (create_all) reciben la tabla FTS y los triggers junto con `tasks`.
+# Al borrar `tasks` SQLite elimina sus triggers, pero la tabla FTS hay que borrarla aparte.
+event.listen(models.Task.__table__, "after_create", DDL(CREATE_FTS_TABLE))
+event.listen(models.Task.__table__, "after_create", DDL(CONFIGURE_RANK))
+for _trigger in CREATE_TRIGGERS:
+    event.listen(models.Task.__table__, "after_create", DDL(_trigger))
+event.listen(models.Task.__table__, "before_drop", DDL("DROP TABLE IF EXISTS tasks_fts"))
+
+
+def main():
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="Índice de búsqueda de texto completo de QuickTask")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: crea el índice si falta y lo reconstruye")
+    parser.parse_args()
+
+    with engine.begin() as connection:
+        install_search(connection)
+        rebuild_search_index(connection)
+        total = connection.exec_driver_sql("SELECT COUNT(*) FROM tasks").scalar()
+    print(f"Índice de búsqueda reconstruido: {total} tareas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+📁 serialization.py
+Serialización directa de filas de tareas a JSON para los listados.
+
+El camino genérico crea un objeto ORM por fila, lo valida con TaskResponse
+(from_attributes) y después lo codifica. Aquí las filas son tuplas de columnas
+leídas con Core, que ya cumplieron el esquema al escribirse, y se codifican de
+una vez. El resultado es byte a byte el de TaskResponse: mismas claves en el
+mismo orden (title, description, completed, id), JSON compacto y UTF-8 sin escapar.
+
+Se usa orjson si está instalado y, si no, el codificador de la biblioteca estándar.
+"""
+
+import json
+from typing import Iterable, Tuple
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+# (id, title, description, completed), el orden de crud.task_columns()
+TaskRow = Tuple[int, str, str, bool]
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _task_dicts(rows: Iterable[TaskRow]):
+    return [
+        {"title": title, "description": description, "completed": bool(completed), "id": task_id}
+        for task_id, title, description, completed in rows
+    ]
+
+
+def _dump_tasks_json(rows: Iterable[TaskRow]) -> bytes:
+    return _encode_json(_task_dicts(rows)).encode()
+
+
+def _dump_tasks_orjson(rows: Iterable[TaskRow]) -> bytes:
+    return orjson.dumps(_task_dicts(rows))
+
+
+def dump_tasks(rows: Iterable[TaskRow]) -> bytes:
+    """Codifica las filas como el JSON de List[TaskResponse]."""
+    return _dump_tasks(rows)
+
+
+_dump_tasks = _dump_tasks_orjson if orjson is not None else _dump_tasks_json
@@ -0,0 +1,171 @@
+"""
+📁 streaming.py
+Exportación e importación de tareas en streaming.
+La exportación escribe NDJSON o CSV bloque a bloque desde un cursor de la
+base, sin objetos ORM ni validación Pydantic por fila. La importación lee
+NDJSON línea a línea del cuerpo de la petición e inserta por bloques.
+Cada operación tiene su variante para Session y para AsyncSession.
+"""
+
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, crud_async, schemas
+from .bulk import _describe_validation_error, iter_lines
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+# Solo se devuelven los primeros errores para que la respuesta no crezca con la entrada
+MAX_REPORTED_ERRORS = 100
+
+CSV_COLUMNS = ("id", "title", "description", "completed")
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def format_ndjson(rows: Sequence[Row]) -> str:
+    """Convierte un bloque de filas en líneas NDJSON."""
+    return "".join(
+        _encode_json({
+            "id": task_id,
+            "title": title,
+            "description": description,
+            "completed": bool(completed)
+        }) + "\n"
+        for task_id, title, description, completed in rows
+    )
+
+
+def format_csv(rows: Sequence[Row]) -> str:
+    """Convierte un bloque de filas en líneas CSV (sin cabecera)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (task_id, title, description, "true" if completed else "false")
+        for task_id, title, description, completed in rows
+    )
+    return buffer.getvalue()
+
+
+# formato -> (función por bloque, cabecera, tipo de contenido)
+EXPORT_FORMATS = {
+    "ndjson": (format_ndjson, "", "application/x-ndjson"),
+    "csv": (format_csv, ",".join(CSV_COLUMNS) + "\r\n", "text/csv; charset=utf-8"),
+}
+
+
+def export_rows(db: Session, format: str, completed: Optional[bool] = None) -> Iterator[str]:
+    """Genera la tabla en `format`, un bloque de líneas por lote de filas."""
+    formatter, header, _ = EXPORT_FORMATS[format]
+    try:
+        if header:
+            yield header
+        for rows in crud.iter_task_rows(db, completed=completed, batch_size=EXPORT_BATCH_SIZE):
+            yield formatter(rows)
+    finally:
+        db.close()
+
+
+async def export_rows_async(db: AsyncSession, format: str, completed: Optional[bool] = None) -> AsyncIterator[str]:
+    """Igual que export_rows sobre una AsyncSession."""
+    formatter, header, _ = EXPORT_FORMATS[format]
+    try:
+        if header:
+            yield header
+        async for rows in crud_async.iter_task_rows(db, completed=completed, batch_size=EXPORT_BATCH_SIZE):
+            yield formatter(rows)
+    finally:
+        await db.close()
+
+
+def export_ndjson(db: Session, completed: Optional[bool] = None) -> Iterator[str]:
+    """Genera la tabla como NDJSON."""
+    return export_rows(db, "ndjson", completed)
+
+
+def export_csv(db: Session, completed: Optional[bool] = None) -> Iterator[str]:
+    """Genera la tabla como CSV con cabecera."""
+    return export_rows(db, "csv", completed)
+
+
+class _ImportReport:
+    """Cuenta las tareas importadas y guarda los primeros errores."""
+
+    def __init__(self):
+        self.imported = 0
+        self.error_count = 0
+        self.errors: List[schemas.BulkItemError] = []
+
+    def error(self, index: int, detail: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(schemas.BulkItemError(index=index, detail=detail))
+
+    def response(self) -> schemas.TaskImportResponse:
+        return schemas.TaskImportResponse(
+            imported=self.imported, error_count=self.error_count, errors=self.errors
+        )
+
+
+async def _import_batches(request: Request, report: _ImportReport) -> AsyncIterator[List[dict]]:
+    """
+    Valida cada línea con TaskBase y agrupa las válidas en bloques de
+    IMPORT_BATCH_SIZE; las inválidas se anotan en `report`.
+    """
+    batch: List[dict] = []
+    index = -1
+    async for line in iter_lines(request):
+        if not line.strip():
+            continue
+        index += 1
+        try:
+            task = schemas.TaskBase.model_validate_json(line)
+        except ValidationError as e:
+            report.error(index, _describe_validation_error(e))
+            continue
+        batch.append(task.model_dump())
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def import_ndjson(request: Request, db: Session) -> schemas.TaskImportResponse:
+    """
+    Importa tareas desde un cuerpo NDJSON en una sola transacción.
+    Cada línea se valida con TaskBase; las inválidas se cuentan y se reportan
+    (hasta MAX_REPORTED_ERRORS) sin detener la importación.
+    """
+    report = _ImportReport()
+    try:
+        async for batch in _import_batches(request, report):
+            await run_in_threadpool(crud.insert_task_rows, db, batch)
+            report.imported += len(batch)
+        await run_in_threadpool(db.commit)
+    except BaseException:
+        await run_in_threadpool(db.rollback)
+        raise
+    return report.response()
+
+
+async def import_ndjson_async(request: Request, db: AsyncSession) -> schemas.TaskImportResponse:
+    """Igual que import_ndjson sobre una AsyncSession."""
+    report = _ImportReport()
+    try:
+        async for batch in _import_batches(request, report):
+            await crud_async.insert_task_rows(db, batch)
+            report.imported += len(batch)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    return report.response()
@@ -0,0 +1,5 @@
+"""
+📁 benchmarks
+Scripts de medición de rendimiento de QuickTask.
+Se ejecutan desde la raíz del proyecto, por ejemplo: python -m benchmarks.bench_bulk
+"""
@@ -0,0 +1,102 @@
+"""
+📁 bench_async.py
+Peticiones/s y latencia de cola con DB_MODE=sync frente a DB_MODE=async.
+Arranca uvicorn (app.asgi:app) con cada modo y mantiene `--concurrency`
+peticiones en vuelo desde un cliente asyncio durante un tiempo fijo, con
+80% de lecturas y 20% de escrituras. En modo sync cada petición ocupa un hilo
+del threadpool de FastAPI (40 por defecto); en modo async no hay ese límite.
+
+Uso:
+    python -m benchmarks.bench_async --concurrency 50 200 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from app.database import Base, create_sqlite_engine
+
+from .bench_sqlite_profile import percentile, start_server, stop_server
+from .common import print_table
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, seed: int, latencies: list, failures: list):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        task_id = rng.randint(1, 1000)
+        roll = rng.random()
+        start = time.perf_counter()
+        try:
+            if roll < 0.4:
+                response = await client.get("/tasks", params={"limit": 20, "skip": rng.randint(0, 980)})
+            elif roll < 0.8:
+                response = await client.get(f"/tasks/{task_id}")
+            elif roll < 0.9:
+                response = await client.post("/tasks", json={"title": f"T{seed}"})
+            else:
+                response = await client.put(f"/tasks/{task_id}", json={"completed": True})
+        except httpx.TransportError as e:
+            failures.append(type(e).__name__)
+            continue
+        elapsed = time.perf_counter() - start
+        if response.status_code >= 500:
+            failures.append(response.status_code)
+        else:
+            latencies.append(elapsed)
+
+
+async def load(url: str, concurrency: int, seconds: float):
+    latencies, failures = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(
+            client_loop(client, deadline, seed, latencies, failures) for seed in range(concurrency)
+        ))
+    return latencies, failures
+
+
+def run_mode(mode: str, concurrency: int, seconds: float):
+    directory = tempfile.mkdtemp(prefix="quicktask-bench-")
+    database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    engine = create_sqlite_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    process, url = start_server(database_url, DB_MODE=mode)
+    try:
+        httpx.post(f"{url}/tasks/bulk", json=[{"title": f"Tarea {i}"} for i in range(1000)])
+        latencies, failures = asyncio.run(load(url, concurrency, seconds))
+    finally:
+        stop_server(process)
+        shutil.rmtree(directory)
+
+    return (
+        mode, concurrency, f"{len(latencies) / seconds:.0f}",
+        f"{statistics.median(latencies) * 1000:.1f}",
+        f"{percentile(latencies, 0.99) * 1000:.1f}",
+        f"{percentile(latencies, 0.999) * 1000:.1f}",
+        len(failures)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capa de base de datos sync vs. async bajo alta concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    table = [
+        run_mode(mode, concurrency, args.seconds)
+        for concurrency in args.concurrency
+        for mode in ("sync", "async")
+    ]
+    print(f"{args.seconds:.0f} s por modo, 80% lecturas / 20% escrituras, un worker de uvicorn")
+    print_table(table, ("modo", "concurrencia", "req/s", "p50 ms", "p99 ms", "p99.9 ms", "errores"))
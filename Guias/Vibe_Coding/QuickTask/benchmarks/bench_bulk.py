@@ -0,0 +1,60 @@
+"""
+📁 bench_bulk.py
+Compara las operaciones masivas (/tasks/bulk) con el camino de una petición
+por tarea (POST/PUT/DELETE /tasks/{id}), cada una con su commit y su refresh.
+
+Uso:
+    python -m benchmarks.bench_bulk --items 2000
+"""
+
+import argparse
+import json
+
+from .common import bench_client, print_table, temp_database, timer
+
+
+def run(items: int):
+    tasks = [{"title": f"Tarea {i}", "description": f"Descripción {i}"} for i in range(items)]
+    ndjson = "\n".join(json.dumps(task) for task in tasks)
+    results = {}
+
+    with temp_database() as (_, session_factory), bench_client(session_factory) as client:
+        with timer(results, "crear / por tarea"):
+            ids = [client.post("/tasks", json=task).json()["id"] for task in tasks]
+        with timer(results, "actualizar / por tarea"):
+            for task_id in ids:
+                client.put(f"/tasks/{task_id}", json={"completed": True})
+        with timer(results, "eliminar / por tarea"):
+            for task_id in ids:
+                client.delete(f"/tasks/{task_id}")
+
+    with temp_database() as (_, session_factory), bench_client(session_factory) as client:
+        with timer(results, "crear / bulk JSON"):
+            response = client.post("/tasks/bulk", json=tasks)
+        ids = [task["id"] for task in response.json()["items"]]
+        with timer(results, "actualizar / bulk"):
+            client.patch("/tasks/bulk", json=[{"id": task_id, "completed": True} for task_id in ids])
+        with timer(results, "eliminar / bulk"):
+            client.request("DELETE", "/tasks/bulk", json=ids)
+        with timer(results, "crear / bulk NDJSON"):
+            client.post("/tasks/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+
+    rows = []
+    for operation in ("crear", "actualizar", "eliminar"):
+        per_item = results[f"{operation} / por tarea"]
+        for name, seconds in results.items():
+            if name.startswith(operation):
+                rows.append((
+                    name,
+                    f"{seconds:.3f}",
+                    f"{items / seconds:,.0f}",
+                    f"{per_item / seconds:.1f}x"
+                ))
+    print(f"{items} tareas")
+    print_table(rows, ("operación", "segundos", "tareas/s", "mejora"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Operaciones masivas vs. una petición por tarea")
+    parser.add_argument("--items", type=int, default=2000)
+    run(parser.parse_args().items)
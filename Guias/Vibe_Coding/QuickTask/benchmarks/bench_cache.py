@@ -0,0 +1,55 @@
+"""
+📁 bench_cache.py
+Latencia de GET /tasks/{id} y GET /tasks sin caché, con caché (acierto) y con
+revalidación por If-None-Match (304 sin cuerpo).
+
+Uso:
+    python -m benchmarks.bench_cache --rows 100000
+"""
+
+import argparse
+import statistics
+import time
+
+from app.cache import MemoryBackend, TaskCache
+
+from .bench_pagination import fill
+from .common import bench_client, print_table, temp_database
+
+
+def latency(client, url: str, repeat: int, headers=None) -> float:
+    """Mediana en milisegundos de `repeat` peticiones iguales."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code in (200, 304)
+    return statistics.median(samples) * 1000
+
+
+def run(rows: int, limit: int, repeat: int):
+    urls = ("/tasks/1", f"/tasks?limit={limit}", f"/tasks?limit={limit}&completed=true")
+    with temp_database() as (engine, session_factory):
+        fill(engine, rows)
+
+        table = []
+        with bench_client(session_factory) as client:
+            uncached = [latency(client, url, repeat) for url in urls]
+        with bench_client(session_factory, cache=TaskCache(MemoryBackend())) as client:
+            for url, miss_ms in zip(urls, uncached):
+                hit_ms = latency(client, url, repeat)
+                etag = client.get(url).headers["ETag"]
+                not_modified_ms = latency(client, url, repeat, headers={"If-None-Match": etag})
+                table.append((url, f"{miss_ms:.2f}", f"{hit_ms:.2f}", f"{not_modified_ms:.2f}"))
+    print(f"{rows:,} filas, mediana de {repeat} peticiones")
+    print_table(table, ("ruta", "sin caché ms", "caché ms", "304 ms"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Caché de respuestas y revalidación con ETag")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.rows, args.limit, args.repeat)
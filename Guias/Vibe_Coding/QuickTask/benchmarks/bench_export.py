@@ -0,0 +1,84 @@
+"""
+📁 bench_export.py
+Tiempo y memoria pico de exportar la tabla completa.
+Compara cargar todas las tareas como objetos ORM y serializarlas con Pydantic
+(lo que haría GET /tasks sin límite) con el streaming de /tasks/export, que
+lee el cursor por bloques y escribe las filas tal cual. También mide la
+importación NDJSON en streaming de lo exportado.
+
+Uso:
+    python -m benchmarks.bench_export --rows 200000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from app import models, schemas
+from app.streaming import export_csv, export_ndjson
+
+from .bench_pagination import fill
+from .common import bench_client, print_table, temp_database
+
+
+def measure(function):
+    """
+    Devuelve (resultado, segundos, MiB de memoria pico) de `function`.
+    El tiempo se toma en una ejecución sin tracemalloc, que la ralentiza.
+    """
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def orm_export(session_factory) -> int:
+    db = session_factory()
+    try:
+        tasks = db.query(models.Task).order_by(models.Task.id).all()
+        body = "".join(schemas.TaskResponse.model_validate(task).model_dump_json() + "\n" for task in tasks)
+        return len(body)
+    finally:
+        db.close()
+
+
+def stream_export(session_factory, generate) -> int:
+    return sum(len(chunk) for chunk in generate(session_factory()))
+
+
+def run(rows_list):
+    table = []
+    for rows in rows_list:
+        with temp_database() as (engine, session_factory):
+            fill(engine, rows)
+            for name, function in (
+                ("ORM + Pydantic", lambda: orm_export(session_factory)),
+                ("stream ndjson", lambda: stream_export(session_factory, export_ndjson)),
+                ("stream csv", lambda: stream_export(session_factory, export_csv)),
+            ):
+                size, seconds, peak = measure(function)
+                table.append((f"{rows:,}", name, f"{size / 2**20:.1f}", f"{seconds:.2f}", f"{peak:.1f}"))
+
+            body = "".join(export_ndjson(session_factory()))
+            with bench_client(session_factory) as client:
+                start = time.perf_counter()
+                response = client.post(
+                    "/tasks/import",
+                    content=(body[i:i + 65536].encode() for i in range(0, len(body), 65536)),
+                    headers={"Content-Type": "application/x-ndjson"}
+                )
+                elapsed = time.perf_counter() - start
+                assert response.status_code == 201 and response.json()["imported"] == rows
+            table.append((f"{rows:,}", "import ndjson", f"{len(body) / 2**20:.1f}", f"{elapsed:.2f}", "-"))
+    print_table(table, ("filas", "modo", "MiB", "s", "pico MiB"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportación ORM vs. streaming")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,70 @@
+"""
+📁 bench_pagination.py
+Latencia de GET /tasks a distintas profundidades: OFFSET (skip) frente a cursor.
+Con OFFSET SQLite recorre todas las filas saltadas; con cursor salta directamente
+al ID por la clave primaria, así que la latencia no depende de la profundidad.
+
+Uso:
+    python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import insert
+
+from app import models
+from app.pagination import encode_cursor
+
+from .common import bench_client, print_table, temp_database
+
+BATCH = 50_000
+
+
+def fill(engine, rows: int):
+    """Inserta `rows` tareas con IDs 1..rows; una de cada tres completada."""
+    table = models.Task.__table__
+    with engine.begin() as connection:
+        for start in range(0, rows, BATCH):
+            connection.execute(insert(table), [
+                {"title": f"Tarea {i}", "description": None, "completed": i % 3 == 0}
+                for i in range(start, min(start + BATCH, rows))
+            ])
+
+
+def page_latency(client, params: dict, repeat: int) -> float:
+    """Mediana en milisegundos de `repeat` peticiones iguales."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/tasks", params=params)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200 and response.json()
+    return statistics.median(samples) * 1000
+
+
+def run(rows: int, limit: int, repeat: int):
+    depths = [d for d in (0, 10_000, 100_000, 500_000, rows - limit) if d <= rows - limit]
+    with temp_database() as (engine, session_factory):
+        start = time.perf_counter()
+        fill(engine, rows)
+        print(f"{rows:,} filas insertadas en {time.perf_counter() - start:.1f} s")
+
+        with bench_client(session_factory) as client:
+            table = []
+            for depth in depths:
+                offset_ms = page_latency(client, {"skip": depth, "limit": limit}, repeat)
+                cursor_ms = page_latency(client, {"cursor": encode_cursor(depth, None), "limit": limit}, repeat)
+                table.append((f"{depth:,}", f"{offset_ms:.2f}", f"{cursor_ms:.2f}"))
+    print(f"mediana de {repeat} peticiones, limit={limit}")
+    print_table(table, ("profundidad", "skip ms", "cursor ms"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paginación por OFFSET vs. por cursor")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.limit, args.repeat)
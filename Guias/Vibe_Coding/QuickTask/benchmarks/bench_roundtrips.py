@@ -0,0 +1,97 @@
+"""
+📁 bench_roundtrips.py
+Sentencias SQL y latencia por operación de crud.update_task y crud.delete_task
+frente al camino anterior del ORM (SELECT + UPDATE/DELETE + SELECT del refresh).
+
+Uso:
+    python -m benchmarks.bench_roundtrips --items 2000
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import event, insert
+
+from app import crud, models, schemas
+
+from .common import print_table, temp_database
+
+
+def orm_update_task(db, task_id: int, task_update: schemas.TaskUpdate):
+    """Camino anterior: get_task, setattr, commit y refresh."""
+    db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    if db_task is None:
+        return None
+    for field, value in task_update.model_dump(exclude_unset=True).items():
+        setattr(db_task, field, value)
+    db.commit()
+    db.refresh(db_task)
+    return db_task
+
+
+def orm_delete_task(db, task_id: int) -> bool:
+    """Camino anterior: get_task, delete y commit."""
+    db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    if db_task is None:
+        return False
+    db.delete(db_task)
+    db.commit()
+    return True
+
+
+def measure(engine, session_factory, operation, ids) -> tuple:
+    """
+    Aplica `operation(db, task_id)` a cada ID con una sesión nueva, como una petición.
+    Devuelve (sentencias por operación, mediana en ms, p99 en ms).
+    """
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    samples = []
+    try:
+        for task_id in ids:
+            start = time.perf_counter()
+            with session_factory() as db:
+                operation(db, task_id)
+            samples.append(time.perf_counter() - start)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    samples.sort()
+    return (
+        statements / len(ids),
+        statistics.median(samples) * 1000,
+        samples[int(len(samples) * 0.99) - 1] * 1000
+    )
+
+
+def run(items: int):
+    change = schemas.TaskUpdate(completed=True)
+    operations = {
+        "update / ORM": lambda db, task_id: orm_update_task(db, task_id, change),
+        "update / RETURNING": lambda db, task_id: crud.update_task(db, task_id, change),
+        "delete / ORM": orm_delete_task,
+        "delete / RETURNING": crud.delete_task,
+    }
+    rows = []
+    for name, operation in operations.items():
+        with temp_database() as (engine, session_factory):
+            with engine.begin() as connection:
+                connection.execute(insert(models.Task.__table__), [
+                    {"title": f"Tarea {i}", "description": None, "completed": False}
+                    for i in range(items)
+                ])
+            per_op, median_ms, p99_ms = measure(engine, session_factory, operation, range(1, items + 1))
+            rows.append((name, f"{per_op:.1f}", f"{median_ms:.3f}", f"{p99_ms:.3f}"))
+    print(f"{items} operaciones, una sesión y un commit por operación")
+    print_table(rows, ("operación", "sentencias/op", "mediana ms", "p99 ms"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentencias por petición en update/delete")
+    parser.add_argument("--items", type=int, default=2000)
+    run(parser.parse_args().items)
@@ -0,0 +1,102 @@
+"""
+📁 bench_search.py
+Latencia de GET /tasks/search (FTS5) frente a recorrer la tabla con LIKE,
+que es lo que cuesta, como mínimo, filtrar en el cliente página a página.
+LIKE se detiene en las primeras `limit` filas y no ordena por relevancia: con
+palabras frecuentes es rápido, con palabras raras recorre casi toda la tabla.
+
+Uso:
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, text
+
+from app import models
+from app.search import rebuild_search_index
+
+from .common import bench_client, print_table, temp_database
+
+BATCH = 50_000
+WORDS = (
+    "informe reunión cliente factura presupuesto revisar enviar llamar preparar contrato "
+    "proyecto equipo entrega diseño pruebas servidor migrar base datos copia seguridad "
+    "correo agenda viaje compra pedido proveedor nómina impuestos auditoría campaña"
+).split()
+
+
+def fill(engine, rows: int, seed: int = 1):
+    """
+    Inserta `rows` tareas con títulos y descripciones aleatorios; cada 10.000 una
+    lleva la palabra poco frecuente "zanahoria". Se inserta sin triggers y se
+    reconstruye el índice al final, como haría `python -m app.search rebuild`.
+    """
+    rng = random.Random(seed)
+    table = models.Task.__table__
+    with engine.begin() as connection:
+        for name in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            connection.exec_driver_sql(f"DROP TRIGGER {name}")
+        for start in range(0, rows, BATCH):
+            connection.execute(insert(table), [
+                {
+                    "title": " ".join(rng.choices(WORDS, k=4)) + (" zanahoria" if i % 10_000 == 0 else ""),
+                    "description": " ".join(rng.choices(WORDS, k=12)),
+                    "completed": i % 3 == 0
+                }
+                for i in range(start, min(start + BATCH, rows))
+            ])
+        start = time.perf_counter()
+        rebuild_search_index(connection)
+        print(f"índice reconstruido en {time.perf_counter() - start:.1f} s")
+
+
+def search_latency(client, params: dict, repeat: int) -> float:
+    """Mediana en milisegundos de `repeat` búsquedas iguales."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/tasks/search", params=params)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return statistics.median(samples) * 1000
+
+
+def like_latency(engine, word: str, limit: int) -> float:
+    """Milisegundos de una búsqueda equivalente con LIKE (recorre la tabla)."""
+    query = text(
+        "SELECT id FROM tasks WHERE title LIKE :pattern OR description LIKE :pattern LIMIT :limit"
+    )
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(query, {"pattern": f"%{word.rstrip('*')}%", "limit": limit}).all()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(rows: int, limit: int, repeat: int):
+    cases = ("zanahoria", "zanah*", "factura proveedor", "informe")
+    with temp_database() as (engine, session_factory):
+        start = time.perf_counter()
+        fill(engine, rows)
+        print(f"{rows:,} filas insertadas en {time.perf_counter() - start:.1f} s")
+
+        table = []
+        with bench_client(session_factory) as client:
+            for q in cases:
+                fts_ms = search_latency(client, {"q": q, "limit": limit}, repeat)
+                like_ms = like_latency(engine, q.split()[0], limit) if " " not in q else float("nan")
+                table.append((q, f"{fts_ms:.2f}", f"{like_ms:.1f}"))
+    print(f"mediana de {repeat} búsquedas, limit={limit}")
+    print_table(table, ("q", "FTS5 ms", "LIKE ms"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Búsqueda FTS5 vs. recorrido con LIKE")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.limit, args.repeat)
@@ -0,0 +1,82 @@
+"""
+📁 bench_serialization.py
+Tiempo de generar el cuerpo de GET /tasks: objetos ORM validados con TaskResponse y
+codificados por FastAPI frente al camino ligero (serialization.py), que codifica las
+tuplas de columnas directamente. La igualdad byte a byte la comprueba
+tests/test_serialization.py.
+
+Uso:
+    python -m benchmarks.bench_serialization --limits 100 1000
+"""
+
+import argparse
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app import crud, models, schemas, serialization
+
+from .common import print_table, temp_database
+
+task_list = TypeAdapter(List[schemas.TaskResponse])
+
+
+def fill(engine, rows: int):
+    """Inserta `rows` tareas; la mitad con descripción, una de cada tres completada."""
+    with engine.begin() as connection:
+        connection.execute(insert(models.Task.__table__), [
+            {
+                "title": f"Tarea {i}: canción \"{i}\"",
+                "description": f"Descripción de la tarea {i}" * 3 if i % 2 else None,
+                "completed": i % 3 == 0
+            }
+            for i in range(rows)
+        ])
+
+
+def generic_body(db, limit: int) -> bytes:
+    """Camino genérico: ORM, TaskResponse(from_attributes), jsonable_encoder y JSONResponse."""
+    tasks = crud.get_tasks(db, limit=limit)
+    return JSONResponse(jsonable_encoder(task_list.validate_python(tasks, from_attributes=True))).body
+
+
+def lean_body(db, limit: int) -> bytes:
+    """Camino ligero de GET /tasks."""
+    return serialization.dump_tasks(crud.get_task_rows(db, limit=limit))
+
+
+def best_of(function, repeat: int) -> float:
+    """Mejor tiempo en segundos de `repeat` ejecuciones."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return min(samples)
+
+
+def run(rows: int, limits: List[int], repeat: int):
+    with temp_database() as (engine, session_factory):
+        fill(engine, rows)
+        table = []
+        with session_factory() as db:
+            for limit in limits:
+                generic = best_of(lambda: generic_body(db, limit), repeat)
+                lean = best_of(lambda: lean_body(db, limit), repeat)
+                table.append((limit, f"{generic * 1000:.2f}", f"{lean * 1000:.2f}", f"{generic / lean:.1f}x"))
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    print(f"mejor de {repeat} ejecuciones, {rows:,} filas, codificador ligero: {encoder}")
+    print_table(table, ("limit", "genérico ms", "ligero ms", "mejora"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialización genérica vs. ligera de GET /tasks")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    run(args.rows, args.limits, args.repeat)
@@ -0,0 +1,155 @@
+"""
+📁 bench_sqlite_profile.py
+Carga concurrente de lecturas y escrituras contra uvicorn con cada perfil de SQLite.
+Levanta el servidor en un subproceso (SQLITE_PROFILE y DATABASE_URL por entorno)
+y lanza hilos que mezclan GET /tasks, GET /tasks/{id}, POST y PUT durante un
+tiempo fijo. Con el perfil default las lecturas esperan al escritor (journal de
+rollback) y cada commit hace fsync completo; con performance (WAL) no.
+
+Uso:
+    python -m benchmarks.bench_sqlite_profile --seconds 10 --threads 32 --workers 2
+"""
+
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+from app.database import Base, create_sqlite_engine
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, workers: int = 1, **env):
+    """
+    Arranca uvicorn con app.asgi:app y espera a que /health responda.
+    Las claves de `env` se pasan como variables de entorno (SQLITE_PROFILE, DB_MODE...).
+
+    Returns:
+        (proceso, URL)
+    """
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, **env)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.asgi:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--timeout-keep-alive", "60"],
+        cwd=PROJECT_DIR, env=env
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn no arrancó")
+
+
+def stop_server(process):
+    """Pide a uvicorn que termine y lo mata si no lo hace en 10 s."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def worker(url: str, deadline: float, write_ratio: float, seed: int, latencies: dict, failures: list):
+    rng = random.Random(seed)
+    with httpx.Client(base_url=url, timeout=30) as client:
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                if rng.random() < 0.5:
+                    kind, call = "write", lambda: client.post("/tasks", json={"title": f"T{rng.random()}"})
+                else:
+                    task_id = rng.randint(1, 1000)
+                    kind, call = "write", lambda: client.put(f"/tasks/{task_id}", json={"completed": True})
+            elif rng.random() < 0.5:
+                kind, call = "read", lambda: client.get("/tasks", params={"limit": 50, "skip": rng.randint(0, 900)})
+            else:
+                task_id = rng.randint(1, 1000)
+                kind, call = "read", lambda: client.get(f"/tasks/{task_id}")
+            start = time.perf_counter()
+            response = call()
+            elapsed = time.perf_counter() - start
+            if response.status_code >= 500:
+                failures.append(response.status_code)
+            else:
+                latencies[kind].append(elapsed)
+
+
+def run_profile(profile: str, seconds: float, threads: int, workers: int, write_ratio: float):
+    directory = tempfile.mkdtemp(prefix="quicktask-bench-")
+    database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    # El esquema se crea antes: varios workers a la vez competirían por el CREATE TABLE
+    engine = create_sqlite_engine(database_url, profile=profile)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    process, url = start_server(database_url, workers, SQLITE_PROFILE=profile)
+    try:
+        with httpx.Client(base_url=url) as client:
+            client.post("/tasks/bulk", json=[{"title": f"Tarea {i}"} for i in range(1000)])
+
+        latencies = {"read": [], "write": []}
+        failures = []
+        deadline = time.perf_counter() + seconds
+        pool = [
+            threading.Thread(target=worker, args=(url, deadline, write_ratio, seed, latencies, failures))
+            for seed in range(threads)
+        ]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        stop_server(process)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    rows = []
+    for kind, samples in latencies.items():
+        rows.append((
+            profile, kind, f"{len(samples) / seconds:.0f}",
+            f"{statistics.median(samples) * 1000:.1f}", f"{percentile(samples, 0.99) * 1000:.1f}",
+            len(failures) if kind == "write" else "-"
+        ))
+    return rows
+
+
+if __name__ == "__main__":
+    from .common import print_table
+
+    parser = argparse.ArgumentParser(description="Perfil default vs. performance de SQLite bajo carga mixta")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    table = []
+    for profile in ("default", "performance"):
+        table.extend(run_profile(profile, args.seconds, args.threads, args.workers, args.write_ratio))
+    print(f"{args.threads} hilos, {args.workers} workers de uvicorn, {args.write_ratio:.0%} escrituras, {args.seconds:.0f} s")
+    print_table(table, ("perfil", "tipo", "req/s", "p50 ms", "p99 ms", "errores 5xx"))
@@ -0,0 +1,84 @@
+"""
+📁 common.py
+Utilidades compartidas por los benchmarks.
+Cada benchmark usa una base SQLite temporal en disco (con fsync real) y un
+TestClient con la dependencia get_db apuntando a ella y, salvo que se pida,
+sin caché de respuestas para medir la base de datos.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.database import Base, get_db, get_read_db
+from app.main import app
+
+
+@contextmanager
+def temp_database():
+    """
+    Crea una base SQLite temporal y devuelve (engine, SessionLocal).
+    El archivo se borra al salir.
+    """
+    directory = tempfile.mkdtemp(prefix="quicktask-bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        engine.dispose()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+@contextmanager
+def bench_client(session_factory, cache=None):
+    """
+    TestClient de la app con get_db y get_read_db apuntando a `session_factory`
+    y `cache` como caché de respuestas (None: desactivada).
+    """
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    dependencies = (get_db, get_read_db)
+    previous = {dependency: app.dependency_overrides.get(dependency) for dependency in dependencies}
+    for dependency in dependencies:
+        app.dependency_overrides[dependency] = override_get_db
+    previous_cache, main.task_cache = main.task_cache, cache
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        main.task_cache = previous_cache
+        for dependency, override in previous.items():
+            if override is None:
+                app.dependency_overrides.pop(dependency, None)
+            else:
+                app.dependency_overrides[dependency] = override
+
+
+@contextmanager
+def timer(results: dict, name: str):
+    """Guarda en results[name] los segundos que tarda el bloque."""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+def print_table(rows, headers):
+    """Imprime una tabla de texto alineada."""
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,146 @@
+"""
+📁 test_query_plans.py
+Regresiones de índices: cada consulta de crud.py se captura al ejecutarse y se
+pasa por EXPLAIN QUERY PLAN. Un test falla si la consulta recorre la tabla tasks
+entera (SCAN tasks) o tiene que ordenar en un B-tree temporal.
+
+Se comprueba sobre una base nueva (create_all) y sobre una base con el esquema
+original migrada con migrations.migrate, para que un índice que solo esté en el
+modelo, o solo en la migración, también se detecte.
+"""
+
+import re
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import Base
+from app.migrations import SCHEMA_VERSION, migrate, schema_version
+
+# Esquema de tasks anterior a las migraciones, tal como lo creaba create_all
+LEGACY_SCHEMA = (
+    "CREATE TABLE tasks (id INTEGER NOT NULL, title VARCHAR NOT NULL, description VARCHAR, "
+    "completed BOOLEAN NOT NULL, PRIMARY KEY (id))",
+    "CREATE INDEX ix_tasks_id ON tasks (id)",
+    "CREATE INDEX ix_tasks_title ON tasks (title)",
+)
+
+FULL_SCAN = re.compile(r"^SCAN tasks\b")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+
+@pytest.fixture(params=["nueva", "migrada"])
+def engine(request, tmp_path):
+    """Base con 200 tareas, creada con create_all o migrada desde el esquema original."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    if request.param == "nueva":
+        Base.metadata.create_all(bind=engine)
+    else:
+        with engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.exec_driver_sql(statement)
+    migrate(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Task.__table__), [
+            {"title": f"Tarea {i}", "description": "informe" if i % 2 else None, "completed": i % 3 == 0}
+            for i in range(200)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, operation):
+    """
+    Ejecuta `operation(db)` y devuelve, por cada SELECT/UPDATE/DELETE emitido,
+    la sentencia y las líneas de su EXPLAIN QUERY PLAN.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split()[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            result = operation(db)
+            if hasattr(result, "__next__"):
+                list(result)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements, "la operación no ejecutó ninguna consulta"
+    with engine.connect() as connection:
+        return [
+            (statement, [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+
+
+# Consultas que no deben recorrer la tabla
+INDEXED_QUERIES = {
+    "get_task": lambda db: crud.get_task(db, 5),
+    "get_tasks_completed": lambda db: crud.get_tasks(db, completed=True, limit=10),
+    "get_tasks_completed_offset": lambda db: crud.get_tasks(db, skip=20, limit=10, completed=False),
+    "get_tasks_completed_cursor": lambda db: crud.get_tasks(db, limit=10, completed=False, after_id=50),
+    "get_tasks_cursor": lambda db: crud.get_tasks(db, limit=10, after_id=50),
+    "get_task_rows_completed": lambda db: crud.get_task_rows(db, limit=10, completed=True),
+    "get_task_rows_completed_cursor": lambda db: crud.get_task_rows(db, limit=10, completed=True, after_id=50),
+    "update_task": lambda db: crud.update_task(db, 5, schemas.TaskUpdate(completed=True)),
+    "update_task_empty": lambda db: crud.update_task(db, 5, schemas.TaskUpdate()),
+    "delete_task": lambda db: crud.delete_task(db, 5),
+    "update_tasks_bulk": lambda db: crud.update_tasks_bulk(db, [schemas.TaskBulkUpdate(id=5, title="X")]),
+    "delete_tasks_bulk": lambda db: crud.delete_tasks_bulk(db, [5, 6, 999]),
+    "iter_task_rows_completed": lambda db: crud.iter_task_rows(db, completed=True),
+    "search_tasks": lambda db: crud.search_tasks(db, '"informe"', completed=False),
+}
+
+# Consultas que leen la tabla en orden de ID: el recorrido es el plan correcto
+# (se detiene en LIMIT o exporta todo), pero no deben necesitar ordenar
+ORDERED_SCANS = {
+    "get_tasks": lambda db: crud.get_tasks(db, limit=10),
+    "get_task_rows": lambda db: crud.get_task_rows(db, limit=10),
+    "iter_task_rows": lambda db: crud.iter_task_rows(db),
+}
+
+
+@pytest.mark.parametrize("name", INDEXED_QUERIES)
+def test_query_uses_index(engine, name):
+    """Test de que la consulta usa un índice o la clave primaria"""
+    for statement, plan in query_plans(engine, INDEXED_QUERIES[name]):
+        assert not any(FULL_SCAN.search(line) for line in plan), f"{name}: {plan}\n{statement}"
+        assert not any(TEMP_SORT.search(line) for line in plan), f"{name}: {plan}\n{statement}"
+
+
+@pytest.mark.parametrize("name", ORDERED_SCANS)
+def test_ordered_scan_does_not_sort(engine, name):
+    """Test de que los recorridos completos siguen el orden de la clave primaria"""
+    for statement, plan in query_plans(engine, ORDERED_SCANS[name]):
+        assert not any(TEMP_SORT.search(line) for line in plan), f"{name}: {plan}\n{statement}"
+
+
+def test_migrations_bring_legacy_schema_up_to_date(tmp_path):
+    """Test de que migrate actualiza una base con el esquema original y datos previos"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO tasks (title, completed) VALUES ('Tarea antigua', 0)")
+
+    assert migrate(engine) == list(range(1, SCHEMA_VERSION + 1))
+    assert migrate(engine) == []
+
+    with engine.connect() as connection:
+        assert schema_version(connection) == SCHEMA_VERSION
+        indexes = {
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+            )
+        }
+    assert indexes == {"ix_tasks_title", "ix_tasks_completed_id"}
+    with sessionmaker(bind=engine)() as db:
+        # Las tareas previas quedan indexadas para la búsqueda
+        assert [row.title for row in crud.search_tasks(db, '"antigua"')] == ["Tarea antigua"]
+    engine.dispose()
@@ -0,0 +1,74 @@
+"""
+📁 test_serialization.py
+Pruebas del camino ligero de GET /tasks (serialization.py): filas de Core
+codificadas directamente frente a objetos ORM validados con TaskResponse y
+codificados por FastAPI.
+
+Para ver los tiempos:
+    python -m benchmarks.bench_serialization
+"""
+
+from typing import List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas, serialization
+from app.database import Base
+
+task_list = TypeAdapter(List[schemas.TaskResponse])
+
+ENCODERS = [serialization._dump_tasks_json]
+if serialization.orjson is not None:
+    ENCODERS.append(serialization._dump_tasks_orjson)
+
+TRICKY_TEXT = [
+    "Tarea simple",
+    'Comillas "dobles" y \\barras\\',
+    "Acentos: canción, pingüino, Ñandú",
+    "Emoji 🚀 y CJK 漢字",
+    "Control:\n\t\r\b\f\x00\x1f\x7f",
+    "Separadores  ",
+    "</script><script>alert(1)</script>",
+]
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    """Base en memoria con 2000 tareas."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Task.__table__), [
+            {
+                "title": TRICKY_TEXT[i % len(TRICKY_TEXT)] + f" {i}",
+                "description": TRICKY_TEXT[(i + 3) % len(TRICKY_TEXT)] * 3 if i % 2 else None,
+                "completed": i % 3 == 0
+            }
+            for i in range(2000)
+        ])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def generic_body(db, limit: int) -> bytes:
+    """Camino genérico: ORM, TaskResponse(from_attributes), jsonable_encoder y JSONResponse."""
+    tasks = crud.get_tasks(db, limit=limit)
+    return JSONResponse(jsonable_encoder(task_list.validate_python(tasks, from_attributes=True))).body
+
+
+@pytest.mark.parametrize("encoder", ENCODERS, ids=lambda encoder: encoder.__name__)
+def test_lean_path_is_byte_identical(session_factory, encoder):
+    """Test de que el camino ligero produce exactamente el JSON de List[TaskResponse]"""
+    with session_factory() as db:
+        expected = task_list.dump_json(task_list.validate_python(crud.get_tasks(db, limit=2000), from_attributes=True))
+        assert encoder(crud.get_task_rows(db, limit=2000)) == expected
+        assert generic_body(db, 2000) == expected
+        assert serialization.dump_tasks(crud.get_task_rows(db, limit=2000)) == expected
+        assert encoder([]) == b"[]"
+
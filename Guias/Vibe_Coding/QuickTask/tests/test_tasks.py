@@ -4,20 +4,29 @@ Pruebas unitarias e integración para la API de tareas.
 Utiliza una base de datos SQLite en memoria para aislar las pruebas.
 """
 
+import asyncio
+import json
+
 import pytest
+from fastapi import HTTPException, Request
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.main import app
-from app.database import Base, get_db
-from app import models
+from app.main import app, task_cache
+from app.database import Base, create_sqlite_engine, get_db, get_read_db
+from app import bulk, cache, crud, models
+from app.cache import MemoryBackend
 
 # Configurar base de datos en memoria para las pruebas
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# StaticPool: todas las sesiones comparten la única conexión de la base en memoria
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -31,8 +40,9 @@ def override_get_db():
         db.close()
 
 
-# Override de la dependencia
+# Override de las dependencias (escritura y pool de lectura)
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 # Cliente de pruebas
 client = TestClient(app)
@@ -47,6 +57,9 @@ def setup_database():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    # Los IDs se reutilizan entre tests: la caché no debe conservar respuestas
+    if task_cache:
+        task_cache.clear()
 
 
 # ==================== TESTS DE ENDPOINTS ====================
@@ -231,6 +244,26 @@ def test_delete_task_not_found():
     assert response.status_code == 404
 
 
+def test_update_and_delete_single_statement():
+    """Test de que PUT y DELETE /tasks/{id} ejecutan una sola sentencia SQL"""
+    client.post("/tasks", json={"title": "Una sola sentencia"})
+    statements = []
+    
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.put("/tasks/1", json={"completed": True}).json()["completed"] is True
+        assert client.put("/tasks/2", json={"completed": True}).status_code == 404
+        assert client.delete("/tasks/1").status_code == 204
+        assert client.delete("/tasks/1").status_code == 404
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    assert statements == ["UPDATE", "UPDATE", "DELETE", "DELETE"]
+
+
 def test_filter_tasks_by_completed():
     """Test de filtrado de tareas por estado"""
     # Crear tareas con diferentes estados
@@ -270,5 +303,382 @@ def test_pagination():
     assert len(response.json()) == 5
 
 
+def test_cursor_pagination():
+    """Test de paginación por cursor recorriendo todas las páginas"""
+    client.post("/tasks/bulk", json=[{"title": f"Tarea {i}"} for i in range(10)])
+    
+    titles = []
+    response = client.get("/tasks?limit=4")
+    while True:
+        assert response.status_code == 200
+        titles.extend(t["title"] for t in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/tasks", params={"limit": 4, "cursor": cursor})
+    
+    assert titles == [f"Tarea {i}" for i in range(10)]
+
+
+def test_cursor_keeps_filter():
+    """Test de que el cursor conserva el filtro por estado"""
+    ids = [t["id"] for t in client.post("/tasks/bulk", json=[{"title": f"T{i}"} for i in range(6)]).json()["items"]]
+    client.patch("/tasks/bulk", json=[{"id": task_id, "completed": True} for task_id in ids[::2]])
+    
+    first = client.get("/tasks?completed=true&limit=2")
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/tasks", params={"limit": 2, "cursor": cursor})
+    
+    assert [t["id"] for t in first.json() + second.json()] == ids[::2]
+    assert client.get("/tasks", params={"cursor": cursor, "completed": False}).status_code == 400
+
+
+def test_invalid_cursor():
+    """Test de cursor inválido o combinado con skip"""
+    assert client.get("/tasks?cursor=no-es-un-cursor").status_code == 400
+    
+    client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+    cursor = client.get("/tasks?limit=1").headers["X-Next-Cursor"]
+    assert client.get("/tasks", params={"cursor": cursor, "skip": 1}).status_code == 400
+
+
+# ==================== TESTS DE OPERACIONES MASIVAS ====================
+
+def test_bulk_create_json_array():
+    """Test de creación masiva con un array JSON"""
+    tasks = [{"title": f"Tarea {i}", "description": f"Descripción {i}"} for i in range(5)]
+    response = client.post("/tasks/bulk", json=tasks)
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert [t["title"] for t in data["items"]] == [t["title"] for t in tasks]
+    assert all(t["completed"] is False for t in data["items"])
+    assert data["errors"] == []
+    assert len(client.get("/tasks").json()) == 5
+
+
+def test_bulk_create_ndjson_with_errors():
+    """Test de creación masiva con NDJSON: los errores no abortan el lote"""
+    body = "\n".join([
+        '{"title": "Válida 1"}',
+        '{"description": "sin título"}',
+        'esto no es json',
+        '{"title": "Válida 2"}'
+    ])
+    response = client.post(
+        "/tasks/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert [t["title"] for t in data["items"]] == ["Válida 1", "Válida 2"]
+    assert [e["index"] for e in data["errors"]] == [1, 2]
+
+
+def test_bulk_create_rejects_non_array():
+    """Test de creación masiva con un cuerpo que no es un array"""
+    response = client.post("/tasks/bulk", json={"title": "suelta"})
+    
+    assert response.status_code == 400
+
+
+def test_bulk_ndjson_stops_reading_past_the_item_limit(monkeypatch):
+    """Test de NDJSON: responde 413 en cuanto se supera el límite, sin leer el resto"""
+    monkeypatch.setattr(bulk, "MAX_BULK_ITEMS", 3)
+    assert client.post(
+        "/tasks/bulk",
+        content="".join(f'{{"title": "T{i}"}}\n' for i in range(4)),
+        headers={"Content-Type": "application/x-ndjson"}
+    ).status_code == 413
+    assert client.get("/tasks").json() == []
+
+    # El cliente de pruebas envía el cuerpo entero: se comprueba la lectura con un receive propio
+    received = []
+
+    async def receive():
+        received.append(len(received))
+        return {"type": "http.request", "body": f'{{"title": "T{len(received)}"}}\n'.encode(), "more_body": len(received) < 100}
+
+    request = Request({"type": "http", "method": "POST", "headers": [(b"content-type", b"application/x-ndjson")]}, receive)
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(bulk.read_bulk_items(request))
+    assert info.value.status_code == 413
+    assert len(received) == 4
+
+
+def test_bulk_rejects_large_body_by_content_length(monkeypatch):
+    """Test de un array JSON mayor que MAX_BULK_BYTES: 413 sin acumular el cuerpo"""
+    monkeypatch.setattr(bulk, "MAX_BULK_BYTES", 100)
+    tasks = [{"title": f"Tarea {i}"} for i in range(10)]
+
+    assert client.post("/tasks/bulk", json=tasks).status_code == 413
+    # Sin Content-Length (chunked) se corta al pasar del límite
+    chunks = (json.dumps(tasks)[i:i + 20].encode() for i in range(0, 200, 20))
+    assert client.post("/tasks/bulk", content=chunks).status_code == 413
+    assert client.post("/tasks/bulk", json=tasks[:2]).status_code == 201
+
+
+def test_bulk_update():
+    """Test de actualización masiva parcial con IDs inexistentes"""
+    ids = [t["id"] for t in client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]).json()["items"]]
+    
+    response = client.patch("/tasks/bulk", json=[
+        {"id": ids[0], "completed": True},
+        {"id": 9999, "completed": True},
+        {"id": ids[1], "title": "B cambiada"},
+        {"id": ids[1], "title": ""}
+    ])
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [(t["id"], t["title"], t["completed"]) for t in data["items"]] == [
+        (ids[0], "A", True),
+        (ids[1], "B cambiada", False)
+    ]
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [(1, 9999), (3, ids[1])]
+
+
+def test_bulk_update_rejects_null_fields():
+    """Test de que un null en un campo obligatorio solo invalida su elemento"""
+    ids = [t["id"] for t in client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]).json()["items"]]
+    
+    response = client.patch("/tasks/bulk", json=[
+        {"id": ids[0], "title": "A cambiada"},
+        {"id": ids[1], "title": None},
+        {"id": ids[1], "completed": None},
+        {"id": ids[1], "description": None, "completed": True}
+    ])
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [(t["id"], t["title"], t["description"], t["completed"]) for t in data["items"]] == [
+        (ids[0], "A cambiada", None, False),
+        (ids[1], "B", None, True)
+    ]
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [(1, ids[1]), (2, ids[1])]
+    assert "title" in data["errors"][0]["detail"]
+
+
+def test_bulk_delete():
+    """Test de eliminación masiva con IDs sueltos y objetos"""
+    ids = [t["id"] for t in client.post("/tasks/bulk", json=[{"title": f"T{i}"} for i in range(3)]).json()["items"]]
+    
+    response = client.request("DELETE", "/tasks/bulk", json=[ids[0], {"id": ids[2]}, 9999])
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted"] == [ids[0], ids[2]]
+    assert [e["id"] for e in data["errors"]] == [9999]
+    assert [t["id"] for t in client.get("/tasks").json()] == [ids[1]]
+
+
+def test_export_ndjson_and_import_roundtrip():
+    """Test de exportación NDJSON y reimportación de las mismas tareas"""
+    client.post("/tasks/bulk", json=[{"title": "A", "description": "uno"}, {"title": "B"}])
+    client.put("/tasks/1", json={"completed": True})
+    
+    response = client.get("/tasks/export")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"id": 1, "title": "A", "description": "uno", "completed": True},
+        {"id": 2, "title": "B", "description": None, "completed": False}
+    ]
+    
+    response = client.post(
+        "/tasks/import",
+        content=response.text + '{"title": ""}\nno es json\n',
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["error_count"] == 2
+    assert [e["index"] for e in data["errors"]] == [2, 3]
+    assert [(t["id"], t["title"], t["completed"]) for t in client.get("/tasks").json()] == [
+        (1, "A", True), (2, "B", False), (3, "A", True), (4, "B", False)
+    ]
+
+
+def test_export_csv_with_filter():
+    """Test de exportación CSV filtrada por estado"""
+    client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B, con coma"}])
+    client.put("/tasks/2", json={"completed": True})
+    
+    response = client.get("/tasks/export?format=csv&completed=true")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == ["id,title,description,completed", '2,"B, con coma",,true']
+
+
+def test_export_invalid_format():
+    """Test de exportación con un formato no soportado"""
+    response = client.get("/tasks/export?format=xml")
+    
+    assert response.status_code == 422
+
+
+def test_etag_not_modified():
+    """Test de ETag e If-None-Match en GET /tasks/{id} y GET /tasks"""
+    client.post("/tasks", json={"title": "Sondeo"})
+    
+    for url in ("/tasks/1", "/tasks"):
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+    
+    client.put("/tasks/1", json={"title": "Cambiada"})
+    
+    response = client.get("/tasks/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Cambiada"
+
+
+def test_cache_invalidation():
+    """Test de que las escrituras invalidan las respuestas cacheadas afectadas"""
+    client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+    assert client.get("/tasks/1").json()["completed"] is False
+    assert [t["id"] for t in client.get("/tasks?completed=true").json()] == []
+    assert len(client.get("/tasks").json()) == 2
+    
+    client.put("/tasks/1", json={"completed": True})
+    assert client.get("/tasks/1").json()["completed"] is True
+    assert [t["id"] for t in client.get("/tasks?completed=true").json()] == [1]
+    assert [t["id"] for t in client.get("/tasks?completed=false").json()] == [2]
+    
+    client.post("/tasks", json={"title": "C"})
+    assert [t["id"] for t in client.get("/tasks").json()] == [1, 2, 3]
+    
+    client.delete("/tasks/2")
+    assert client.get("/tasks/2").status_code == 404
+    assert [t["id"] for t in client.get("/tasks?completed=false").json()] == [3]
+    
+    client.patch("/tasks/bulk", json=[{"id": 3, "title": "C2"}])
+    assert client.get("/tasks/3").json()["title"] == "C2"
+
+
+def test_memory_backend_lru_and_ttl(monkeypatch):
+    """Test de la expulsión LRU y la expiración por TTL de MemoryBackend"""
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    
+    now = cache.time.monotonic()
+    backend.set("d", b"4", ex=10)
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 11)
+    assert backend.get("d") is None
+
+
+def test_search_ranking_and_snippet():
+    """Test de búsqueda de texto completo con ranking, prefijos y fragmentos"""
+    client.post("/tasks/bulk", json=[
+        {"title": "Preparar informe trimestral", "description": "Cifras de ventas"},
+        {"title": "Llamar a Ana", "description": "Comentar el informe"},
+        {"title": "Comprar café"}
+    ])
+    
+    response = client.get("/tasks/search?q=informe")
+    
+    assert response.status_code == 200
+    results = response.json()
+    # La coincidencia en el título pesa más que en la descripción
+    assert [r["id"] for r in results] == [1, 2]
+    assert "<mark>informe</mark>" in results[0]["snippet"]
+    assert results[0]["rank"] <= results[1]["rank"]
+    
+    assert [r["id"] for r in client.get("/tasks/search?q=trim*").json()] == [1]
+    assert [r["id"] for r in client.get("/tasks/search?q=CAFE").json()] == [3]
+    assert [r["id"] for r in client.get("/tasks/search?q=informe ana").json()] == [2]
+    assert client.get("/tasks/search?q=informe&completed=true").json() == []
+
+
+def test_search_follows_writes():
+    """Test de que los triggers mantienen el índice al actualizar y eliminar"""
+    client.post("/tasks", json={"title": "Revisar contrato"})
+    client.put("/tasks/1", json={"title": "Firmar contrato"})
+    
+    assert client.get("/tasks/search?q=revisar").json() == []
+    assert [r["title"] for r in client.get("/tasks/search?q=firmar").json()] == ["Firmar contrato"]
+    
+    client.delete("/tasks/1")
+    assert client.get("/tasks/search?q=contrato").json() == []
+
+
+def test_search_rejects_query_syntax():
+    """Test de que la sintaxis de FTS5 del usuario no rompe la consulta"""
+    client.post("/tasks", json={"title": "Near el final"})
+    
+    assert [r["id"] for r in client.get('/tasks/search?q=NEAR(" OR final').json()] == []
+    assert [r["id"] for r in client.get('/tasks/search?q="near" final:').json()] == [1]
+    assert client.get("/tasks/search?q=*()").status_code == 400
+
+
+def test_search_window_ranks_most_recent_matches():
+    """Test de que con muchas coincidencias solo se puntúan las más recientes"""
+    client.post("/tasks/bulk", json=[
+        {"title": "Informe informe informe"},
+        {"title": "Enviar", "description": "el informe"},
+        {"title": "Leer", "description": "otro informe"}
+    ])
+    
+    with TestingSessionLocal() as db:
+        assert [row.id for row in crud.search_tasks(db, '"informe"')][0] == 1
+        assert sorted(row.id for row in crud.search_tasks(db, '"informe"', window=2)) == [2, 3]
+
+
+def test_search_window_applies_status_filter():
+    """Test de que la ventana cuenta solo las coincidencias con el estado pedido"""
+    client.post("/tasks/bulk", json=[
+        {"title": "Informe final"},
+        {"title": "Informe de ventas"},
+        {"title": "Revisar informe"},
+        {"title": "Enviar informe"}
+    ])
+    client.put("/tasks/1", json={"completed": True})
+    
+    with TestingSessionLocal() as db:
+        assert [row.id for row in crud.search_tasks(db, '"informe"', completed=True, window=3)] == [1]
+        assert sorted(row.id for row in crud.search_tasks(db, '"informe"', completed=False, window=2)) == [3, 4]
+    assert [r["id"] for r in client.get("/tasks/search?q=informe&completed=true").json()] == [1]
+
+
+def test_sqlite_performance_profile(tmp_path):
+    """Test de los PRAGMAs del perfil de rendimiento y del pool de solo lectura"""
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    write_engine = create_sqlite_engine(url, profile="performance")
+    read_engine = create_sqlite_engine(url, profile="performance", read_only=True)
+    Base.metadata.create_all(bind=write_engine)
+    
+    with write_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    with write_engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO tasks (title, completed) VALUES ('A', 0)")
+    
+    with read_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM tasks").scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.exec_driver_sql("INSERT INTO tasks (title, completed) VALUES ('B', 0)")
+    
+    write_engine.dispose()
+    read_engine.dispose()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+📁 test_tasks_async.py
+Pruebas de la aplicación async (DB_MODE=async) sobre aiosqlite en memoria.
+Cubren las mismas rutas que test_tasks.py en sus casos principales.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.main_async import app, task_cache
+from app.database import Base, get_async_db, get_async_read_db
+
+# StaticPool: todas las sesiones comparten la única conexión de la base en memoria
+engine = create_async_engine(
+    "sqlite+aiosqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+async def override_get_async_db():
+    """Override de las dependencias async para usar la base de pruebas"""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+
+@pytest.fixture
+def client():
+    """Cliente con tablas nuevas en cada test; el bucle de eventos es el del TestClient."""
+    with TestClient(app) as test_client:
+        test_client.portal.call(_reset_tables)
+        if task_cache:
+            task_cache.clear()
+        yield test_client
+
+
+async def _reset_tables():
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+def test_crud_cycle(client):
+    """Test de crear, leer, actualizar y eliminar una tarea"""
+    created = client.post("/tasks", json={"title": "Async", "description": "aiosqlite"}).json()
+    assert created == {"id": 1, "title": "Async", "description": "aiosqlite", "completed": False}
+    
+    response = client.put("/tasks/1", json={"completed": True})
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    assert client.get("/tasks/1").json()["completed"] is True
+    
+    assert client.delete("/tasks/1").status_code == 204
+    assert client.get("/tasks/1").status_code == 404
+    assert client.put("/tasks/1", json={"completed": True}).status_code == 404
+
+
+def test_list_with_cursor(client):
+    """Test de paginación por cursor y filtro por estado"""
+    client.post("/tasks/bulk", json=[{"title": f"T{i}"} for i in range(5)])
+    client.patch("/tasks/bulk", json=[{"id": 2, "completed": True}, {"id": 4, "completed": True}])
+    
+    first = client.get("/tasks?limit=2")
+    second = client.get(f"/tasks?limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert [t["id"] for t in first.json() + second.json()] == [1, 2, 3, 4]
+    
+    assert [t["id"] for t in client.get("/tasks?completed=true").json()] == [2, 4]
+    assert client.get("/tasks?cursor=roto").status_code == 400
+
+
+def test_bulk_operations(client):
+    """Test de creación, actualización y eliminación masivas con errores por elemento"""
+    response = client.post("/tasks/bulk", json=[{"title": "A"}, {"title": ""}, {"title": "B"}])
+    assert response.status_code == 201
+    assert [t["id"] for t in response.json()["items"]] == [1, 2]
+    assert [e["index"] for e in response.json()["errors"]] == [1]
+    
+    response = client.patch("/tasks/bulk", json=[{"id": 1, "title": "A2"}, {"id": 99, "title": "X"}, {"id": 2, "title": None}])
+    assert [t["title"] for t in response.json()["items"]] == ["A2"]
+    assert [e["id"] for e in response.json()["errors"]] == [99, 2]
+    
+    response = client.request("DELETE", "/tasks/bulk", json=[1, 99])
+    assert response.json()["deleted"] == [1]
+    assert [t["id"] for t in client.get("/tasks").json()] == [2]
+
+
+def test_export_and_import(client):
+    """Test de exportación en streaming y reimportación"""
+    client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+    
+    exported = client.get("/tasks/export")
+    assert [json.loads(line)["title"] for line in exported.text.splitlines()] == ["A", "B"]
+    assert client.get("/tasks/export?format=csv").text.splitlines()[1] == "1,A,,false"
+    
+    response = client.post(
+        "/tasks/import",
+        content=exported.text + "{}\n",
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 201
+    assert response.json()["imported"] == 2
+    assert response.json()["error_count"] == 1
+    assert len(client.get("/tasks").json()) == 4
+
+
+def test_etag_and_invalidation(client):
+    """Test de 304 con If-None-Match y de la invalidación tras una escritura"""
+    client.post("/tasks", json={"title": "A"})
+    etag = client.get("/tasks").headers["ETag"]
+    assert client.get("/tasks", headers={"If-None-Match": etag}).status_code == 304
+    
+    client.put("/tasks/1", json={"completed": True})
+    response = client.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["completed"] is True
+
+
+def test_search(client):
+    """Test de búsqueda de texto completo"""
+    client.post("/tasks/bulk", json=[{"title": "Informe anual"}, {"title": "Otra cosa", "description": "informe"}])
+    
+    results = client.get("/tasks/search?q=inf*").json()
+    assert [r["id"] for r in results] == [1, 2]
+    assert results[0]["snippet"] == "<mark>Informe</mark> anual"
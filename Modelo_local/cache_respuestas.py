@@ -0,0 +1,158 @@
+"""
+Caché de respuestas del modelo para prompts repetidos.
+
+La clave combina modelo, prompt normalizado y opciones de generación. Hay dos
+backends con la misma interfaz: MemoriaLRU (un OrderedDict en el proceso) y
+SQLiteLRU (un fichero que sobrevive a reinicios). Ambos aplican un tamaño
+máximo con política LRU y expiran las entradas más viejas que `ttl` segundos.
+
+Se activa con la variable de entorno CACHE_RESPUESTAS=memoria|sqlite.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+
+MAX_ENTRADAS = int(os.environ.get("CACHE_MAX_ENTRADAS", "1000"))
+TTL = float(os.environ.get("CACHE_TTL", "3600"))
+RUTA_SQLITE = os.environ.get("CACHE_RUTA", "cache_respuestas.db")
+
+
+def normalizar_prompt(prompt):
+    prompt = unicodedata.normalize("NFC", prompt).casefold()
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def clave_cache(modelo, prompt, opciones=None):
+    material = json.dumps([modelo, normalizar_prompt(prompt), opciones or {}], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class MemoriaLRU:
+    def __init__(self, max_entradas=MAX_ENTRADAS, ttl=TTL):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.estadisticas = defaultdict(int)
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            respuesta, creado = entrada
+            if time.time() - creado > self.ttl:
+                del self._datos[clave]
+                self.estadisticas["expiraciones"] += 1
+                return None
+            self._datos.move_to_end(clave)
+            return respuesta
+
+    def guardar(self, clave, respuesta):
+        with self._lock:
+            self._datos[clave] = (respuesta, time.time())
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.estadisticas["expulsiones"] += 1
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class SQLiteLRU:
+    def __init__(self, ruta=RUTA_SQLITE, max_entradas=MAX_ENTRADAS, ttl=TTL):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.estadisticas = defaultdict(int)
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            "clave TEXT PRIMARY KEY, respuesta TEXT NOT NULL, creado REAL NOT NULL, usado REAL NOT NULL)"
+        )
+        self._conexion.execute("CREATE INDEX IF NOT EXISTS ix_respuestas_usado ON respuestas (usado)")
+        self._conexion.commit()
+
+    def obtener(self, clave):
+        ahora = time.time()
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT respuesta, creado FROM respuestas WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None:
+                return None
+            if ahora - fila[1] > self.ttl:
+                self._conexion.execute("DELETE FROM respuestas WHERE clave = ?", (clave,))
+                self._conexion.commit()
+                self.estadisticas["expiraciones"] += 1
+                return None
+            self._conexion.execute("UPDATE respuestas SET usado = ? WHERE clave = ?", (ahora, clave))
+            self._conexion.commit()
+            return fila[0]
+
+    def guardar(self, clave, respuesta):
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, respuesta, creado, usado) VALUES (?, ?, ?, ?)",
+                (clave, respuesta, ahora, ahora)
+            )
+            sobrantes = self._conexion.execute(
+                "DELETE FROM respuestas WHERE clave IN ("
+                "SELECT clave FROM respuestas ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+                (self.max_entradas,)
+            ).rowcount
+            self._conexion.commit()
+            self.estadisticas["expulsiones"] += sobrantes
+
+    def __len__(self):
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+
+
+class CacheRespuestas:
+    def __init__(self, backend):
+        self.backend = backend
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+
+    def obtener(self, modelo, prompt, opciones=None):
+        respuesta = self.backend.obtener(clave_cache(modelo, prompt, opciones))
+        with self._lock:
+            if respuesta is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+        return respuesta
+
+    def guardar(self, modelo, prompt, opciones, respuesta):
+        self.backend.guardar(clave_cache(modelo, prompt, opciones), respuesta)
+
+    def estadisticas(self):
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "expulsiones": self.backend.estadisticas["expulsiones"],
+            "expiraciones": self.backend.estadisticas["expiraciones"],
+            "entradas": len(self.backend)
+        }
+
+
+def cache_desde_entorno():
+    """Devuelve la caché configurada en CACHE_RESPUESTAS, o None si está desactivada."""
+    tipo = os.environ.get("CACHE_RESPUESTAS", "").lower()
+    if tipo == "memoria":
+        return CacheRespuestas(MemoriaLRU())
+    if tipo == "sqlite":
+        return CacheRespuestas(SQLiteLRU())
+    return None
@@ -0,0 +1,249 @@
+"""
+Cliente HTTP compartido para hablar con Ollama.
+
+Reutiliza conexiones keep-alive con un pool de requests, aplica timeouts de
+conexión y lectura, limita cuántas generaciones simultáneas recibe cada modelo
+y reintenta con backoff exponencial cuando no se puede abrir la conexión.
+ClienteOllamaAsync ofrece lo mismo sobre httpx para el modo ASGI.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+TIMEOUT_CONEXION = float(os.environ.get("OLLAMA_TIMEOUT_CONEXION", "3.05"))
+TIMEOUT_LECTURA = float(os.environ.get("OLLAMA_TIMEOUT_LECTURA", "120"))
+MAX_CONEXIONES = int(os.environ.get("OLLAMA_MAX_CONEXIONES", "10"))
+CONCURRENCIA_POR_MODELO = int(os.environ.get("OLLAMA_CONCURRENCIA_MODELO", "4"))
+REINTENTOS = int(os.environ.get("OLLAMA_REINTENTOS", "3"))
+BACKOFF = float(os.environ.get("OLLAMA_BACKOFF", "0.25"))
+
+
+class ErrorOllama(Exception):
+    """Error base del cliente de Ollama."""
+
+
+class ErrorHTTPOllama(ErrorOllama):
+    def __init__(self, status_code, texto):
+        super().__init__(f"Error HTTP {status_code}: {texto}")
+        self.status_code = status_code
+        self.texto = texto
+
+
+class ModeloOcupado(ErrorOllama):
+    """No se liberó un cupo de concurrencia del modelo a tiempo."""
+
+
+class ClienteOllama:
+    def __init__(
+        self,
+        host=OLLAMA_HOST,
+        timeout_conexion=TIMEOUT_CONEXION,
+        timeout_lectura=TIMEOUT_LECTURA,
+        max_conexiones=MAX_CONEXIONES,
+        concurrencia_por_modelo=CONCURRENCIA_POR_MODELO,
+        reintentos=REINTENTOS,
+        backoff=BACKOFF,
+        espera_cupo=None
+    ):
+        self.host = host.rstrip("/")
+        self.timeout = (timeout_conexion, timeout_lectura)
+        self.concurrencia_por_modelo = concurrencia_por_modelo
+        self.reintentos = reintentos
+        self.backoff = backoff
+        # Sin límite explícito se espera un cupo como mucho lo que dura una lectura
+        self.espera_cupo = timeout_lectura if espera_cupo is None else espera_cupo
+
+        self._adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=max_conexiones)
+        self.sesion = requests.Session()
+        self.sesion.mount("http://", self._adaptador)
+        self.sesion.mount("https://", self._adaptador)
+
+        self._cupos = {}
+        self._lock = threading.Lock()
+        self._contadores = defaultdict(int)
+
+    def _cupo(self, modelo):
+        with self._lock:
+            if modelo not in self._cupos:
+                self._cupos[modelo] = threading.BoundedSemaphore(self.concurrencia_por_modelo)
+            return self._cupos[modelo]
+
+    def _contar(self, nombre, cantidad=1):
+        with self._lock:
+            self._contadores[nombre] += cantidad
+
+    def _post(self, ruta, payload, stream):
+        intento = 0
+        while True:
+            try:
+                return self.sesion.post(
+                    f"{self.host}{ruta}", json=payload, stream=stream, timeout=self.timeout
+                )
+            except requests.exceptions.ConnectionError:
+                # Solo se reintenta si no se pudo conectar: la petición no llegó a Ollama
+                if intento >= self.reintentos:
+                    self._contar("errores_conexion")
+                    raise
+                self._contar("reintentos")
+                time.sleep(self.backoff * (2 ** intento))
+                intento += 1
+
+    def stream(self, ruta, payload):
+        """
+        Envía `payload` a `ruta` y produce cada objeto JSON de la respuesta NDJSON.
+        Mantiene ocupado un cupo del modelo hasta que el generador se agota o se cierra.
+        """
+        modelo = payload.get("model", "")
+        cupo = self._cupo(modelo)
+        if not cupo.acquire(timeout=self.espera_cupo):
+            self._contar("rechazos_concurrencia")
+            raise ModeloOcupado(f"El modelo {modelo} tiene {self.concurrencia_por_modelo} generaciones en curso")
+        try:
+            self._contar("peticiones")
+            with self._post(ruta, dict(payload, stream=True), stream=True) as response:
+                if response.status_code != 200:
+                    raise ErrorHTTPOllama(response.status_code, response.text)
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line.decode("utf-8"))
+                    except json.JSONDecodeError:
+                        continue
+                    yield data
+                    if data.get("done", False):
+                        break
+        finally:
+            cupo.release()
+
+    def generar(self, modelo, prompt, **opciones):
+        return self.stream("/api/generate", dict(opciones, model=modelo, prompt=prompt))
+
+    def estadisticas(self):
+        # urllib3 cuenta peticiones y conexiones abiertas por pool: las
+        # peticiones que no abrieron conexión reutilizaron una del pool.
+        peticiones_http = conexiones = 0
+        for clave in list(self._adaptador.poolmanager.pools.keys()):
+            pool = self._adaptador.poolmanager.pools.get(clave)
+            if pool is not None:
+                peticiones_http += pool.num_requests
+                conexiones += pool.num_connections
+        with self._lock:
+            datos = dict(self._contadores)
+        datos["pool_aciertos"] = max(peticiones_http - conexiones, 0)
+        datos["pool_fallos"] = conexiones
+        return datos
+
+    def cerrar(self):
+        self.sesion.close()
+
+
+class ClienteOllamaAsync:
+    """Versión asyncio de ClienteOllama; debe usarse siempre desde el mismo event loop."""
+
+    def __init__(
+        self,
+        host=OLLAMA_HOST,
+        timeout_conexion=TIMEOUT_CONEXION,
+        timeout_lectura=TIMEOUT_LECTURA,
+        max_conexiones=MAX_CONEXIONES,
+        concurrencia_por_modelo=CONCURRENCIA_POR_MODELO,
+        reintentos=REINTENTOS,
+        backoff=BACKOFF,
+        espera_cupo=None
+    ):
+        self.host = host.rstrip("/")
+        self.concurrencia_por_modelo = concurrencia_por_modelo
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.espera_cupo = timeout_lectura if espera_cupo is None else espera_cupo
+        self.http = httpx.AsyncClient(
+            base_url=self.host,
+            timeout=httpx.Timeout(timeout_lectura, connect=timeout_conexion),
+            limits=httpx.Limits(max_connections=max_conexiones, max_keepalive_connections=max_conexiones)
+        )
+        self._cupos = {}
+        self._contadores = defaultdict(int)
+        # Peticiones enviadas y conexiones abiertas, para calcular aciertos del pool como urllib3
+        self._peticiones_http = 0
+        self._conexiones = 0
+
+    def _cupo(self, modelo):
+        if modelo not in self._cupos:
+            self._cupos[modelo] = asyncio.BoundedSemaphore(self.concurrencia_por_modelo)
+        return self._cupos[modelo]
+
+    async def _trazar(self, evento, info):
+        # httpcore solo abre una conexión TCP cuando el pool no tiene una libre
+        if evento == "connection.connect_tcp.complete":
+            self._conexiones += 1
+
+    async def _abrir(self, ruta, payload):
+        intento = 0
+        while True:
+            peticion = self.http.build_request("POST", ruta, json=payload, extensions={"trace": self._trazar})
+            try:
+                response = await self.http.send(peticion, stream=True)
+                self._peticiones_http += 1
+                return response
+            except httpx.ConnectError:
+                if intento >= self.reintentos:
+                    self._contadores["errores_conexion"] += 1
+                    raise
+                self._contadores["reintentos"] += 1
+                await asyncio.sleep(self.backoff * (2 ** intento))
+                intento += 1
+
+    async def stream(self, ruta, payload):
+        modelo = payload.get("model", "")
+        cupo = self._cupo(modelo)
+        try:
+            await asyncio.wait_for(cupo.acquire(), timeout=self.espera_cupo)
+        except asyncio.TimeoutError:
+            self._contadores["rechazos_concurrencia"] += 1
+            raise ModeloOcupado(f"El modelo {modelo} tiene {self.concurrencia_por_modelo} generaciones en curso")
+        try:
+            self._contadores["peticiones"] += 1
+            response = await self._abrir(ruta, dict(payload, stream=True))
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise ErrorHTTPOllama(response.status_code, response.text)
+                terminado = False
+                async for line in response.aiter_lines():
+                    # Tras "done" se lee el cuerpo hasta el final: httpx cierra la conexión
+                    # de una respuesta a medio leer en lugar de devolverla al pool
+                    if terminado or not line:
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    yield data
+                    terminado = data.get("done", False)
+            finally:
+                await response.aclose()
+        finally:
+            cupo.release()
+
+    def generar(self, modelo, prompt, **opciones):
+        return self.stream("/api/generate", dict(opciones, model=modelo, prompt=prompt))
+
+    def estadisticas(self):
+        # Mismas claves que ClienteOllama.estadisticas
+        datos = dict(self._contadores)
+        datos["pool_aciertos"] = max(self._peticiones_http - self._conexiones, 0)
+        datos["pool_fallos"] = self._conexiones
+        return datos
+
+    async def cerrar(self):
+        await self.http.aclose()
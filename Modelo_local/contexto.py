@@ -0,0 +1,83 @@
+"""
+Conversaciones de varios turnos reutilizando el `context` de Ollama.
+
+/api/generate devuelve en su último chunk los tokens de contexto de la
+conversación. Si se reenvían en el turno siguiente, Ollama solo evalúa el
+prompt nuevo en lugar de todo el historial. Cuando el contexto supera el
+presupuesto de tokens se descarta y el turno se reconstruye con una ventana
+de los mensajes más recientes que caben en la mitad del presupuesto.
+"""
+
+import os
+
+MAX_TOKENS_CONTEXTO = int(os.environ.get("MAX_TOKENS_CONTEXTO", "2048"))
+CARACTERES_POR_TOKEN = 4
+
+ETIQUETAS = {"usuario": "Usuario", "asistente": "Asistente"}
+
+
+def estimar_tokens(texto):
+    return len(texto) // CARACTERES_POR_TOKEN + 1
+
+
+def prompt_con_ventana(historial, prompt, presupuesto):
+    """Antepone al prompt los mensajes más recientes del historial que caben en `presupuesto`."""
+    ventana = []
+    usados = estimar_tokens(prompt)
+    for mensaje in reversed(historial):
+        linea = f"{ETIQUETAS.get(mensaje['tipo'], mensaje['tipo'])}: {mensaje['contenido']}"
+        usados += estimar_tokens(linea)
+        if usados > presupuesto:
+            break
+        ventana.append(linea)
+    if not ventana:
+        return prompt
+    previos = "\n".join(reversed(ventana))
+    return f"Conversación previa:\n{previos}\n\nUsuario: {prompt}"
+
+
+class Turno:
+    def __init__(self, sid, prompt, contexto=None, prompt_modelo=None, primero=False):
+        self.sid = sid
+        self.prompt = prompt
+        self.contexto = contexto
+        self.prompt_modelo = prompt_modelo or prompt
+        self.primero = primero
+        self.tiempos = None
+
+    @property
+    def opciones_payload(self):
+        return {"context": self.contexto} if self.contexto else {}
+
+    @property
+    def modo(self):
+        if self.contexto:
+            return "reutilizado"
+        return "nuevo" if self.primero else "reconstruido"
+
+
+def preparar_turno(almacen, sid, prompt, max_tokens=MAX_TOKENS_CONTEXTO):
+    """Decide qué se envía a Ollama; debe llamarse antes de guardar el mensaje del usuario."""
+    contexto = almacen.contexto(sid)
+    if contexto and len(contexto) + estimar_tokens(prompt) <= max_tokens:
+        return Turno(sid, prompt, contexto=contexto)
+
+    historial = almacen.historial(sid)
+    if not historial:
+        return Turno(sid, prompt, primero=True)
+    return Turno(sid, prompt, prompt_modelo=prompt_con_ventana(historial, prompt, max_tokens // 2))
+
+
+def cerrar_turno(almacen, turno, final):
+    """Guarda el contexto devuelto por Ollama y anota los tiempos del turno."""
+    if final.get("context"):
+        almacen.guardar_contexto(turno.sid, final["context"])
+    turno.tiempos = {
+        "contexto": turno.modo,
+        "prompt_eval_count": final.get("prompt_eval_count", 0),
+        "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+        "eval_count": final.get("eval_count", 0),
+        "eval_ms": final.get("eval_duration", 0) / 1e6,
+        "tokens_contexto": len(final.get("context") or [])
+    }
+    return turno.tiempos
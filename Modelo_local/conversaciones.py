@@ -0,0 +1,175 @@
+"""
+Almacén de conversaciones del lado del servidor.
+
+La cookie de sesión solo guarda el id de la conversación; los mensajes viven
+aquí y cada turno se añade de forma incremental, junto con los tokens de
+contexto que devuelve Ollama para continuar la conversación. Hay dos backends
+con la misma interfaz: AlmacenMemoria (diccionario en el proceso) y
+AlmacenSQLite (fichero compartido entre procesos y reinicios). Las conversaciones sin actividad
+durante `ttl` segundos se eliminan.
+
+Se elige con CONVERSACIONES=memoria|sqlite (por defecto memoria).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+TTL = float(os.environ.get("CONVERSACIONES_TTL", str(7 * 24 * 3600)))
+MAX_MENSAJES = int(os.environ.get("CONVERSACIONES_MAX_MENSAJES", "500"))
+RUTA_SQLITE = os.environ.get("CONVERSACIONES_RUTA", "conversaciones.db")
+INTERVALO_EXPIRACION = 60
+
+
+class _Almacen:
+    def __init__(self, ttl, max_mensajes):
+        self.ttl = ttl
+        self.max_mensajes = max_mensajes
+        self._lock = threading.Lock()
+        self._ultima_expiracion = time.time()
+
+    def _quizas_expirar(self):
+        ahora = time.time()
+        if ahora - self._ultima_expiracion >= INTERVALO_EXPIRACION:
+            self._ultima_expiracion = ahora
+            self.expirar(ahora)
+
+
+class AlmacenMemoria(_Almacen):
+    def __init__(self, ttl=TTL, max_mensajes=MAX_MENSAJES):
+        super().__init__(ttl, max_mensajes)
+        self._conversaciones = {}
+
+    def agregar(self, sid, tipo, contenido):
+        with self._lock:
+            conversacion = self._conversaciones.get(sid)
+            if conversacion is None:
+                # deque con maxlen descarta los mensajes más viejos al llenarse
+                conversacion = self._conversaciones[sid] = {"mensajes": deque(maxlen=self.max_mensajes)}
+            conversacion["mensajes"].append({"tipo": tipo, "contenido": contenido})
+            conversacion["actualizado"] = time.time()
+        self._quizas_expirar()
+
+    def historial(self, sid, limite=None):
+        with self._lock:
+            conversacion = self._conversaciones.get(sid)
+            if conversacion is None:
+                return []
+            mensajes = list(conversacion["mensajes"])
+        return mensajes[-limite:] if limite else mensajes
+
+    def contexto(self, sid):
+        with self._lock:
+            conversacion = self._conversaciones.get(sid)
+            return conversacion.get("contexto") if conversacion else None
+
+    def guardar_contexto(self, sid, contexto):
+        with self._lock:
+            conversacion = self._conversaciones.get(sid)
+            if conversacion is not None:
+                conversacion["contexto"] = contexto
+
+    def limpiar(self, sid):
+        with self._lock:
+            self._conversaciones.pop(sid, None)
+
+    def expirar(self, ahora=None):
+        limite = (ahora or time.time()) - self.ttl
+        with self._lock:
+            viejas = [sid for sid, c in self._conversaciones.items() if c["actualizado"] < limite]
+            for sid in viejas:
+                del self._conversaciones[sid]
+        return len(viejas)
+
+    def __len__(self):
+        return len(self._conversaciones)
+
+
+class AlmacenSQLite(_Almacen):
+    def __init__(self, ruta=RUTA_SQLITE, ttl=TTL, max_mensajes=MAX_MENSAJES):
+        super().__init__(ttl, max_mensajes)
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA foreign_keys=ON")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS conversaciones (
+                id TEXT PRIMARY KEY,
+                actualizado REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_conversaciones_actualizado ON conversaciones (actualizado);
+            CREATE TABLE IF NOT EXISTS mensajes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                conversacion TEXT NOT NULL REFERENCES conversaciones (id) ON DELETE CASCADE,
+                tipo TEXT NOT NULL,
+                contenido TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_mensajes_conversacion ON mensajes (conversacion, id);
+        """)
+        columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(conversaciones)")]
+        if "contexto" not in columnas:
+            self._conexion.execute("ALTER TABLE conversaciones ADD COLUMN contexto TEXT")
+        self._conexion.commit()
+
+    def agregar(self, sid, tipo, contenido):
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                "INSERT INTO conversaciones (id, actualizado) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET actualizado = excluded.actualizado",
+                (sid, time.time())
+            )
+            self._conexion.execute(
+                "INSERT INTO mensajes (conversacion, tipo, contenido) VALUES (?, ?, ?)",
+                (sid, tipo, contenido)
+            )
+            # Mantiene solo los últimos max_mensajes de la conversación
+            self._conexion.execute(
+                "DELETE FROM mensajes WHERE conversacion = ? AND id < ("
+                "SELECT id FROM mensajes WHERE conversacion = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (sid, sid, self.max_mensajes - 1)
+            )
+        self._quizas_expirar()
+
+    def historial(self, sid, limite=None):
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT tipo, contenido FROM mensajes WHERE conversacion = ? ORDER BY id DESC LIMIT ?",
+                (sid, limite or -1)
+            ).fetchall()
+        return [{"tipo": tipo, "contenido": contenido} for tipo, contenido in reversed(filas)]
+
+    def contexto(self, sid):
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT contexto FROM conversaciones WHERE id = ?", (sid,)
+            ).fetchone()
+        return json.loads(fila[0]) if fila and fila[0] else None
+
+    def guardar_contexto(self, sid, contexto):
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                "UPDATE conversaciones SET contexto = ? WHERE id = ?", (json.dumps(contexto), sid)
+            )
+
+    def limpiar(self, sid):
+        with self._lock, self._conexion:
+            self._conexion.execute("DELETE FROM conversaciones WHERE id = ?", (sid,))
+
+    def expirar(self, ahora=None):
+        limite = (ahora or time.time()) - self.ttl
+        with self._lock, self._conexion:
+            return self._conexion.execute(
+                "DELETE FROM conversaciones WHERE actualizado < ?", (limite,)
+            ).rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM conversaciones").fetchone()[0]
+
+
+def almacen_desde_entorno():
+    if os.environ.get("CONVERSACIONES", "memoria").lower() == "sqlite":
+        return AlmacenSQLite()
+    return AlmacenMemoria()
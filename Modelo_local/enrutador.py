@@ -0,0 +1,274 @@
+"""
+Reparto de generaciones entre varios servidores Ollama.
+
+Cada host tiene su propio ClienteOllama. Para cada generación se elige el
+host sano con menos peticiones en curso, prefiriendo los que ya tienen el
+modelo cargado en memoria para no pagar su load_duration. Si un host no
+acepta la conexión se marca como caído y la petición se reintenta en otro.
+
+Un hilo de vigilancia consulta /api/ps de cada host cada `intervalo` segundos
+para saber si está vivo y qué modelos tiene cargados, y envía pings con
+`keep_alive` para que los modelos de `modelos_fijos` no se descarguen.
+
+Se configura con:
+    OLLAMA_HOSTS=http://a:11434,http://b:11434   (por defecto OLLAMA_HOST)
+    OLLAMA_MODELOS_FIJOS=gemma:2b                (modelos a mantener cargados)
+    OLLAMA_KEEP_ALIVE=10m
+    OLLAMA_INTERVALO_SALUD=15
+"""
+
+import os
+import threading
+
+import httpx
+import requests
+
+from cliente_ollama import CONCURRENCIA_POR_MODELO, OLLAMA_HOST, ClienteOllama, ClienteOllamaAsync, ModeloOcupado
+
+
+def _lista(valor):
+    return [parte.strip() for parte in valor.split(",") if parte.strip()]
+
+
+HOSTS = _lista(os.environ.get("OLLAMA_HOSTS", OLLAMA_HOST))
+MODELOS_FIJOS = _lista(os.environ.get("OLLAMA_MODELOS_FIJOS", ""))
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "10m")
+INTERVALO_SALUD = float(os.environ.get("OLLAMA_INTERVALO_SALUD", "15"))
+TIMEOUT_SALUD = 2
+
+
+class Backend:
+    def __init__(self, host, cliente):
+        self.host = host
+        self.cliente = cliente
+        self.sano = True
+        self.en_curso = 0
+        self.peticiones = 0
+        self.caidas = 0
+        self.cargados = set()
+
+
+class _Enrutador:
+    def __init__(
+        self,
+        hosts=None,
+        modelos_fijos=None,
+        keep_alive=KEEP_ALIVE,
+        intervalo=INTERVALO_SALUD,
+        **opciones_cliente
+    ):
+        hosts = [h.rstrip("/") for h in (hosts or HOSTS)]
+        if len(hosts) > 1:
+            # Con varios hosts es más rápido pasar al siguiente que reintentar el mismo
+            opciones_cliente.setdefault("reintentos", 0)
+        self.modelos_fijos = list(MODELOS_FIJOS if modelos_fijos is None else modelos_fijos)
+        self.keep_alive = keep_alive
+        self.intervalo = intervalo
+        # Un host caliente deja de tener preferencia cuando ya llenó su cupo del modelo
+        self.limite_caliente = opciones_cliente.get("concurrencia_por_modelo", CONCURRENCIA_POR_MODELO)
+        self.backends = [Backend(host, self._crear_cliente(host, **opciones_cliente)) for host in hosts]
+        self._lock = threading.Lock()
+        self._turno = 0
+        self._sesion = requests.Session()
+        self._parar = threading.Event()
+        self._vigilante = None
+
+    @property
+    def host(self):
+        return ", ".join(b.host for b in self.backends)
+
+    def elegir(self, modelo, excluir=()):
+        """Reserva el mejor host para `modelo` y le suma una petición en curso."""
+        with self._lock:
+            candidatos = [b for b in self.backends if b not in excluir]
+            # Si todos parecen caídos se prueba igualmente: el chequeo puede estar desfasado
+            sanos = [b for b in candidatos if b.sano] or candidatos
+            calientes = [b for b in sanos if modelo in b.cargados and b.en_curso < self.limite_caliente]
+            opciones = calientes or sanos
+            # Menos peticiones en curso; los empates se rotan para repartir la carga
+            self._turno += 1
+            n = len(opciones)
+            indice = min(range(n), key=lambda i: (opciones[i].en_curso, (i - self._turno) % n))
+            backend = opciones[indice]
+            backend.en_curso += 1
+            backend.peticiones += 1
+            return backend
+
+    def _terminar(self, backend, modelo, final=None, caido=False):
+        with self._lock:
+            backend.en_curso -= 1
+            if caido:
+                backend.sano = False
+                backend.caidas += 1
+                backend.cargados.clear()
+            elif final is not None:
+                backend.sano = True
+                backend.cargados.add(modelo)
+
+    def _payload(self, modelo, opciones):
+        if modelo in self.modelos_fijos:
+            opciones.setdefault("keep_alive", self.keep_alive)
+        return opciones
+
+    def comprobar(self):
+        """Consulta /api/ps de cada host para actualizar su salud y sus modelos cargados."""
+        for backend in self.backends:
+            try:
+                respuesta = self._sesion.get(f"{backend.host}/api/ps", timeout=TIMEOUT_SALUD)
+                respuesta.raise_for_status()
+                modelos = respuesta.json().get("models", [])
+                cargados = {m.get("name") or m.get("model") for m in modelos}
+                sano = True
+            except (requests.exceptions.RequestException, ValueError):
+                cargados = set()
+                sano = False
+            with self._lock:
+                backend.sano = sano
+                backend.cargados = cargados
+
+    def mantener_calientes(self):
+        """
+        Renueva el keep_alive de los modelos fijos donde ya están cargados y,
+        si ningún host sano tiene uno, lo carga en el menos ocupado.
+        """
+        for modelo in self.modelos_fijos:
+            with self._lock:
+                sanos = [b for b in self.backends if b.sano]
+                destinos = [b for b in sanos if modelo in b.cargados]
+                if not destinos and sanos:
+                    destinos = [min(sanos, key=lambda b: b.en_curso)]
+            for backend in destinos:
+                try:
+                    # Sin prompt Ollama solo carga el modelo y renueva su keep_alive
+                    self._sesion.post(
+                        f"{backend.host}/api/generate",
+                        json={"model": modelo, "keep_alive": self.keep_alive, "stream": False},
+                        timeout=(TIMEOUT_SALUD, None)
+                    ).raise_for_status()
+                except requests.exceptions.RequestException:
+                    with self._lock:
+                        backend.sano = False
+                    continue
+                with self._lock:
+                    backend.cargados.add(modelo)
+
+    def _vigilar(self):
+        while True:
+            self.comprobar()
+            self.mantener_calientes()
+            if self._parar.wait(self.intervalo):
+                return
+
+    def iniciar_vigilancia(self):
+        with self._lock:
+            if self._vigilante is None and self.intervalo > 0:
+                self._vigilante = threading.Thread(target=self._vigilar, daemon=True)
+                self._vigilante.start()
+
+    def detener_vigilancia(self):
+        self._parar.set()
+
+    def estado(self):
+        with self._lock:
+            return [
+                {
+                    "host": b.host,
+                    "sano": b.sano,
+                    "en_curso": b.en_curso,
+                    "peticiones": b.peticiones,
+                    "caidas": b.caidas,
+                    "cargados": sorted(b.cargados)
+                }
+                for b in self.backends
+            ]
+
+    def estadisticas(self):
+        """Suma de las estadísticas de los clientes de todos los hosts."""
+        total = {}
+        for backend in self.backends:
+            for clave, valor in backend.cliente.estadisticas().items():
+                total[clave] = total.get(clave, 0) + valor
+        return total
+
+
+class Enrutador(_Enrutador):
+    def _crear_cliente(self, host, **opciones):
+        return ClienteOllama(host=host, **opciones)
+
+    def generar(self, modelo, prompt, **opciones):
+        """Igual que ClienteOllama.generar, repartiendo entre hosts."""
+        self.iniciar_vigilancia()
+        payload = self._payload(modelo, opciones)
+        probados = []
+        while True:
+            backend = self.elegir(modelo, excluir=probados)
+            final = None
+            empezado = False
+            try:
+                for data in backend.cliente.generar(modelo, prompt, **payload):
+                    empezado = True
+                    if data.get("done"):
+                        final = data
+                    yield data
+            except (requests.exceptions.ConnectionError, ModeloOcupado) as e:
+                caido = isinstance(e, requests.exceptions.ConnectionError)
+                self._terminar(backend, modelo, caido=caido)
+                probados.append(backend)
+                # Con la respuesta a medias no se puede repetir en otro host
+                if empezado or len(probados) == len(self.backends):
+                    raise
+                continue
+            except BaseException:
+                self._terminar(backend, modelo)
+                raise
+            self._terminar(backend, modelo, final)
+            return
+
+    def cerrar(self):
+        self.detener_vigilancia()
+        for backend in self.backends:
+            backend.cliente.cerrar()
+        self._sesion.close()
+
+
+class EnrutadorAsync(_Enrutador):
+    """
+    Versión para el modo ASGI: genera con ClienteOllamaAsync y deja la
+    vigilancia en un hilo aparte, que no bloquea el event loop.
+    """
+
+    def _crear_cliente(self, host, **opciones):
+        return ClienteOllamaAsync(host=host, **opciones)
+
+    async def generar(self, modelo, prompt, **opciones):
+        self.iniciar_vigilancia()
+        payload = self._payload(modelo, opciones)
+        probados = []
+        while True:
+            backend = self.elegir(modelo, excluir=probados)
+            final = None
+            empezado = False
+            try:
+                async for data in backend.cliente.generar(modelo, prompt, **payload):
+                    empezado = True
+                    if data.get("done"):
+                        final = data
+                    yield data
+            except (httpx.ConnectError, ModeloOcupado) as e:
+                caido = isinstance(e, httpx.ConnectError)
+                self._terminar(backend, modelo, caido=caido)
+                probados.append(backend)
+                if empezado or len(probados) == len(self.backends):
+                    raise
+                continue
+            except BaseException:
+                self._terminar(backend, modelo)
+                raise
+            self._terminar(backend, modelo, final)
+            return
+
+    async def cerrar(self):
+        self.detener_vigilancia()
+        for backend in self.backends:
+            await backend.cliente.cerrar()
+        self._sesion.close()
@@ -0,0 +1,144 @@
+"""
+Tiempos de cada petición al chat.
+
+El último chunk de /api/generate trae las cifras de Ollama (total_duration,
+load_duration, prompt_eval_count, eval_count, eval_duration, en nanosegundos).
+A eso se suman los tiempos medidos aquí: primer token, tokens/s de reloj y
+render de la plantilla. La medición empieza al llegar la petición, antes de la
+cola del planificador: el primer token es el que ve el usuario, espera incluida.
+La espera en cola sola está en llm_cola_espera_segundos (planificador.py) y en
+el campo cola_s del log. Todo acaba en histogramas para /metrics y, si
+LOG_PETICIONES=1, en una línea JSON por petición en el logger "llm.peticiones".
+
+Un load_duration alto delata que Ollama tuvo que cargar el modelo en memoria.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from metricas import Histograma
+
+LOG_PETICIONES = os.environ.get("LOG_PETICIONES", "0") == "1"
+
+CUBETAS_TOKENS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+CUBETAS_TOKENS_SEGUNDO = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200)
+CUBETAS_RENDER = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+log = logging.getLogger("llm.peticiones")
+
+
+def _segundos(nanosegundos):
+    return nanosegundos / 1e9
+
+
+class Medicion:
+    """Tiempos de una petición; se crea con Instrumentacion.medicion()."""
+
+    def __init__(self, instrumentacion, **campos):
+        self._instrumentacion = instrumentacion
+        self.campos = campos
+        self.origen = "ollama"
+        self.inicio = time.perf_counter()
+        self.turno = None
+        self.primer_token = None
+        self.ultimo_token = None
+        self.tokens = 0
+        self.final = {}
+        self.render = None
+
+    def en_turno(self):
+        """Marca el momento en que el planificador concede un trabajador."""
+        self.turno = time.perf_counter()
+
+    def token(self):
+        ahora = time.perf_counter()
+        if self.primer_token is None:
+            self.primer_token = ahora
+        self.ultimo_token = ahora
+        self.tokens += 1
+
+    @contextmanager
+    def renderizando(self):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.render = time.perf_counter() - inicio
+
+    def resumen(self):
+        datos = dict(self.campos, origen=self.origen, tokens=self.tokens)
+        if self.turno is not None:
+            datos["cola_s"] = round(self.turno - self.inicio, 4)
+        if self.primer_token is not None:
+            datos["primer_token_s"] = round(self.primer_token - self.inicio, 4)
+            if self.ultimo_token > self.primer_token:
+                datos["tokens_por_segundo"] = round((self.tokens - 1) / (self.ultimo_token - self.primer_token), 2)
+        for campo in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration"):
+            if campo in self.final:
+                datos[campo.replace("duration", "s")] = round(_segundos(self.final[campo]), 4)
+        for campo in ("prompt_eval_count", "eval_count"):
+            if campo in self.final:
+                datos[campo] = self.final[campo]
+        if self.render is not None:
+            datos["render_s"] = round(self.render, 4)
+        return datos
+
+    def cerrar(self):
+        self._instrumentacion.observar(self)
+
+
+class Instrumentacion:
+    def __init__(self, log_peticiones=LOG_PETICIONES):
+        self.log_peticiones = log_peticiones
+        self.primer_token = Histograma(
+            "llm_primer_token_segundos", "Tiempo desde que llega la petición hasta el primer token (cola incluida)"
+        )
+        self.tokens_por_segundo = Histograma(
+            "llm_tokens_por_segundo", "Velocidad de generación medida en el servidor", CUBETAS_TOKENS_SEGUNDO
+        )
+        self.render = Histograma("llm_render_segundos", "Tiempo de render de la plantilla HTML", CUBETAS_RENDER)
+        self.total = Histograma("ollama_total_segundos", "total_duration informado por Ollama")
+        self.carga = Histograma("ollama_carga_segundos", "load_duration informado por Ollama (carga del modelo)")
+        self.evaluacion = Histograma("ollama_evaluacion_segundos", "eval_duration informado por Ollama")
+        self.tokens_prompt = Histograma("ollama_tokens_prompt", "prompt_eval_count informado por Ollama", CUBETAS_TOKENS)
+        self.tokens_respuesta = Histograma("ollama_tokens_respuesta", "eval_count informado por Ollama", CUBETAS_TOKENS)
+
+    def medicion(self, **campos):
+        return Medicion(self, **campos)
+
+    def observar(self, medicion):
+        if medicion.primer_token is not None:
+            self.primer_token.observar(medicion.primer_token - medicion.inicio, origen=medicion.origen)
+            if medicion.origen == "ollama" and medicion.ultimo_token > medicion.primer_token:
+                self.tokens_por_segundo.observar(
+                    (medicion.tokens - 1) / (medicion.ultimo_token - medicion.primer_token)
+                )
+        if medicion.render is not None:
+            self.render.observar(medicion.render)
+
+        final = medicion.final
+        if "total_duration" in final:
+            self.total.observar(_segundos(final["total_duration"]))
+        if "load_duration" in final:
+            self.carga.observar(_segundos(final["load_duration"]))
+        if "eval_duration" in final:
+            self.evaluacion.observar(_segundos(final["eval_duration"]))
+        if "prompt_eval_count" in final:
+            self.tokens_prompt.observar(final["prompt_eval_count"])
+        if "eval_count" in final:
+            self.tokens_respuesta.observar(final["eval_count"])
+
+        if self.log_peticiones:
+            log.info(json.dumps(medicion.resumen()))
+
+    def coleccionar(self):
+        metricas = []
+        for histograma in (
+            self.primer_token, self.tokens_por_segundo, self.render, self.total,
+            self.carga, self.evaluacion, self.tokens_prompt, self.tokens_respuesta
+        ):
+            metricas.extend(histograma.coleccionar())
+        return metricas
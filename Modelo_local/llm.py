@@ -1,161 +1,335 @@
-from flask import Flask, render_template_string, request, session
+from flask import Flask, Response, jsonify, render_template_string, request, session
 import requests
 import json
+import hashlib
+import logging
+import os
+import uuid
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "gemma:2b"
+from cache_respuestas import cache_desde_entorno
+from cliente_ollama import ErrorHTTPOllama, ModeloOcupado
+from contexto import cerrar_turno, preparar_turno
+from conversaciones import almacen_desde_entorno
+from enrutador import Enrutador
+from instrumentacion import Instrumentacion
+from metricas import TIPO_CONTENIDO, Metrica, Registro
+from planificador import ColaLlena, Planificador
+
+MODEL = os.environ.get("OLLAMA_MODELO", "gemma:2b")
+OPCIONES_GENERACION = {}
+
+# Clientes compartidos por host (OLLAMA_HOSTS): reutilizan conexiones y reparten la carga
+cliente = Enrutador()
+
+# Caché opcional de respuestas (CACHE_RESPUESTAS=memoria|sqlite)
+cache = cache_desde_entorno()
+
+# Historial en el servidor; la cookie de sesión solo lleva el id de conversación
+almacen = almacen_desde_entorno()
+
+# Cola acotada delante de Ollama: limita generaciones simultáneas y reparte turnos
+planificador = Planificador()
+
+# Histogramas de latencia por petición (LOG_PETICIONES=1 añade una línea JSON por petición)
+instrumentacion = Instrumentacion()
+
+registro = Registro()
+registro.registrar(planificador)
+registro.registrar(instrumentacion)
+
+log = logging.getLogger("llm")
 
 app = Flask(__name__)
 app.secret_key = "clave_secreta_para_sesiones_123"  
 
+MAX_HISTORIAL = 20
 
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Gemma 2B - Ollama Chat</title>
-    <style>
-        body { font-family: Arial, sans-serif; background-color: #23272f; color: #f5f6fa; margin: 0; padding: 0; }
-        .container { max-width: 800px; margin: auto; padding: 20px; }
-        h1 { text-align: center; }
-        .chat-container {
-            background-color: #2c313c; border-radius: 8px; padding: 20px; margin: 20px 0;
-            height: 400px; overflow-y: auto; border: 2px solid #3d4553;
-        }
-        .mensaje {
-            margin: 15px 0; padding: 10px; border-radius: 8px; line-height: 1.5;
-        }
-        .usuario {
-            background-color: #4f8cff; color: white; margin-left: 50px; text-align: right;
-        }
-        .asistente {
-            background-color: #40444b; color: #f5f6fa; margin-right: 50px;
-        }
-        .form-container {
-            display: flex; gap: 10px; margin-top: 20px;
-        }
-        input[type=text] {
-            flex: 1; padding: 12px; background-color: #2c313c; color: #f5f6fa; 
-            border: 2px solid #3d4553; border-radius: 8px; font-size: 16px;
-        }
-        input[type=text]:focus {
-            outline: none; border-color: #4f8cff;
-        }
-        button {
-            background-color: #4f8cff; color: #ffffff; padding: 12px 20px;
-            border: none; border-radius: 8px; cursor: pointer; font-size: 16px;
-            min-width: 80px;
-        }
-        button:hover { background-color: #3574d4; }
-        .clear-btn {
-            background-color: #e74c3c; margin-left: 10px;
-        }
-        .clear-btn:hover { background-color: #c0392b; }
-        .empty-chat {
-            text-align: center; color: #7289da; font-style: italic; margin-top: 150px;
-        }
-    </style>
-    <script>
-        function scrollToBottom() {
-            var chatContainer = document.querySelector('.chat-container');
-            chatContainer.scrollTop = chatContainer.scrollHeight;
-        }
-        window.onload = function() {
-            scrollToBottom();
-        }
-    </script>
-</head>
-<body>
-    <div class="container">
-        <h1>Gemma 2B - Ollama Chat</h1>
-        
-        <div class="chat-container">
-            {% if historial %}
-                {% for mensaje in historial %}
-                    <div class="mensaje {{ mensaje.tipo }}">
-                        <strong>{% if mensaje.tipo == 'usuario' %}Tú:{% else %}Gemma:{% endif %}</strong><br>
-                        {{ mensaje.contenido }}
-                    </div>
-                {% endfor %}
-            {% else %}
-                <div class="empty-chat">¡Escribe un mensaje para comenzar!</div>
-            {% endif %}
-        </div>
-        
-        <form method="post" class="form-container">
-            <input type="text" name="prompt" placeholder="Escribe tu pregunta..." required autofocus>
-            <button type="submit">Enviar</button>
-            <button type="submit" name="limpiar" value="true" class="clear-btn">Limpiar</button>
-        </form>
-    </div>
-</body>
-</html>
-"""
-
-def consultar_ollama(prompt):
-    payload = {
-        "model": MODEL,
-        "prompt": prompt,
-        "stream": True
-    }
-    
+
+DIR_BASE = os.path.dirname(os.path.abspath(__file__))
+
+def leer(ruta):
+    with open(os.path.join(DIR_BASE, ruta), encoding="utf-8") as f:
+        return f.read()
+
+# La página se arma con templates/chat.html; CSS y JS viven en static/ y se
+# sirven aparte con ETag. CHAT_RENDER=inline vuelve a incrustarlos y a compilar
+# la plantilla en cada petición, como antes, para poder compararlo.
+PLANTILLA = leer("templates/chat.html")
+ESTILOS = leer("static/chat.css")
+SCRIPT = leer("static/chat.js")
+VERSION_ESTATICOS = hashlib.sha256((ESTILOS + SCRIPT).encode("utf-8")).hexdigest()[:12]
+MODO_RENDER = os.environ.get("CHAT_RENDER", "cache")
+
+# La URL lleva la versión del contenido, así que el navegador puede guardarlos un año
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 365 * 24 * 3600
+
+plantilla = app.jinja_env.from_string(PLANTILLA)
+
+
+def generar_ollama(prompt, turno=None, medicion=None):
+    # Con historial la respuesta depende de la conversación: solo se cachea el primer turno
+    usar_cache = cache is not None and (turno is None or turno.primero)
+    if usar_cache:
+        guardada = cache.obtener(MODEL, prompt, OPCIONES_GENERACION)
+        if guardada is not None:
+            if medicion:
+                medicion.origen = "cache"
+                medicion.token()
+            yield guardada
+            return
+
+    prompt_modelo = turno.prompt_modelo if turno else prompt
+    extra = turno.opciones_payload if turno else {}
+    partes = []
+    final = {}
     try:
-        response = requests.post(OLLAMA_URL, json=payload, stream=True)
-        if response.status_code == 200:
-            respuesta = ""
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        data = json.loads(line.decode('utf-8'))
-                        if 'response' in data:
-                            respuesta += data['response']
-                        if data.get('done', False):
-                            break
-                    except json.JSONDecodeError:
-                        continue
-            return respuesta.strip() if respuesta else "Sin respuesta del modelo."
-        else:
-            return f"Error HTTP {response.status_code}: {response.text}"
-    except requests.exceptions.ConnectionError:
-        return "Error: No se pudo conectar con Ollama. ¿Está ejecutándose en localhost:11434?"
+        for data in cliente.generar(MODEL, prompt_modelo, options=OPCIONES_GENERACION, **extra):
+            if data.get('response'):
+                if medicion:
+                    medicion.token()
+                partes.append(data['response'])
+                yield data['response']
+            if data.get('done'):
+                final = data
     except Exception as e:
-        return f"Error inesperado: {str(e)}"
+        if medicion:
+            medicion.origen = "error"
+        yield mensaje_error(e)
+        return
+
+    if medicion:
+        medicion.final = final
+    if turno is not None:
+        tiempos = cerrar_turno(almacen, turno, final)
+        log.info("turno sid=%s %s", turno.sid, json.dumps(tiempos))
+
+    # Solo se guardan respuestas completas: los errores y los streams cortados no llegan aquí
+    if usar_cache and partes:
+        cache.guardar(MODEL, prompt, OPCIONES_GENERACION, "".join(partes))
+
+def mensaje_error(e):
+    if isinstance(e, ErrorHTTPOllama):
+        return str(e)
+    if isinstance(e, ModeloOcupado):
+        return "Error: El modelo está atendiendo demasiadas consultas. Inténtalo de nuevo en unos segundos."
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return f"Error: No se pudo conectar con Ollama. ¿Está ejecutándose en {cliente.host}?"
+    if isinstance(e, requests.exceptions.Timeout):
+        return "Error: Ollama no respondió a tiempo."
+    return f"Error inesperado: {str(e)}"
+
+def consultar_ollama(prompt, turno=None, medicion=None):
+    respuesta = "".join(generar_ollama(prompt, turno, medicion))
+    return respuesta.strip() if respuesta else "Sin respuesta del modelo."
+
+def id_conversacion():
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+    return session['sid']
+
+def historial_visible(sid):
+    return almacen.historial(sid, limite=MAX_HISTORIAL)
+
+def renderizar(historial):
+    if MODO_RENDER == "inline":
+        return render_template_string(PLANTILLA, historial=historial, estilos=ESTILOS, script=SCRIPT)
+    return plantilla.render(historial=historial, version=VERSION_ESTATICOS)
+
+def demasiadas_peticiones(error):
+    return Response(
+        f"{error} Inténtalo de nuevo en {error.retry_after} s.",
+        status=429,
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def conversar(sid, prompt, ruta):
+    """Turno completo sin streaming; lanza ColaLlena si el modelo no tiene sitio."""
+    # La medición empieza al llegar la petición: el primer token incluye la cola
+    medicion = instrumentacion.medicion(sid=sid, ruta=ruta)
+
+    # Esperar turno en la cola del modelo
+    ticket = planificador.admitir(sid, prompt)
+    planificador.esperar(ticket)
+    medicion.en_turno()
+    try:
+        turno = preparar_turno(almacen, sid, prompt)
+        medicion.campos["contexto"] = turno.modo
+
+        # Agregar mensaje del usuario al historial
+        almacen.agregar(sid, 'usuario', prompt)
+
+        # Obtener respuesta del modelo
+        respuesta = consultar_ollama(prompt, turno, medicion)
+
+        # Agregar respuesta del asistente al historial
+        almacen.agregar(sid, 'asistente', respuesta)
+    finally:
+        planificador.liberar(ticket)
+    return respuesta, medicion
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    # Inicializar historial si no existe
-    if 'historial' not in session:
-        session['historial'] = []
+    sid = id_conversacion()
     
     if request.method == "POST":
         
         if request.form.get("limpiar"):
-            session['historial'] = []
-            return render_template_string(HTML_TEMPLATE, historial=session['historial'])
+            almacen.limpiar(sid)
+            return renderizar([])
         
         prompt = request.form.get("prompt", "").strip()
         if prompt:
-            # Agregar mensaje del usuario al historial
-            session['historial'].append({
-                'tipo': 'usuario',
-                'contenido': prompt
-            })
-            
-            # Obtener respuesta del modelo
-            respuesta = consultar_ollama(prompt)
-            
-            # Agregar respuesta del asistente al historial
-            session['historial'].append({
-                'tipo': 'asistente',
-                'contenido': respuesta
-            })
-            
-            if len(session['historial']) > 20:
-                session['historial'] = session['historial'][-20:]
-            
-            session.modified = True
+            try:
+                _, medicion = conversar(sid, prompt, "/")
+            except ColaLlena as e:
+                return demasiadas_peticiones(e)
+
+            with medicion.renderizando():
+                pagina = renderizar(historial_visible(sid))
+            medicion.cerrar()
+            return pagina
     
-    return render_template_string(HTML_TEMPLATE, historial=session['historial'])
+    return renderizar(historial_visible(sid))
+
+@app.route("/api/chat", methods=["POST"])
+def api_chat():
+    """Modo JSON: devuelve solo el par de mensajes nuevo para añadirlo en la página."""
+    sid = id_conversacion()
+
+    datos = request.get_json(silent=True) or request.form
+    prompt = str(datos.get("prompt") or "").strip()
+    if not prompt:
+        return jsonify(error="Falta el prompt"), 400
+
+    try:
+        respuesta, medicion = conversar(sid, prompt, "/api/chat")
+    except ColaLlena as e:
+        return demasiadas_peticiones(e)
+    medicion.cerrar()
+
+    return jsonify(mensajes=[
+        {"tipo": "usuario", "contenido": prompt},
+        {"tipo": "asistente", "contenido": respuesta}
+    ])
+
+@app.route("/stream", methods=["POST"])
+def stream():
+    sid = id_conversacion()
+
+    prompt = request.form.get("prompt", "").strip()
+    if not prompt:
+        return Response("Falta el prompt", status=400)
+
+    medicion = instrumentacion.medicion(sid=sid, ruta="/stream")
+
+    # Se espera el turno antes de abrir el stream para poder responder 429
+    try:
+        ticket = planificador.admitir(sid, prompt)
+        planificador.esperar(ticket)
+    except ColaLlena as e:
+        return demasiadas_peticiones(e)
+    medicion.en_turno()
+
+    # Hasta que call_on_close se hace cargo del ticket, un error (p. ej. de SQLite
+    # en el almacén) tiene que liberarlo aquí o el trabajador se pierde para siempre
+    try:
+        turno = preparar_turno(almacen, sid, prompt)
+        almacen.agregar(sid, 'usuario', prompt)
+        medicion.campos["contexto"] = turno.modo
+
+        def eventos():
+            partes = []
+            try:
+                for token in generar_ollama(prompt, turno, medicion):
+                    partes.append(token)
+                    yield f"data: {json.dumps({'token': token})}\n\n"
+                # El historial está en el servidor: se guarda al terminar, sin depender de la cookie
+                almacen.agregar(sid, 'asistente', "".join(partes).strip() or "Sin respuesta del modelo.")
+            finally:
+                # También si el cliente corta el stream o falla la generación
+                medicion.cerrar()
+            yield f"event: fin\ndata: {json.dumps(turno.tiempos or {})}\n\n"
+
+        respuesta = Response(
+            eventos(),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except Exception:
+        planificador.liberar(ticket)
+        raise
+    # call_on_close libera el trabajador aunque el cliente corte el stream antes de empezar
+    respuesta.call_on_close(lambda: planificador.liberar(ticket))
+    return respuesta
+
+def metricas_cliente_ollama(enrutador):
+    # Las mismas series en los modos WSGI y ASGI
+    stats = enrutador.estadisticas()
+    return [
+        Metrica("ollama_pool_conexiones_total", "counter", "Peticiones HTTP a Ollama según si reutilizaron conexión").muestra(
+            stats["pool_aciertos"], resultado="reutilizada"
+        ).muestra(stats["pool_fallos"], resultado="nueva"),
+        Metrica("ollama_reintentos_total", "counter", "Reintentos por errores de conexión").muestra(
+            stats.get("reintentos", 0)
+        ),
+        Metrica("ollama_rechazos_concurrencia_total", "counter", "Generaciones rechazadas por falta de cupo en el modelo").muestra(
+            stats.get("rechazos_concurrencia", 0)
+        )
+    ]
+
+@registro.registrar
+def metricas_cliente():
+    return metricas_cliente_ollama(cliente)
+
+def metricas_enrutador(enrutador):
+    estado = enrutador.estado()
+    sano = Metrica("ollama_backend_sano", "gauge", "1 si el host de Ollama respondió al último chequeo")
+    en_curso = Metrica("ollama_backend_en_curso", "gauge", "Generaciones en curso por host")
+    peticiones = Metrica("ollama_backend_peticiones_total", "counter", "Generaciones enviadas a cada host")
+    caidas = Metrica("ollama_backend_caidas_total", "counter", "Conexiones fallidas que marcaron el host como caído")
+    cargados = Metrica("ollama_modelo_cargado", "gauge", "Modelos cargados en memoria en cada host")
+    for backend in estado:
+        sano.muestra(int(backend["sano"]), host=backend["host"])
+        en_curso.muestra(backend["en_curso"], host=backend["host"])
+        peticiones.muestra(backend["peticiones"], host=backend["host"])
+        caidas.muestra(backend["caidas"], host=backend["host"])
+        for modelo in backend["cargados"]:
+            cargados.muestra(1, host=backend["host"], modelo=modelo)
+    return [sano, en_curso, peticiones, caidas, cargados]
+
+@registro.registrar
+def metricas_backends():
+    return metricas_enrutador(cliente)
+
+@registro.registrar
+def metricas_conversaciones():
+    yield Metrica("llm_conversaciones_activas", "gauge", "Conversaciones guardadas en el almacén").muestra(len(almacen))
+
+@registro.registrar
+def metricas_cache():
+    if cache is None:
+        return
+    stats = cache.estadisticas()
+    yield Metrica("llm_cache_consultas_total", "counter", "Consultas a la caché de respuestas").muestra(
+        stats["aciertos"], resultado="acierto"
+    ).muestra(stats["fallos"], resultado="fallo")
+    yield Metrica("llm_cache_desalojos_total", "counter", "Entradas eliminadas de la caché de respuestas").muestra(
+        stats["expulsiones"], motivo="lru"
+    ).muestra(stats["expiraciones"], motivo="ttl")
+    yield Metrica("llm_cache_entradas", "gauge", "Entradas guardadas en la caché de respuestas").muestra(
+        stats["entradas"]
+    )
+
+@app.route("/metrics")
+def metrics():
+    return Response(registro.exponer(), content_type=TIPO_CONTENIDO)
 
 if __name__ == "__main__":
-    app.run(port=5000, debug=True)
+    import sys
+    if "--asgi" in sys.argv:
+        # Modo asíncrono: una sola corrutina por chat en lugar de un hilo
+        import uvicorn
+        uvicorn.run("llm_async:app", port=5000)
+    else:
+        logging.basicConfig(level=logging.INFO)
+        app.run(port=5000, debug=True)
@@ -0,0 +1,285 @@
+"""
+Modo de servicio ASGI del chat con Ollama.
+
+Atiende las mismas rutas que llm.py, pero cada generación es una corrutina que
+espera a Ollama sin bloquear un hilo, así que un solo proceso sostiene cientos
+de chats simultáneos. El almacén de conversaciones y la caché de respuestas son
+síncronos (SQLite en disco): sus llamadas van al pool de hilos con
+run_in_threadpool para no bloquear el bucle de eventos.
+
+Uso:
+    uvicorn llm_async:app --port 5000
+    python llm.py --asgi
+"""
+
+import json
+import os
+import uuid
+
+import httpx
+from jinja2 import Environment
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+from cliente_ollama import ErrorHTTPOllama, ModeloOcupado
+from contexto import cerrar_turno, preparar_turno
+from enrutador import EnrutadorAsync
+from llm import (
+    DIR_BASE, ESTILOS, MAX_HISTORIAL, MODEL, MODO_RENDER, OPCIONES_GENERACION, PLANTILLA, SCRIPT, VERSION_ESTATICOS,
+    almacen, app as app_flask, cache, instrumentacion, log, metricas_cache, metricas_cliente_ollama,
+    metricas_conversaciones, metricas_enrutador
+)
+from metricas import TIPO_CONTENIDO, Registro
+from planificador import ColaLlena, PlanificadorAsync
+
+cliente = EnrutadorAsync()
+
+planificador = PlanificadorAsync()
+
+registro = Registro()
+registro.registrar(planificador)
+registro.registrar(instrumentacion)
+registro.registrar(metricas_cache)
+registro.registrar(metricas_conversaciones)
+
+plantilla = Environment(autoescape=True).from_string(PLANTILLA)
+
+
+class Estaticos(StaticFiles):
+    """StaticFiles ya responde con ETag y 304; la URL versionada permite cachear un año."""
+
+    def file_response(self, *args, **kwargs):
+        respuesta = super().file_response(*args, **kwargs)
+        respuesta.headers["Cache-Control"] = "public, max-age=31536000"
+        return respuesta
+
+
+async def generar_ollama(prompt, turno=None, medicion=None):
+    usar_cache = cache is not None and (turno is None or turno.primero)
+    if usar_cache:
+        guardada = await run_in_threadpool(cache.obtener, MODEL, prompt, OPCIONES_GENERACION)
+        if guardada is not None:
+            if medicion:
+                medicion.origen = "cache"
+                medicion.token()
+            yield guardada
+            return
+
+    prompt_modelo = turno.prompt_modelo if turno else prompt
+    extra = turno.opciones_payload if turno else {}
+    partes = []
+    final = {}
+    try:
+        async for data in cliente.generar(MODEL, prompt_modelo, options=OPCIONES_GENERACION, **extra):
+            if data.get('response'):
+                if medicion:
+                    medicion.token()
+                partes.append(data['response'])
+                yield data['response']
+            if data.get('done'):
+                final = data
+    except Exception as e:
+        if medicion:
+            medicion.origen = "error"
+        yield mensaje_error(e)
+        return
+
+    if medicion:
+        medicion.final = final
+    if turno is not None:
+        tiempos = await run_in_threadpool(cerrar_turno, almacen, turno, final)
+        log.info("turno sid=%s %s", turno.sid, json.dumps(tiempos))
+
+    if usar_cache and partes:
+        await run_in_threadpool(cache.guardar, MODEL, prompt, OPCIONES_GENERACION, "".join(partes))
+
+
+def mensaje_error(e):
+    if isinstance(e, ErrorHTTPOllama):
+        return str(e)
+    if isinstance(e, ModeloOcupado):
+        return "Error: El modelo está atendiendo demasiadas consultas. Inténtalo de nuevo en unos segundos."
+    if isinstance(e, httpx.ConnectError):
+        return f"Error: No se pudo conectar con Ollama. ¿Está ejecutándose en {cliente.host}?"
+    if isinstance(e, httpx.TimeoutException):
+        return "Error: Ollama no respondió a tiempo."
+    return f"Error inesperado: {str(e)}"
+
+
+async def consultar_ollama(prompt, turno=None, medicion=None):
+    respuesta = "".join([token async for token in generar_ollama(prompt, turno, medicion)])
+    return respuesta.strip() if respuesta else "Sin respuesta del modelo."
+
+
+def id_conversacion(session):
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+    return session['sid']
+
+
+def renderizar(historial):
+    if MODO_RENDER == "inline":
+        return HTMLResponse(plantilla.render(historial=historial, estilos=ESTILOS, script=SCRIPT))
+    return HTMLResponse(plantilla.render(historial=historial, version=VERSION_ESTATICOS))
+
+
+def demasiadas_peticiones(error):
+    return Response(
+        f"{error} Inténtalo de nuevo en {error.retry_after} s.",
+        status_code=429,
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def conversar(sid, prompt, ruta):
+    medicion = instrumentacion.medicion(sid=sid, ruta=ruta)
+    ticket = planificador.admitir(sid, prompt)
+    await planificador.esperar(ticket)
+    medicion.en_turno()
+    try:
+        turno = await run_in_threadpool(preparar_turno, almacen, sid, prompt)
+        medicion.campos["contexto"] = turno.modo
+        await run_in_threadpool(almacen.agregar, sid, 'usuario', prompt)
+        respuesta = await consultar_ollama(prompt, turno, medicion)
+        await run_in_threadpool(almacen.agregar, sid, 'asistente', respuesta)
+    finally:
+        planificador.liberar(ticket)
+    return respuesta, medicion
+
+
+async def index(request):
+    sid = id_conversacion(request.session)
+
+    if request.method == "POST":
+        form = await request.form()
+
+        if form.get("limpiar"):
+            await run_in_threadpool(almacen.limpiar, sid)
+            return renderizar([])
+
+        prompt = form.get("prompt", "").strip()
+        if prompt:
+            try:
+                _, medicion = await conversar(sid, prompt, "/")
+            except ColaLlena as e:
+                return demasiadas_peticiones(e)
+
+            historial = await run_in_threadpool(almacen.historial, sid, limite=MAX_HISTORIAL)
+            with medicion.renderizando():
+                pagina = renderizar(historial)
+            medicion.cerrar()
+            return pagina
+
+    return renderizar(await run_in_threadpool(almacen.historial, sid, limite=MAX_HISTORIAL))
+
+
+async def api_chat(request):
+    sid = id_conversacion(request.session)
+
+    if request.headers.get("content-type", "").startswith("application/json"):
+        datos = await request.json()
+    else:
+        datos = await request.form()
+    prompt = str(datos.get("prompt") or "").strip()
+    if not prompt:
+        return JSONResponse({"error": "Falta el prompt"}, status_code=400)
+
+    try:
+        respuesta, medicion = await conversar(sid, prompt, "/api/chat")
+    except ColaLlena as e:
+        return demasiadas_peticiones(e)
+    medicion.cerrar()
+
+    return JSONResponse({"mensajes": [
+        {"tipo": "usuario", "contenido": prompt},
+        {"tipo": "asistente", "contenido": respuesta}
+    ]})
+
+
+async def stream(request):
+    sid = id_conversacion(request.session)
+
+    form = await request.form()
+    prompt = form.get("prompt", "").strip()
+    if not prompt:
+        return Response("Falta el prompt", status_code=400)
+
+    medicion = instrumentacion.medicion(sid=sid, ruta="/stream")
+    try:
+        ticket = planificador.admitir(sid, prompt)
+        await planificador.esperar(ticket)
+    except ColaLlena as e:
+        return demasiadas_peticiones(e)
+    medicion.en_turno()
+
+    # Hasta que la BackgroundTask se hace cargo del ticket, un error tiene que liberarlo aquí
+    try:
+        turno = await run_in_threadpool(preparar_turno, almacen, sid, prompt)
+        await run_in_threadpool(almacen.agregar, sid, 'usuario', prompt)
+        medicion.campos["contexto"] = turno.modo
+
+        async def eventos():
+            partes = []
+            try:
+                async for token in generar_ollama(prompt, turno, medicion):
+                    partes.append(token)
+                    yield f"data: {json.dumps({'token': token})}\n\n"
+                await run_in_threadpool(
+                    almacen.agregar, sid, 'asistente', "".join(partes).strip() or "Sin respuesta del modelo."
+                )
+            finally:
+                medicion.cerrar()
+            yield f"event: fin\ndata: {json.dumps(turno.tiempos or {})}\n\n"
+
+        return StreamingResponse(
+            eventos(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            background=BackgroundTask(planificador.liberar, ticket)
+        )
+    except Exception:
+        planificador.liberar(ticket)
+        raise
+
+
+@registro.registrar
+def metricas_cliente():
+    return metricas_cliente_ollama(cliente)
+
+
+@registro.registrar
+def metricas_backends():
+    return metricas_enrutador(cliente)
+
+
+async def metrics(request):
+    # Las métricas del almacén y de la caché consultan SQLite
+    return Response(await run_in_threadpool(registro.exponer), headers={"Content-Type": TIPO_CONTENIDO})
+
+
+async def cerrar_cliente():
+    await cliente.cerrar()
+
+
+app = Starlette(
+    routes=[
+        Route("/", index, methods=["GET", "POST"]),
+        Route("/api/chat", api_chat, methods=["POST"]),
+        Route("/stream", stream, methods=["POST"]),
+        Route("/metrics", metrics),
+        Mount("/static", Estaticos(directory=os.path.join(DIR_BASE, "static")), name="static"),
+    ],
+    middleware=[Middleware(SessionMiddleware, secret_key=app_flask.secret_key)],
+    on_shutdown=[cerrar_cliente]
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("llm_async:app", port=5000)
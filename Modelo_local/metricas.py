@@ -0,0 +1,130 @@
+"""
+Métricas en formato de exposición de texto de Prometheus.
+
+Un Registro agrupa colectores: objetos con un método coleccionar() que devuelve
+Metricas. Contador sirve para valores que solo crecen e Histograma para
+distribuciones como latencias; para leer estadísticas que ya lleva otro
+componente basta con registrar una función que las traduzca.
+"""
+
+import threading
+
+
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    pares = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in sorted(etiquetas.items())
+    )
+    return "{" + pares + "}"
+
+
+def _valor(valor):
+    if isinstance(valor, int):
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class Metrica:
+    def __init__(self, nombre, tipo, ayuda):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.ayuda = ayuda
+        self.muestras = []
+
+    def muestra(self, valor, sufijo="", **etiquetas):
+        self.muestras.append((self.nombre + sufijo, etiquetas, valor))
+        return self
+
+    def exponer(self):
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        for nombre, etiquetas, valor in self.muestras:
+            lineas.append(f"{nombre}{_etiquetas(etiquetas)} {_valor(valor)}")
+        return "\n".join(lineas)
+
+
+class Contador:
+    def __init__(self, nombre, ayuda):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + valor
+
+    def coleccionar(self):
+        metrica = Metrica(self.nombre, "counter", self.ayuda)
+        with self._lock:
+            for clave, valor in self._valores.items():
+                metrica.muestra(valor, **dict(clave))
+        return [metrica]
+
+
+CUBETAS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histograma:
+    def __init__(self, nombre, ayuda, cubetas=CUBETAS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.cubetas = tuple(sorted(cubetas))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = {"cubetas": [0] * len(self.cubetas), "suma": 0.0, "cuenta": 0}
+            for i, limite in enumerate(self.cubetas):
+                if valor <= limite:
+                    serie["cubetas"][i] += 1
+            serie["suma"] += valor
+            serie["cuenta"] += 1
+
+    def coleccionar(self):
+        metrica = Metrica(self.nombre, "histogram", self.ayuda)
+        with self._lock:
+            for clave, serie in self._series.items():
+                etiquetas = dict(clave)
+                for limite, cuenta in zip(self.cubetas, serie["cubetas"]):
+                    metrica.muestra(cuenta, "_bucket", le=f"{limite:g}", **etiquetas)
+                metrica.muestra(serie["cuenta"], "_bucket", le="+Inf", **etiquetas)
+                metrica.muestra(serie["suma"], "_sum", **etiquetas)
+                metrica.muestra(serie["cuenta"], "_count", **etiquetas)
+        return [metrica]
+
+
+class _ColectorFuncion:
+    def __init__(self, funcion):
+        self.funcion = funcion
+
+    def coleccionar(self):
+        return list(self.funcion())
+
+
+class Registro:
+    def __init__(self):
+        self._colectores = []
+
+    def registrar(self, colector):
+        """Añade un colector; acepta también una función que devuelva Metricas."""
+        if hasattr(colector, "coleccionar"):
+            self._colectores.append(colector)
+        else:
+            self._colectores.append(_ColectorFuncion(colector))
+        return colector
+
+    def exponer(self):
+        bloques = []
+        for colector in self._colectores:
+            bloques.extend(metrica.exponer() for metrica in colector.coleccionar())
+        return "\n".join(bloques) + "\n"
+
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,216 @@
+"""
+Servidor que imita la API de Ollama para pruebas y mediciones de carga.
+
+Responde a /api/generate con NDJSON en streaming, igual que Ollama, pero con
+una respuesta fija y un retardo configurable por token. Cada palabra cuenta
+como un token; si la petición trae `context`, solo se evalúan las palabras
+nuevas del prompt, como hace Ollama al reutilizar la caché KV.
+
+También imita la residencia de modelos: la primera petición a un modelo no
+cargado espera `retardo_carga` segundos (y lo informa en load_duration), el
+modelo sigue cargado durante `keep_alive` y /api/ps lista los cargados.
+
+Uso:
+    python ollama_simulado.py --puerto 11434 --retardo 0.02 --carga 2
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPUESTA = "Hola, soy un modelo simulado que responde siempre lo mismo."
+KEEP_ALIVE = 300
+UNIDADES = (("ms", 0.001), ("s", 1), ("m", 60), ("h", 3600))
+
+
+def segundos_keep_alive(valor):
+    """Convierte un keep_alive de Ollama ("10m", "30s", 300, -1) a segundos."""
+    if valor is None:
+        return KEEP_ALIVE
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    for sufijo, factor in UNIDADES:
+        if valor.endswith(sufijo):
+            return float(valor[:-len(sufijo)]) * factor
+    return float(valor)
+
+
+class ManejadorOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _leer_json(self):
+        longitud = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(longitud) or b"{}")
+
+    def _enviar_json(self, datos, status=200):
+        cuerpo = json.dumps(datos).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _enviar_trozo(self, datos):
+        linea = json.dumps(datos).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(linea):X}\r\n".encode() + linea + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/":
+            cuerpo = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+        elif self.path == "/api/ps":
+            modelos = [
+                {
+                    "name": modelo,
+                    "model": modelo,
+                    "expires_at": datetime.fromtimestamp(min(expira, 2**31), timezone.utc).isoformat()
+                }
+                for modelo, expira in self.server.cargados_ahora().items()
+            ]
+            self._enviar_json({"models": modelos})
+        else:
+            self._enviar_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.peticiones += 1
+        payload = self._leer_json()
+
+        if self.path != "/api/generate":
+            self._enviar_json({"error": "not found"}, status=404)
+            return
+
+        inicio = time.perf_counter()
+        carga = servidor.cargar(payload.get("model"), payload.get("keep_alive"))
+        # Sin prompt Ollama solo carga el modelo (o renueva su keep_alive)
+        tokens = [palabra + " " for palabra in servidor.respuesta.split()] if payload.get("prompt") else []
+        if not payload.get("stream", True):
+            time.sleep(servidor.retardo_token * len(tokens))
+            self._enviar_json(self._final(payload, "".join(tokens), inicio, len(tokens), carga))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokens:
+            time.sleep(servidor.retardo_token)
+            self._enviar_trozo({"model": payload.get("model"), "response": token, "done": False})
+        self._enviar_trozo(self._final(payload, "", inicio, len(tokens), carga))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _final(self, payload, texto, inicio, num_tokens, carga=0):
+        total = int((time.perf_counter() - inicio) * 1e9)
+        contexto = list(payload.get("context") or [])
+        tokens_prompt = len(payload.get("prompt", "").split())
+        contexto.extend(range(len(contexto), len(contexto) + tokens_prompt + num_tokens))
+        return {
+            "model": payload.get("model"),
+            "response": texto,
+            "done": True,
+            "total_duration": total,
+            "load_duration": int(carga * 1e9),
+            "prompt_eval_count": tokens_prompt,
+            "prompt_eval_duration": tokens_prompt * 1_000_000,
+            "eval_count": num_tokens,
+            "eval_duration": total,
+            "context": contexto
+        }
+
+
+class OllamaSimulado(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, direccion, retardo_token=0.0, respuesta=RESPUESTA, retardo_carga=0.0):
+        super().__init__(direccion, ManejadorOllama)
+        self.retardo_token = retardo_token
+        self.retardo_carga = retardo_carga
+        self.respuesta = respuesta
+        self.peticiones = 0
+        self.cargas = 0
+        self.cargados = {}
+        self.conexiones = set()
+        self.lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.conexiones.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self.lock:
+            self.conexiones.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self):
+        # Como un Ollama que se cae: también se cortan las conexiones keep-alive abiertas
+        super().server_close()
+        with self.lock:
+            conexiones = list(self.conexiones)
+        for conexion in conexiones:
+            try:
+                conexion.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def cargados_ahora(self):
+        ahora = time.time()
+        with self.lock:
+            for modelo in [m for m, expira in self.cargados.items() if expira <= ahora]:
+                del self.cargados[modelo]
+            return dict(self.cargados)
+
+    def cargar(self, modelo, keep_alive):
+        """Simula la carga del modelo si no está en memoria; devuelve los segundos de carga."""
+        frio = modelo not in self.cargados_ahora()
+        if frio:
+            time.sleep(self.retardo_carga)
+        segundos = segundos_keep_alive(keep_alive)
+        with self.lock:
+            self.cargas += frio
+            if segundos == 0:
+                self.cargados.pop(modelo, None)
+            else:
+                self.cargados[modelo] = float("inf") if segundos < 0 else time.time() + segundos
+        return self.retardo_carga if frio else 0.0
+
+    def handle_error(self, request, client_address):
+        # Los clientes que cortan el stream a mitad no son un error del simulador
+        pass
+
+    @property
+    def url(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+
+def iniciar_servidor(puerto=0, retardo_token=0.0, respuesta=RESPUESTA, retardo_carga=0.0):
+    """Arranca el servidor en un hilo de fondo; con puerto 0 se elige uno libre."""
+    servidor = OllamaSimulado(("127.0.0.1", puerto), retardo_token, respuesta, retardo_carga)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor Ollama simulado")
+    parser.add_argument("--puerto", type=int, default=11434)
+    parser.add_argument("--retardo", type=float, default=0.02, help="Segundos de espera por token")
+    parser.add_argument("--carga", type=float, default=0.0, help="Segundos que tarda en cargar un modelo")
+    args = parser.parse_args()
+
+    servidor = OllamaSimulado(("127.0.0.1", args.puerto), args.retardo, retardo_carga=args.carga)
+    print(f"Ollama simulado escuchando en {servidor.url}")
+    servidor.serve_forever()
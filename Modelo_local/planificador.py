@@ -0,0 +1,200 @@
+"""
+Planificador de peticiones delante del modelo local.
+
+Como mucho `trabajadores` generaciones llegan a Ollama a la vez; el resto
+espera en una cola acotada. La cola tiene dos clases: los prompts cortos se
+atienden antes que los normales (sin dejar a estos sin turno indefinidamente),
+y dentro de cada clase los usuarios se turnan en round-robin para que nadie
+acapare el modelo. Si la cola está llena, o el usuario ya tiene demasiadas
+peticiones en curso, la petición se rechaza con ColaLlena y un Retry-After
+estimado en lugar de acumularse.
+
+PlanificadorAsync ofrece la misma política para el modo ASGI.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from contexto import estimar_tokens
+from metricas import Contador, Histograma, Metrica
+
+TRABAJADORES = int(os.environ.get("PLANIFICADOR_TRABAJADORES", "4"))
+MAX_COLA = int(os.environ.get("PLANIFICADOR_MAX_COLA", "32"))
+MAX_POR_USUARIO = int(os.environ.get("PLANIFICADOR_MAX_POR_USUARIO", "2"))
+UMBRAL_CORTO = int(os.environ.get("PLANIFICADOR_UMBRAL_CORTO", "32"))
+MAX_CORTOS_SEGUIDOS = 4
+ESPERA_MAXIMA = float(os.environ.get("PLANIFICADOR_ESPERA_MAXIMA", "120"))
+
+CORTO = "corto"
+NORMAL = "normal"
+
+
+class ColaLlena(Exception):
+    def __init__(self, motivo, retry_after):
+        super().__init__(motivo)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    def __init__(self, usuario, clase, evento):
+        self.usuario = usuario
+        self.clase = clase
+        self.evento = evento
+        self.encolado = time.perf_counter()
+        self.concedido = None
+
+
+class Planificador:
+    def __init__(
+        self,
+        trabajadores=TRABAJADORES,
+        max_cola=MAX_COLA,
+        max_por_usuario=MAX_POR_USUARIO,
+        umbral_corto=UMBRAL_CORTO
+    ):
+        self.trabajadores = trabajadores
+        self.max_cola = max_cola
+        self.max_por_usuario = max_por_usuario
+        self.umbral_corto = umbral_corto
+        self._lock = threading.Lock()
+        self._libres = trabajadores
+        self._colas = {CORTO: OrderedDict(), NORMAL: OrderedDict()}
+        self._en_cola = 0
+        self._por_usuario = {}
+        self._cortos_seguidos = 0
+        self._servicio_medio = 1.0
+
+        self.espera = Histograma("llm_cola_espera_segundos", "Tiempo en cola antes de llegar al modelo")
+        self.servicio = Histograma("llm_servicio_segundos", "Tiempo ocupando un trabajador del modelo")
+        self.rechazos = Contador("llm_cola_rechazos_total", "Peticiones rechazadas por control de admisión")
+
+    def _nuevo_evento(self):
+        return threading.Event()
+
+    def clasificar(self, prompt):
+        return CORTO if estimar_tokens(prompt) <= self.umbral_corto else NORMAL
+
+    def _retry_after(self):
+        return max(1, math.ceil(self._servicio_medio * (self._en_cola + 1) / self.trabajadores))
+
+    def admitir(self, usuario, prompt):
+        """Reserva un puesto en la cola; lanza ColaLlena si no hay sitio."""
+        clase = self.clasificar(prompt)
+        with self._lock:
+            if self._por_usuario.get(usuario, 0) >= self.max_por_usuario:
+                self.rechazos.inc(motivo="usuario")
+                raise ColaLlena("Demasiadas peticiones en curso para este usuario", self._retry_after())
+            if self._libres == 0 and self._en_cola >= self.max_cola:
+                self.rechazos.inc(motivo="cola")
+                raise ColaLlena("La cola del modelo está llena", self._retry_after())
+
+            ticket = Ticket(usuario, clase, self._nuevo_evento())
+            self._por_usuario[usuario] = self._por_usuario.get(usuario, 0) + 1
+            self._colas[clase].setdefault(usuario, deque()).append(ticket)
+            self._en_cola += 1
+            self._despachar()
+        return ticket
+
+    def _siguiente(self):
+        cortos, normales = self._colas[CORTO], self._colas[NORMAL]
+        # Prioridad a los cortos, pero cada MAX_CORTOS_SEGUIDOS entra un normal
+        if cortos and (not normales or self._cortos_seguidos < MAX_CORTOS_SEGUIDOS):
+            self._cortos_seguidos += 1
+            cola = cortos
+        else:
+            self._cortos_seguidos = 0
+            cola = normales
+        usuario, tickets = next(iter(cola.items()))
+        ticket = tickets.popleft()
+        del cola[usuario]
+        if tickets:
+            # El usuario pasa al final de la ronda
+            cola[usuario] = tickets
+        return ticket
+
+    def _despachar(self):
+        while self._libres > 0 and self._en_cola > 0:
+            ticket = self._siguiente()
+            self._en_cola -= 1
+            self._libres -= 1
+            ticket.concedido = time.perf_counter()
+            self.espera.observar(ticket.concedido - ticket.encolado, clase=ticket.clase)
+            ticket.evento.set()
+
+    def _cancelar(self, ticket):
+        with self._lock:
+            if ticket.concedido is not None:
+                return False
+            tickets = self._colas[ticket.clase].get(ticket.usuario)
+            tickets.remove(ticket)
+            if not tickets:
+                del self._colas[ticket.clase][ticket.usuario]
+            self._en_cola -= 1
+            self._restar_usuario(ticket.usuario)
+            return True
+
+    def _restar_usuario(self, usuario):
+        self._por_usuario[usuario] -= 1
+        if not self._por_usuario[usuario]:
+            del self._por_usuario[usuario]
+
+    def esperar(self, ticket, timeout=ESPERA_MAXIMA):
+        """Bloquea hasta que el ticket tiene trabajador; lanza ColaLlena si se agota la espera."""
+        if not ticket.evento.wait(timeout) and self._cancelar(ticket):
+            self.rechazos.inc(motivo="espera")
+            raise ColaLlena("Tiempo de espera en cola agotado", self._retry_after())
+
+    def liberar(self, ticket):
+        duracion = time.perf_counter() - ticket.concedido
+        self.servicio.observar(duracion, clase=ticket.clase)
+        with self._lock:
+            # Media móvil del tiempo de servicio para estimar Retry-After
+            self._servicio_medio = 0.8 * self._servicio_medio + 0.2 * duracion
+            self._libres += 1
+            self._restar_usuario(ticket.usuario)
+            self._despachar()
+
+    def estado(self):
+        with self._lock:
+            return {
+                "en_cola": self._en_cola,
+                "en_curso": self.trabajadores - self._libres,
+                "en_cola_por_clase": {clase: sum(map(len, cola.values())) for clase, cola in self._colas.items()}
+            }
+
+    def coleccionar(self):
+        estado = self.estado()
+        profundidad = Metrica("llm_cola_profundidad", "gauge", "Peticiones esperando en la cola del modelo")
+        for clase, cantidad in estado["en_cola_por_clase"].items():
+            profundidad.muestra(cantidad, clase=clase)
+        en_curso = Metrica("llm_en_curso", "gauge", "Generaciones ocupando un trabajador").muestra(estado["en_curso"])
+        return (
+            [profundidad, en_curso]
+            + self.espera.coleccionar()
+            + self.servicio.coleccionar()
+            + self.rechazos.coleccionar()
+        )
+
+
+class PlanificadorAsync(Planificador):
+    """Misma política con asyncio.Event; debe usarse desde un único event loop."""
+
+    def _nuevo_evento(self):
+        return asyncio.Event()
+
+    async def esperar(self, ticket, timeout=ESPERA_MAXIMA):
+        try:
+            await asyncio.wait_for(ticket.evento.wait(), timeout)
+        except asyncio.TimeoutError:
+            if self._cancelar(ticket):
+                self.rechazos.inc(motivo="espera")
+                raise ColaLlena("Tiempo de espera en cola agotado", self._retry_after())
+        except asyncio.CancelledError:
+            # El cliente se fue mientras esperaba: no dejar el ticket ocupando sitio
+            if not self._cancelar(ticket):
+                self.liberar(ticket)
+            raise
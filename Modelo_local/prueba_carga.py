@@ -0,0 +1,137 @@
+"""
+Prueba de carga: compara el modo síncrono (Flask) con el modo ASGI (llm_async)
+contra un Ollama simulado.
+
+El servidor síncrono atiende con un número fijo de hilos, como un despliegue
+con gunicorn; el ASGI corre en un único proceso con uvicorn.
+
+Uso:
+    python prueba_carga.py --peticiones 400 --concurrencia 200 --hilos 8 --retardo 0.02
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import uvicorn
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+import llm
+import llm_async
+from enrutador import Enrutador, EnrutadorAsync
+from ollama_simulado import iniciar_servidor
+from planificador import Planificador, PlanificadorAsync
+
+
+class ManejadorSilencioso(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class ServidorWSGIConHilos(BaseWSGIServer):
+    """Servidor WSGI que atiende como mucho `hilos` peticiones a la vez."""
+
+    def __init__(self, host, port, app, hilos):
+        super().__init__(host, port, app, handler=ManejadorSilencioso)
+        self.ejecutor = ThreadPoolExecutor(max_workers=hilos)
+
+    def process_request(self, request, client_address):
+        self.ejecutor.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def arrancar_sync(hilos):
+    servidor = ServidorWSGIConHilos("127.0.0.1", 0, llm.app, hilos)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_port}"
+
+
+def arrancar_async():
+    config = uvicorn.Config(llm_async.app, host="127.0.0.1", port=0, log_level="warning")
+    servidor = uvicorn.Server(config)
+    threading.Thread(target=servidor.run, daemon=True).start()
+    while not servidor.started:
+        time.sleep(0.05)
+    puerto = servidor.servers[0].sockets[0].getsockname()[1]
+    return servidor, f"http://127.0.0.1:{puerto}"
+
+
+async def lanzar_carga(url, peticiones, concurrencia):
+    limite = asyncio.Semaphore(concurrencia)
+    latencias = []
+    errores = 0
+
+    async with httpx.AsyncClient(timeout=300, limits=httpx.Limits(max_connections=concurrencia)) as http:
+        async def una_peticion(i):
+            nonlocal errores
+            async with limite:
+                inicio = time.perf_counter()
+                try:
+                    r = await http.post(f"{url}/", data={"prompt": f"pregunta {i}"})
+                    r.raise_for_status()
+                    latencias.append(time.perf_counter() - inicio)
+                except httpx.HTTPError:
+                    errores += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(una_peticion(i) for i in range(peticiones)))
+        duracion = time.perf_counter() - inicio
+
+    return duracion, sorted(latencias), errores
+
+
+def informe(nombre, duracion, latencias, errores):
+    p95 = latencias[int(len(latencias) * 0.95) - 1] if latencias else float("nan")
+    print(
+        f"{nombre:<6} {len(latencias) / duracion:8.1f} req/s   "
+        f"p50 {statistics.median(latencias) if latencias else float('nan'):6.3f}s   "
+        f"p95 {p95:6.3f}s   errores {errores}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga síncrona vs. asíncrona contra Ollama simulado")
+    parser.add_argument("--peticiones", type=int, default=400)
+    parser.add_argument("--concurrencia", type=int, default=200)
+    parser.add_argument("--hilos", type=int, default=8, help="Hilos del servidor síncrono")
+    parser.add_argument("--retardo", type=float, default=0.02, help="Segundos por token en el simulador")
+    args = parser.parse_args()
+
+    simulado = iniciar_servidor(retardo_token=args.retardo)
+    opciones = dict(
+        hosts=[simulado.url],
+        intervalo=0,
+        max_conexiones=args.concurrencia,
+        concurrencia_por_modelo=args.concurrencia
+    )
+    # Se mide el servidor, no la cola: el planificador deja pasar toda la concurrencia
+    cola = dict(trabajadores=args.concurrencia, max_cola=args.peticiones, max_por_usuario=args.peticiones)
+    llm.cliente = Enrutador(**opciones)
+    llm.planificador = Planificador(**cola)
+
+    servidor_sync, url_sync = arrancar_sync(args.hilos)
+    informe("sync", *asyncio.run(lanzar_carga(url_sync, args.peticiones, args.concurrencia)))
+    servidor_sync.shutdown()
+
+    servidor_async, url_async = arrancar_async()
+    llm_async.cliente = EnrutadorAsync(**opciones)
+    llm_async.planificador = PlanificadorAsync(**cola)
+    informe("async", *asyncio.run(lanzar_carga(url_async, args.peticiones, args.concurrencia)))
+    servidor_async.should_exit = True
+
+    simulado.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Bytes y CPU por turno de chat según el modo de respuesta.
+
+Compara tres formas de contestar un turno con el historial lleno:
+    inline  página completa con CSS y JS incrustados, plantilla compilada en cada petición
+    cache   página completa con la plantilla precompilada; CSS y JS van aparte
+    api     /api/chat, solo el par de mensajes nuevo en JSON
+
+El modelo es un Ollama simulado sin retardo, así que la diferencia entre modos
+es el coste de armar y enviar la respuesta. También se mide el render aislado
+y lo que cuestan los estáticos en la primera visita y con If-None-Match.
+
+Uso:
+    python prueba_render.py --turnos 200
+"""
+
+import argparse
+import os
+import time
+
+from ollama_simulado import iniciar_servidor
+
+simulado = iniciar_servidor()
+os.environ["OLLAMA_HOSTS"] = simulado.url
+
+import llm  # noqa: E402  (necesita OLLAMA_HOSTS antes de importarse)
+from enrutador import Enrutador  # noqa: E402
+from planificador import Planificador  # noqa: E402
+
+
+def nuevo_cliente():
+    cliente = llm.app.test_client()
+    # Historial lleno para que la página tenga su tamaño habitual
+    for i in range(llm.MAX_HISTORIAL // 2):
+        cliente.post("/api/chat", json={"prompt": f"pregunta previa {i}"})
+    return cliente
+
+
+def medir_turnos(modo, turnos):
+    cliente = nuevo_cliente()
+    if modo == "api":
+        enviar = lambda i: cliente.post("/api/chat", json={"prompt": f"pregunta {i}"})
+    else:
+        llm.MODO_RENDER = modo
+        enviar = lambda i: cliente.post("/", data={"prompt": f"pregunta {i}"})
+
+    total_bytes = 0
+    cpu = time.process_time()
+    for i in range(turnos):
+        respuesta = enviar(i)
+        assert respuesta.status_code == 200
+        total_bytes += len(respuesta.get_data())
+    cpu = time.process_time() - cpu
+    return total_bytes / turnos, cpu / turnos * 1000
+
+
+def medir_render(modo, repeticiones):
+    llm.MODO_RENDER = modo
+    historial = [
+        {"tipo": "usuario" if i % 2 == 0 else "asistente", "contenido": f"mensaje número {i} " * 10}
+        for i in range(llm.MAX_HISTORIAL)
+    ]
+    with llm.app.test_request_context():
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            llm.renderizar(historial)
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def medir_estaticos():
+    cliente = llm.app.test_client()
+    primera = revalidada = 0
+    for nombre in ("chat.css", "chat.js"):
+        respuesta = cliente.get(f"/static/{nombre}")
+        primera += len(respuesta.get_data())
+        respuesta = cliente.get(f"/static/{nombre}", headers={"If-None-Match": respuesta.headers["ETag"]})
+        assert respuesta.status_code == 304
+        revalidada += len(respuesta.get_data())
+    return primera, revalidada
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coste por turno de cada modo de respuesta del chat")
+    parser.add_argument("--turnos", type=int, default=200)
+    args = parser.parse_args()
+
+    llm.cliente = Enrutador(hosts=[simulado.url], intervalo=0)
+    llm.planificador = Planificador(max_por_usuario=args.turnos)
+    modo_original = llm.MODO_RENDER
+
+    print(f"{'modo':<8}{'bytes/turno':>12}{'CPU ms/turno':>14}{'render ms':>11}")
+    for modo in ("inline", "cache", "api"):
+        bytes_turno, cpu_turno = medir_turnos(modo, args.turnos)
+        render = f"{medir_render(modo, args.turnos):11.3f}" if modo != "api" else f"{'-':>11}"
+        print(f"{modo:<8}{bytes_turno:12.0f}{cpu_turno:14.3f}{render}")
+
+    primera, revalidada = medir_estaticos()
+    print(f"estáticos: {primera} bytes en la primera visita, {revalidada} al revalidar con ETag (304)")
+
+    llm.MODO_RENDER = modo_original
+    simulado.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+function scrollToBottom() {
+    var chatContainer = document.querySelector('.chat-container');
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+}
+window.addEventListener('load', function() {
+    scrollToBottom();
+    document.querySelector('.form-container').addEventListener('submit', enviarConStream);
+});
+
+function agregarMensaje(tipo, contenido) {
+    var chatContainer = document.querySelector('.chat-container');
+    var vacio = chatContainer.querySelector('.empty-chat');
+    if (vacio) { vacio.remove(); }
+    var div = document.createElement('div');
+    div.className = 'mensaje ' + tipo;
+    var autor = document.createElement('strong');
+    autor.textContent = tipo === 'usuario' ? 'Tú:' : 'Gemma:';
+    var texto = document.createElement('span');
+    texto.textContent = contenido;
+    div.appendChild(autor);
+    div.appendChild(document.createElement('br'));
+    div.appendChild(texto);
+    chatContainer.appendChild(div);
+    scrollToBottom();
+    return texto;
+}
+
+async function enviarJSON(datosForm, destino) {
+    // Sin streaming: /api/chat devuelve solo el par de mensajes nuevo
+    var respuesta = await fetch('/api/chat', { method: 'POST', body: datosForm });
+    if (!respuesta.ok) {
+        destino.textContent = await respuesta.text();
+        return;
+    }
+    var datos = await respuesta.json();
+    destino.textContent = datos.mensajes[datos.mensajes.length - 1].contenido;
+    scrollToBottom();
+}
+
+async function enviarConStream(evento) {
+    if (!window.fetch) { return; }
+    if (evento.submitter && evento.submitter.name === 'limpiar') { return; }
+    evento.preventDefault();
+    var form = evento.target;
+    var input = form.querySelector('input[name=prompt]');
+    var prompt = input.value.trim();
+    if (!prompt) { return; }
+    var datosForm = new FormData(form);
+    var botones = form.querySelectorAll('button');
+    botones.forEach(function (b) { b.disabled = true; });
+    agregarMensaje('usuario', prompt);
+    var destino = agregarMensaje('asistente', '');
+    input.value = '';
+    try {
+        if (!window.ReadableStream) {
+            await enviarJSON(datosForm, destino);
+            return;
+        }
+        var respuesta = await fetch('/stream', { method: 'POST', body: datosForm });
+        if (!respuesta.ok) {
+            destino.textContent = await respuesta.text();
+            return;
+        }
+        var lector = respuesta.body.getReader();
+        var decodificador = new TextDecoder();
+        var buffer = '';
+        while (true) {
+            var lectura = await lector.read();
+            if (lectura.done) { break; }
+            buffer += decodificador.decode(lectura.value, { stream: true });
+            var eventos = buffer.split('\n\n');
+            buffer = eventos.pop();
+            eventos.forEach(function (bloque) {
+                var datos = bloque.split('\n').filter(function (l) { return l.startsWith('data: '); });
+                if (datos.length === 0) { return; }
+                var dato = JSON.parse(datos[0].slice(6));
+                if (bloque.startsWith('event: fin')) {
+                    if (dato.eval_count) {
+                        destino.parentNode.title = 'Prompt: ' + dato.prompt_eval_count + ' tokens en ' +
+                            Math.round(dato.prompt_eval_ms) + ' ms · Respuesta: ' + dato.eval_count +
+                            ' tokens en ' + Math.round(dato.eval_ms) + ' ms (contexto ' + dato.contexto + ')';
+                    }
+                    return;
+                }
+                destino.textContent += dato.token;
+                scrollToBottom();
+            });
+        }
+    } catch (e) {
+        destino.textContent += ' [Error de conexión: ' + e + ']';
+    } finally {
+        botones.forEach(function (b) { b.disabled = false; });
+        input.focus();
+    }
+}
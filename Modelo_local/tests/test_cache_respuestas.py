@@ -0,0 +1,67 @@
+"""
+Pruebas de la caché de respuestas y sus backends.
+"""
+
+import time
+
+import pytest
+
+from cache_respuestas import CacheRespuestas, MemoriaLRU, SQLiteLRU, clave_cache
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def crear_backend(request, tmp_path):
+    def crear(**kwargs):
+        if request.param == "memoria":
+            return MemoriaLRU(**kwargs)
+        return SQLiteLRU(ruta=str(tmp_path / "cache.db"), **kwargs)
+    return crear
+
+
+def test_clave_normaliza_prompt():
+    assert clave_cache("gemma:2b", "  Hola   Mundo ") == clave_cache("gemma:2b", "hola mundo")
+    assert clave_cache("gemma:2b", "hola") != clave_cache("llama3", "hola")
+    assert clave_cache("gemma:2b", "hola", {"temperature": 0}) != clave_cache("gemma:2b", "hola")
+
+
+def test_acierto_y_fallo(crear_backend):
+    cache = CacheRespuestas(crear_backend())
+    assert cache.obtener("gemma:2b", "hola") is None
+    cache.guardar("gemma:2b", "hola", None, "respuesta")
+    assert cache.obtener("gemma:2b", "HOLA") == "respuesta"
+
+    stats = cache.estadisticas()
+    assert stats["aciertos"] == 1
+    assert stats["fallos"] == 1
+    assert stats["entradas"] == 1
+
+
+def test_expulsa_la_entrada_menos_usada(crear_backend):
+    cache = CacheRespuestas(crear_backend(max_entradas=2))
+    cache.guardar("m", "a", None, "A")
+    time.sleep(0.01)
+    cache.guardar("m", "b", None, "B")
+    time.sleep(0.01)
+    cache.obtener("m", "a")
+    time.sleep(0.01)
+    cache.guardar("m", "c", None, "C")
+
+    assert cache.obtener("m", "b") is None
+    assert cache.obtener("m", "a") == "A"
+    assert cache.obtener("m", "c") == "C"
+    assert cache.estadisticas()["expulsiones"] == 1
+
+
+def test_expira_por_ttl(crear_backend):
+    cache = CacheRespuestas(crear_backend(ttl=0.05))
+    cache.guardar("m", "a", None, "A")
+    time.sleep(0.1)
+
+    assert cache.obtener("m", "a") is None
+    assert cache.estadisticas()["expiraciones"] == 1
+
+
+def test_sqlite_sobrevive_a_reinicios(tmp_path):
+    ruta = str(tmp_path / "cache.db")
+    CacheRespuestas(SQLiteLRU(ruta=ruta)).guardar("m", "a", None, "A")
+    assert CacheRespuestas(SQLiteLRU(ruta=ruta)).obtener("m", "a") == "A"
@@ -0,0 +1,240 @@
+"""
+Pruebas del cliente compartido de Ollama contra un servidor simulado local.
+"""
+
+import asyncio
+import socket
+import threading
+
+import httpx
+import pytest
+import requests
+
+from cliente_ollama import ClienteOllama, ClienteOllamaAsync, ErrorHTTPOllama, ModeloOcupado
+from ollama_simulado import RESPUESTA, iniciar_servidor
+
+
+@pytest.fixture
+def servidor():
+    servidor = iniciar_servidor()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def texto(chunks):
+    return "".join(c.get("response", "") for c in chunks)
+
+
+def test_generar_devuelve_respuesta_completa(servidor):
+    cliente = ClienteOllama(host=servidor.url)
+    chunks = list(cliente.generar("gemma:2b", "hola"))
+
+    assert texto(chunks).strip() == RESPUESTA
+    assert chunks[-1]["done"] is True
+    assert "eval_count" in chunks[-1]
+
+
+def test_reutiliza_conexiones_del_pool(servidor):
+    cliente = ClienteOllama(host=servidor.url)
+    for _ in range(5):
+        list(cliente.generar("gemma:2b", "hola"))
+
+    stats = cliente.estadisticas()
+    assert stats["pool_fallos"] == 1
+    assert stats["pool_aciertos"] == 4
+    assert servidor.peticiones == 5
+
+
+def test_error_http(servidor):
+    cliente = ClienteOllama(host=servidor.url)
+    with pytest.raises(ErrorHTTPOllama) as info:
+        list(cliente.stream("/api/inexistente", {"model": "gemma:2b"}))
+    assert info.value.status_code == 404
+
+
+def test_reintenta_con_backoff_si_no_conecta():
+    cliente = ClienteOllama(
+        host=f"http://127.0.0.1:{puerto_libre()}", reintentos=2, backoff=0.01
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        list(cliente.generar("gemma:2b", "hola"))
+
+    stats = cliente.estadisticas()
+    assert stats["reintentos"] == 2
+    assert stats["errores_conexion"] == 1
+
+
+def test_timeout_de_lectura(servidor):
+    servidor.retardo_token = 0.5
+    cliente = ClienteOllama(host=servidor.url, timeout_lectura=0.1)
+    with pytest.raises((requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        list(cliente.generar("gemma:2b", "hola"))
+
+
+def test_limita_concurrencia_por_modelo(servidor):
+    servidor.retardo_token = 0.05
+    cliente = ClienteOllama(host=servidor.url, concurrencia_por_modelo=1, espera_cupo=0.05)
+
+    en_curso = cliente.generar("gemma:2b", "hola")
+    next(en_curso)
+    with pytest.raises(ModeloOcupado):
+        next(cliente.generar("gemma:2b", "hola"))
+
+    # Otro modelo tiene su propio cupo
+    assert next(cliente.generar("llama3", "hola"))["done"] is False
+
+    en_curso.close()
+    assert next(cliente.generar("gemma:2b", "hola"))["done"] is False
+    assert cliente.estadisticas()["rechazos_concurrencia"] == 1
+
+
+def test_peticiones_concurrentes(servidor):
+    servidor.retardo_token = 0.01
+    cliente = ClienteOllama(host=servidor.url, concurrencia_por_modelo=4)
+    resultados = []
+
+    def consultar():
+        resultados.append(texto(cliente.generar("gemma:2b", "hola")).strip())
+
+    hilos = [threading.Thread(target=consultar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert resultados == [RESPUESTA] * 8
+    assert cliente.estadisticas()["pool_fallos"] <= 4
+
+
+async def recoger(cliente, modelo="gemma:2b"):
+    """Consume una generación del cliente async y lo cierra."""
+    try:
+        return [chunk async for chunk in cliente.generar(modelo, "hola")]
+    finally:
+        await cliente.cerrar()
+
+
+def test_async_generar_devuelve_los_tokens(servidor):
+    cliente = ClienteOllamaAsync(host=servidor.url)
+    chunks = asyncio.run(recoger(cliente))
+
+    assert len(chunks) == len(RESPUESTA.split()) + 1
+    assert texto(chunks).strip() == RESPUESTA
+    assert chunks[-1]["done"] is True and "eval_count" in chunks[-1]
+    assert cliente.estadisticas()["peticiones"] == 1
+
+
+def test_async_reutiliza_conexiones_del_pool(servidor):
+    async def escenario():
+        cliente = ClienteOllamaAsync(host=servidor.url)
+        try:
+            for _ in range(5):
+                [chunk async for chunk in cliente.generar("gemma:2b", "hola")]
+            return cliente.estadisticas()
+        finally:
+            await cliente.cerrar()
+
+    stats = asyncio.run(escenario())
+    assert stats["pool_fallos"] == 1
+    assert stats["pool_aciertos"] == 4
+    assert servidor.peticiones == 5
+
+
+def test_async_error_http(servidor):
+    async def consultar():
+        cliente = ClienteOllamaAsync(host=servidor.url)
+        try:
+            return [chunk async for chunk in cliente.stream("/api/inexistente", {"model": "gemma:2b"})]
+        finally:
+            await cliente.cerrar()
+
+    with pytest.raises(ErrorHTTPOllama) as info:
+        asyncio.run(consultar())
+    assert info.value.status_code == 404
+
+
+def test_async_reintenta_con_backoff_hasta_conectar(monkeypatch):
+    puerto = puerto_libre()
+    esperas = []
+    servidores = []
+    dormir_real = asyncio.sleep
+
+    async def dormir(segundos):
+        esperas.append(segundos)
+        # Ollama arranca durante la segunda espera
+        if len(esperas) == 2:
+            servidores.append(iniciar_servidor(puerto=puerto))
+        await dormir_real(0)
+
+    monkeypatch.setattr(asyncio, "sleep", dormir)
+    cliente = ClienteOllamaAsync(host=f"http://127.0.0.1:{puerto}", reintentos=3, backoff=0.01)
+    try:
+        chunks = asyncio.run(recoger(cliente))
+    finally:
+        for servidor in servidores:
+            servidor.shutdown()
+            servidor.server_close()
+
+    assert texto(chunks).strip() == RESPUESTA
+    assert esperas == [0.01, 0.02]
+    assert cliente.estadisticas()["reintentos"] == 2
+    assert "errores_conexion" not in cliente.estadisticas()
+
+
+def test_async_se_rinde_tras_los_reintentos():
+    cliente = ClienteOllamaAsync(host=f"http://127.0.0.1:{puerto_libre()}", reintentos=2, backoff=0.01)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(recoger(cliente))
+
+    stats = cliente.estadisticas()
+    assert stats["reintentos"] == 2
+    assert stats["errores_conexion"] == 1
+
+
+def test_async_limita_concurrencia_por_modelo(servidor):
+    servidor.retardo_token = 0.05
+
+    async def escenario():
+        cliente = ClienteOllamaAsync(host=servidor.url, concurrencia_por_modelo=1, espera_cupo=0.05)
+        try:
+            en_curso = cliente.generar("gemma:2b", "hola")
+            await en_curso.__anext__()
+            with pytest.raises(ModeloOcupado):
+                await cliente.generar("gemma:2b", "hola").__anext__()
+
+            # Otro modelo tiene su propio cupo
+            otro = cliente.generar("llama3", "hola")
+            assert (await otro.__anext__())["done"] is False
+            await otro.aclose()
+
+            await en_curso.aclose()
+            siguiente = cliente.generar("gemma:2b", "hola")
+            assert (await siguiente.__anext__())["done"] is False
+            await siguiente.aclose()
+            return cliente.estadisticas()
+        finally:
+            await cliente.cerrar()
+
+    assert asyncio.run(escenario())["rechazos_concurrencia"] == 1
+
+
+def test_async_peticiones_concurrentes(servidor):
+    servidor.retardo_token = 0.01
+
+    async def escenario():
+        cliente = ClienteOllamaAsync(host=servidor.url, concurrencia_por_modelo=4)
+        try:
+            async def consultar():
+                return texto([chunk async for chunk in cliente.generar("gemma:2b", "hola")]).strip()
+            return await asyncio.gather(*(consultar() for _ in range(8)))
+        finally:
+            await cliente.cerrar()
+
+    assert asyncio.run(escenario()) == [RESPUESTA] * 8
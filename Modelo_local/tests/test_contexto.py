@@ -0,0 +1,54 @@
+"""
+Pruebas de la reutilización de contexto entre turnos.
+"""
+
+from contexto import cerrar_turno, preparar_turno, prompt_con_ventana
+from conversaciones import AlmacenMemoria
+
+
+def test_primer_turno_sin_contexto():
+    turno = preparar_turno(AlmacenMemoria(), "a", "hola")
+
+    assert turno.primero
+    assert turno.modo == "nuevo"
+    assert turno.opciones_payload == {}
+    assert turno.prompt_modelo == "hola"
+
+
+def test_reutiliza_contexto_devuelto_por_ollama():
+    almacen = AlmacenMemoria()
+    almacen.agregar("a", "usuario", "hola")
+    turno = preparar_turno(almacen, "a", "hola")
+    tiempos = cerrar_turno(almacen, turno, {"context": [1, 2, 3], "prompt_eval_count": 3, "eval_count": 5})
+    almacen.agregar("a", "asistente", "buenas")
+
+    siguiente = preparar_turno(almacen, "a", "¿y tú?")
+    assert siguiente.modo == "reutilizado"
+    assert siguiente.opciones_payload == {"context": [1, 2, 3]}
+    assert siguiente.prompt_modelo == "¿y tú?"
+    assert tiempos["prompt_eval_count"] == 3
+    assert tiempos["tokens_contexto"] == 3
+
+
+def test_reconstruye_con_ventana_si_se_pasa_del_presupuesto():
+    almacen = AlmacenMemoria()
+    almacen.agregar("a", "usuario", "primera pregunta")
+    almacen.agregar("a", "asistente", "primera respuesta")
+    almacen.guardar_contexto("a", list(range(100)))
+
+    turno = preparar_turno(almacen, "a", "segunda", max_tokens=50)
+    assert turno.modo == "reconstruido"
+    assert turno.opciones_payload == {}
+    assert "Asistente: primera respuesta" in turno.prompt_modelo
+    assert turno.prompt_modelo.endswith("Usuario: segunda")
+
+
+def test_ventana_descarta_los_turnos_mas_viejos():
+    historial = [
+        {"tipo": "usuario", "contenido": "viejo " * 50},
+        {"tipo": "asistente", "contenido": "reciente"}
+    ]
+    prompt = prompt_con_ventana(historial, "nuevo", presupuesto=20)
+
+    assert "viejo" not in prompt
+    assert "Asistente: reciente" in prompt
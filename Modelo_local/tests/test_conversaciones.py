@@ -0,0 +1,58 @@
+"""
+Pruebas del almacén de conversaciones en memoria y en SQLite.
+"""
+
+import pytest
+
+from conversaciones import AlmacenMemoria, AlmacenSQLite
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def crear_almacen(request, tmp_path):
+    def crear(**kwargs):
+        if request.param == "memoria":
+            return AlmacenMemoria(**kwargs)
+        return AlmacenSQLite(ruta=str(tmp_path / "conversaciones.db"), **kwargs)
+    return crear
+
+
+def test_agregar_y_leer_historial(crear_almacen):
+    almacen = crear_almacen()
+    almacen.agregar("a", "usuario", "hola")
+    almacen.agregar("a", "asistente", "buenas")
+    almacen.agregar("b", "usuario", "otra conversación")
+
+    assert almacen.historial("a") == [
+        {"tipo": "usuario", "contenido": "hola"},
+        {"tipo": "asistente", "contenido": "buenas"}
+    ]
+    assert almacen.historial("a", limite=1) == [{"tipo": "asistente", "contenido": "buenas"}]
+    assert almacen.historial("inexistente") == []
+    assert len(almacen) == 2
+
+
+def test_descarta_mensajes_mas_viejos(crear_almacen):
+    almacen = crear_almacen(max_mensajes=3)
+    for i in range(5):
+        almacen.agregar("a", "usuario", f"m{i}")
+        almacen.agregar("b", "usuario", f"otro{i}")
+
+    assert [m["contenido"] for m in almacen.historial("a")] == ["m2", "m3", "m4"]
+
+
+def test_limpiar(crear_almacen):
+    almacen = crear_almacen()
+    almacen.agregar("a", "usuario", "hola")
+    almacen.limpiar("a")
+
+    assert almacen.historial("a") == []
+    assert len(almacen) == 0
+
+
+def test_expira_conversaciones_inactivas(crear_almacen):
+    almacen = crear_almacen(ttl=60)
+    almacen.agregar("a", "usuario", "hola")
+
+    assert almacen.expirar() == 0
+    assert almacen.expirar(ahora=10**12) == 1
+    assert almacen.historial("a") == []
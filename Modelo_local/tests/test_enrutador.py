@@ -0,0 +1,109 @@
+"""
+Pruebas del reparto entre varios Ollama simulados.
+"""
+
+import threading
+
+import pytest
+import requests
+
+from enrutador import Enrutador
+from ollama_simulado import RESPUESTA, iniciar_servidor
+
+
+@pytest.fixture
+def servidores():
+    servidores = [iniciar_servidor() for _ in range(3)]
+    yield servidores
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def apagar(servidor):
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def texto(chunks):
+    return "".join(c.get("response", "") for c in chunks)
+
+
+def enrutador(servidores, **opciones):
+    return Enrutador(hosts=[s.url for s in servidores], intervalo=0, **opciones)
+
+
+def test_reparte_peticiones_concurrentes_entre_hosts(servidores):
+    for servidor in servidores:
+        servidor.retardo_token = 0.01
+    cliente = enrutador(servidores)
+    resultados = []
+
+    def consultar():
+        resultados.append(texto(cliente.generar("gemma:2b", "hola")).strip())
+
+    hilos = [threading.Thread(target=consultar) for _ in range(6)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert resultados == [RESPUESTA] * 6
+    assert [s.peticiones for s in servidores] == [2, 2, 2]
+    assert all(b["en_curso"] == 0 for b in cliente.estado())
+
+
+def test_prefiere_el_host_con_el_modelo_cargado(servidores):
+    for servidor in servidores:
+        servidor.retardo_carga = 0.05
+    cliente = enrutador(servidores)
+
+    primero = list(cliente.generar("gemma:2b", "hola"))
+    for _ in range(3):
+        final = list(cliente.generar("gemma:2b", "hola"))[-1]
+
+    assert primero[-1]["load_duration"] > 0
+    assert final["load_duration"] == 0
+    assert sum(s.cargas for s in servidores) == 1
+
+
+def test_pasa_al_siguiente_host_si_uno_esta_caido(servidores):
+    cliente = enrutador(servidores)
+    list(cliente.generar("gemma:2b", "hola"))
+    caliente = next(i for i, s in enumerate(servidores) if s.peticiones)
+    apagar(servidores[caliente])
+
+    for _ in range(3):
+        assert texto(cliente.generar("gemma:2b", "hola")).strip() == RESPUESTA
+
+    estado = cliente.estado()
+    assert estado[caliente]["sano"] is False
+    assert estado[caliente]["caidas"] == 1
+    assert sum(s.peticiones for s in servidores) == 4
+
+
+def test_sin_hosts_disponibles(servidores):
+    for servidor in servidores:
+        apagar(servidor)
+    cliente = enrutador(servidores)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        list(cliente.generar("gemma:2b", "hola"))
+    assert all(not b["sano"] for b in cliente.estado())
+
+
+def test_chequeo_lee_modelos_cargados_y_keep_alive_los_fija(servidores):
+    cliente = enrutador(servidores, modelos_fijos=["gemma:2b"], keep_alive="1m")
+    cliente.comprobar()
+    assert all(b["sano"] and b["cargados"] == [] for b in cliente.estado())
+
+    cliente.mantener_calientes()
+    assert sum(s.cargas for s in servidores) == 1
+    assert sum(s.peticiones for s in servidores) == 1
+
+    cliente.comprobar()
+    assert sum("gemma:2b" in b["cargados"] for b in cliente.estado()) == 1
+
+    apagar(servidores[1])
+    cliente.comprobar()
+    assert cliente.estado()[1]["sano"] is False
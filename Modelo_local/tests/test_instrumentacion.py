@@ -0,0 +1,48 @@
+"""
+Pruebas de la instrumentación de latencias del chat.
+"""
+
+import logging
+
+from instrumentacion import Instrumentacion
+from metricas import Registro
+
+
+def test_histogramas_con_las_cifras_de_ollama():
+    instrumentacion = Instrumentacion()
+    medicion = instrumentacion.medicion(sid="a")
+    for _ in range(3):
+        medicion.token()
+    medicion.final = {
+        "total_duration": 2_000_000_000, "load_duration": 1_500_000_000,
+        "prompt_eval_count": 12, "eval_count": 3, "eval_duration": 300_000_000
+    }
+    with medicion.renderizando():
+        pass
+    medicion.cerrar()
+
+    expuesto = Registro()
+    expuesto.registrar(instrumentacion)
+    expuesto = expuesto.exponer()
+    assert 'ollama_carga_segundos_bucket{le="1"} 0' in expuesto
+    assert 'ollama_carga_segundos_bucket{le="2.5"} 1' in expuesto
+    assert 'ollama_tokens_prompt_bucket{le="16"} 1' in expuesto
+    assert 'llm_primer_token_segundos_count{origen="ollama"} 1' in expuesto
+    assert "llm_render_segundos_count 1" in expuesto
+    assert "llm_tokens_por_segundo_count 1" in expuesto
+
+
+def test_linea_de_log_por_peticion(caplog):
+    instrumentacion = Instrumentacion(log_peticiones=True)
+    medicion = instrumentacion.medicion(sid="a", ruta="/stream")
+    medicion.origen = "cache"
+    medicion.token()
+
+    with caplog.at_level(logging.INFO, logger="llm.peticiones"):
+        medicion.cerrar()
+
+    assert '"ruta": "/stream"' in caplog.text
+    assert '"origen": "cache"' in caplog.text
+    assert "llm_tokens_por_segundo" not in "\n".join(
+        m.exponer() for m in instrumentacion.coleccionar() if m.muestras
+    )
@@ -0,0 +1,295 @@
+"""
+Pruebas de las rutas del chat (Flask y ASGI) sin Ollama.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+from starlette.testclient import TestClient
+
+import llm
+import llm_async
+from cache_respuestas import CacheRespuestas, MemoriaLRU
+from enrutador import EnrutadorAsync
+from ollama_simulado import RESPUESTA, iniciar_servidor
+
+
+CHUNKS = [
+    {"response": "Hola"},
+    {"response": ", mundo"},
+    {"response": "", "done": True, "context": [1, 2, 3], "eval_count": 2}
+]
+
+
+def generar_simulado(modelo, prompt, **opciones):
+    return iter(CHUNKS)
+
+
+def eventos_sse(texto):
+    return [evento for evento in texto.split("\n\n") if evento]
+
+
+def sid_de(cliente):
+    with cliente.session_transaction() as sesion:
+        return sesion["sid"]
+
+
+def falla_almacen(*args, **kwargs):
+    raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.fixture
+def servidor():
+    servidor = iniciar_servidor()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def cerradas(monkeypatch):
+    """Mediciones cerradas durante la prueba."""
+    observadas = []
+    monkeypatch.setattr(llm.instrumentacion, "observar", observadas.append)
+    return observadas
+
+
+def test_stream_envia_cada_token_como_evento(monkeypatch):
+    monkeypatch.setattr(llm, "cache", None)
+    monkeypatch.setattr(llm.cliente, "generar", generar_simulado)
+
+    respuesta = llm.app.test_client().post("/stream", data={"prompt": "hola"})
+
+    assert respuesta.mimetype == "text/event-stream"
+    eventos = eventos_sse(respuesta.get_data(as_text=True))
+    respuesta.close()
+    assert eventos[:-1] == ['data: {"token": "Hola"}', 'data: {"token": ", mundo"}']
+    fin, datos = eventos[-1].split("\n")
+    assert fin == "event: fin"
+    assert json.loads(datos.removeprefix("data: "))["eval_count"] == 2
+
+
+def test_stream_guarda_la_respuesta_al_terminar(monkeypatch):
+    monkeypatch.setattr(llm, "cache", None)
+    monkeypatch.setattr(llm.cliente, "generar", generar_simulado)
+    cliente = llm.app.test_client()
+
+    respuesta = cliente.post("/stream", data={"prompt": "hola"}, buffered=False)
+    partes = iter(respuesta.response)
+    assert b"Hola" in next(partes)
+    sid = sid_de(cliente)
+    # Mientras el stream sigue abierto solo está el mensaje del usuario
+    assert llm.almacen.historial(sid) == [{"tipo": "usuario", "contenido": "hola"}]
+
+    assert b"event: fin" in b"".join(partes)
+    respuesta.close()
+    assert llm.almacen.historial(sid) == [
+        {"tipo": "usuario", "contenido": "hola"},
+        {"tipo": "asistente", "contenido": "Hola, mundo"}
+    ]
+    assert llm.almacen.contexto(sid) == [1, 2, 3]
+
+
+def test_stream_libera_el_trabajador_si_falla_el_almacen(monkeypatch):
+    monkeypatch.setattr(llm.almacen, "agregar", falla_almacen)
+
+    respuesta = llm.app.test_client().post("/stream", data={"prompt": "hola"})
+
+    assert respuesta.status_code == 500
+    assert llm.planificador.estado()["en_curso"] == 0
+
+
+def test_stream_cierra_la_medicion_si_el_cliente_corta(monkeypatch, cerradas):
+    monkeypatch.setattr(llm, "generar_ollama", lambda prompt, turno, medicion: iter(["Ho", "la"]))
+
+    respuesta = llm.app.test_client().post("/stream", data={"prompt": "hola"}, buffered=False)
+    assert b"Ho" in next(iter(respuesta.response))
+    respuesta.close()
+
+    assert len(cerradas) == 1
+    assert llm.planificador.estado()["en_curso"] == 0
+
+
+@pytest.mark.parametrize("ruta", ["/", "/stream"])
+def test_primer_token_incluye_la_espera_en_cola(monkeypatch, cerradas, ruta):
+    monkeypatch.setattr(llm, "cache", None)
+    monkeypatch.setattr(llm.cliente, "generar", generar_simulado)
+    esperar = llm.planificador.esperar
+
+    def esperar_con_cola(ticket):
+        time.sleep(0.05)
+        return esperar(ticket)
+    monkeypatch.setattr(llm.planificador, "esperar", esperar_con_cola)
+
+    respuesta = llm.app.test_client().post(ruta, data={"prompt": "hola"})
+    respuesta.get_data()
+    respuesta.close()
+
+    medicion, = cerradas
+    assert medicion.primer_token - medicion.inicio >= 0.05
+    assert medicion.resumen()["cola_s"] >= 0.05
+
+
+def test_stream_asgi_libera_el_trabajador_si_falla_el_almacen(monkeypatch):
+    monkeypatch.setattr(llm.almacen, "agregar", falla_almacen)
+
+    with TestClient(llm_async.app, raise_server_exceptions=False) as cliente:
+        respuesta = cliente.post("/stream", data={"prompt": "hola"})
+
+    assert respuesta.status_code == 500
+    assert llm_async.planificador.estado()["en_curso"] == 0
+
+
+def con_bucle_en_curso():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def test_asgi_llama_al_almacen_y_la_cache_fuera_del_bucle(monkeypatch):
+    llamadas = []
+
+    def vigilar(objeto, nombre):
+        metodo = getattr(objeto, nombre)
+
+        def envoltura(*args, **kwargs):
+            llamadas.append((nombre, con_bucle_en_curso()))
+            return metodo(*args, **kwargs)
+        monkeypatch.setattr(objeto, nombre, envoltura)
+
+    cache = CacheRespuestas(MemoriaLRU())
+    monkeypatch.setattr(llm_async, "cache", cache)
+    for objeto, nombres in ((llm.almacen, ("agregar", "historial", "limpiar")), (cache, ("obtener", "guardar"))):
+        for nombre in nombres:
+            vigilar(objeto, nombre)
+
+    async def generar(modelo, prompt, **kwargs):
+        yield {"response": "Hola", "done": True}
+    monkeypatch.setattr(llm_async.cliente, "generar", generar)
+
+    with TestClient(llm_async.app) as cliente:
+        assert cliente.post("/api/chat", json={"prompt": "hola"}).status_code == 200
+        assert "Hola" in cliente.post("/stream", data={"prompt": "hola"}).text
+        assert cliente.get("/").status_code == 200
+        assert cliente.post("/", data={"limpiar": "1"}).status_code == 200
+
+    assert {nombre for nombre, _ in llamadas} == {"agregar", "historial", "limpiar", "obtener", "guardar"}
+    assert not any(en_bucle for _, en_bucle in llamadas)
+
+
+def test_asgi_contra_ollama_simulado(monkeypatch, servidor):
+    monkeypatch.setattr(llm_async, "cliente", EnrutadorAsync(hosts=[servidor.url], intervalo=3600))
+    monkeypatch.setattr(llm_async, "cache", None)
+
+    with TestClient(llm_async.app) as cliente:
+        eventos = eventos_sse(cliente.post("/stream", data={"prompt": "hola"}).text)
+        mensajes = cliente.post("/api/chat", json={"prompt": "otra vez"}).json()["mensajes"]
+
+    tokens = [json.loads(evento.removeprefix("data: "))["token"] for evento in eventos[:-1]]
+    assert len(tokens) == len(RESPUESTA.split())
+    assert "".join(tokens).strip() == RESPUESTA
+    assert eventos[-1].startswith("event: fin\n")
+    assert mensajes[1] == {"tipo": "asistente", "contenido": RESPUESTA}
+    assert servidor.peticiones == 2
+
+
+@pytest.mark.parametrize("modo", ["wsgi", "asgi"])
+def test_metrics_expone_el_pool_de_conexiones(monkeypatch, modo):
+    if modo == "wsgi":
+        texto = llm.app.test_client().get("/metrics").get_data(as_text=True)
+    else:
+        with TestClient(llm_async.app) as cliente:
+            texto = cliente.get("/metrics").text
+
+    assert 'ollama_pool_conexiones_total{resultado="reutilizada"}' in texto
+    assert 'ollama_pool_conexiones_total{resultado="nueva"}' in texto
+    assert "ollama_reintentos_total" in texto
+
+
+@pytest.fixture(params=["wsgi", "asgi"])
+def cliente_http(request):
+    """Cliente de pruebas de la app Flask o de la ASGI."""
+    if request.param == "wsgi":
+        yield llm.app.test_client()
+    else:
+        with TestClient(llm_async.app) as cliente:
+            yield cliente
+
+
+def cuerpo(respuesta):
+    return respuesta.get_data() if hasattr(respuesta, "get_data") else respuesta.content
+
+
+@pytest.mark.parametrize("nombre, contenido", [("chat.css", llm.ESTILOS), ("chat.js", llm.SCRIPT)])
+def test_estaticos_con_etag_y_revalidacion(cliente_http, nombre, contenido):
+    url = f"/static/{nombre}?v={llm.VERSION_ESTATICOS}"
+    respuesta = cliente_http.get(url)
+
+    assert respuesta.status_code == 200
+    assert cuerpo(respuesta).decode("utf-8") == contenido
+    assert "max-age=31536000" in respuesta.headers["Cache-Control"]
+    etag = respuesta.headers["ETag"]
+
+    revalidada = cliente_http.get(url, headers={"If-None-Match": etag})
+    assert revalidada.status_code == 304
+    assert cuerpo(revalidada) == b""
+
+
+def test_api_chat_devuelve_solo_el_par_nuevo(monkeypatch):
+    monkeypatch.setattr(llm, "cache", None)
+    monkeypatch.setattr(llm.cliente, "generar", generar_simulado)
+    cliente = llm.app.test_client()
+
+    cliente.post("/api/chat", json={"prompt": "primera"})
+    respuesta = cliente.post("/api/chat", data={"prompt": "segunda"})
+
+    assert respuesta.get_json() == {"mensajes": [
+        {"tipo": "usuario", "contenido": "segunda"},
+        {"tipo": "asistente", "contenido": "Hola, mundo"}
+    ]}
+    assert len(llm.almacen.historial(sid_de(cliente))) == 4
+    assert cliente.post("/api/chat", json={}).status_code == 400
+
+
+def test_api_chat_asgi_devuelve_solo_el_par_nuevo(monkeypatch):
+    async def generar(modelo, prompt, **opciones):
+        for chunk in CHUNKS:
+            yield chunk
+    monkeypatch.setattr(llm_async, "cache", None)
+    monkeypatch.setattr(llm_async.cliente, "generar", generar)
+
+    with TestClient(llm_async.app) as cliente:
+        cliente.post("/api/chat", json={"prompt": "primera"})
+        mensajes = cliente.post("/api/chat", json={"prompt": "segunda"}).json()["mensajes"]
+
+    assert [m["contenido"] for m in mensajes] == ["segunda", "Hola, mundo"]
+
+
+def test_modos_de_render_equivalentes(monkeypatch):
+    historial = [
+        {"tipo": "usuario", "contenido": "<b>hola</b> & adiós"},
+        {"tipo": "asistente", "contenido": "Respuesta"}
+    ]
+    paginas = {}
+    for modo in ("inline", "cache"):
+        monkeypatch.setattr(llm, "MODO_RENDER", modo)
+        monkeypatch.setattr(llm_async, "MODO_RENDER", modo)
+        with llm.app.test_request_context():
+            paginas[modo] = llm.renderizar(historial)
+        # El modo ASGI produce la misma página
+        assert llm_async.renderizar(historial).body.decode("utf-8") == paginas[modo]
+
+    cabecera_inline, cuerpo_inline = paginas["inline"].split("</head>")
+    cabecera_cache, cuerpo_cache = paginas["cache"].split("</head>")
+    assert cuerpo_inline == cuerpo_cache
+    assert "&lt;b&gt;hola&lt;/b&gt; &amp; adiós" in cuerpo_cache
+    # Los mismos CSS y JS, incrustados o enlazados con su versión
+    assert llm.ESTILOS in cabecera_inline and llm.SCRIPT in cabecera_inline
+    assert f'href="/static/chat.css?v={llm.VERSION_ESTATICOS}"' in cabecera_cache
+    assert f'src="/static/chat.js?v={llm.VERSION_ESTATICOS}"' in cabecera_cache
+    assert llm.ESTILOS not in cabecera_cache
@@ -0,0 +1,84 @@
+"""
+Pruebas del planificador de peticiones delante del modelo.
+"""
+
+import pytest
+
+from planificador import ColaLlena, Planificador
+
+CORTO = "hola"
+LARGO = "explícame " * 50
+
+
+def test_concede_hasta_el_numero_de_trabajadores():
+    planificador = Planificador(trabajadores=2)
+    a = planificador.admitir("a", CORTO)
+    b = planificador.admitir("b", CORTO)
+    c = planificador.admitir("c", CORTO)
+
+    assert a.evento.is_set() and b.evento.is_set()
+    assert not c.evento.is_set()
+    assert planificador.estado()["en_cola"] == 1
+
+    planificador.liberar(a)
+    assert c.evento.is_set()
+
+
+def test_rechaza_con_retry_after_si_la_cola_esta_llena():
+    planificador = Planificador(trabajadores=1, max_cola=1)
+    planificador.admitir("a", CORTO)
+    planificador.admitir("b", CORTO)
+
+    with pytest.raises(ColaLlena) as error:
+        planificador.admitir("c", CORTO)
+    assert error.value.retry_after >= 1
+
+
+def test_limita_peticiones_por_usuario():
+    planificador = Planificador(trabajadores=4, max_por_usuario=1)
+    planificador.admitir("a", CORTO)
+
+    with pytest.raises(ColaLlena):
+        planificador.admitir("a", CORTO)
+    planificador.admitir("b", CORTO)
+
+
+def test_turnos_round_robin_entre_usuarios():
+    planificador = Planificador(trabajadores=1, max_por_usuario=3)
+    ocupado = planificador.admitir("x", CORTO)
+    tickets = [planificador.admitir(u, CORTO) for u in ("a", "a", "a", "b")]
+
+    orden = []
+    actual = ocupado
+    for _ in tickets:
+        planificador.liberar(actual)
+        actual = next(t for t in tickets if t.evento.is_set() and t not in orden)
+        orden.append(actual)
+
+    assert [t.usuario for t in orden] == ["a", "b", "a", "a"]
+
+
+def test_prioriza_prompts_cortos_sin_dejar_sin_turno_a_los_largos():
+    planificador = Planificador(trabajadores=1, max_por_usuario=10)
+    ocupado = planificador.admitir("l", LARGO)
+    pendientes = [planificador.admitir("l", LARGO)] + [planificador.admitir("c", CORTO) for _ in range(6)]
+
+    orden = []
+    actual = ocupado
+    while pendientes:
+        planificador.liberar(actual)
+        actual = next(t for t in pendientes if t.evento.is_set())
+        pendientes.remove(actual)
+        orden.append(actual.clase)
+
+    assert orden == ["corto"] * 4 + ["normal"] + ["corto"] * 2
+
+
+def test_espera_agotada_cancela_el_ticket():
+    planificador = Planificador(trabajadores=1)
+    planificador.admitir("a", CORTO)
+    ticket = planificador.admitir("b", CORTO)
+
+    with pytest.raises(ColaLlena):
+        planificador.esperar(ticket, timeout=0.01)
+    assert planificador.estado()["en_cola"] == 0
@@ -0,0 +1,80 @@
+"""
+Benchmark: loading the pizza dataset as the notebook does (serial cv2 loop, then
+load_dataset and the float64 flatten) against dataset.py, on a cold cache (decode
+in a process pool and write the .npy files) and on a warm one (open the memory map).
+
+Usage:
+    python benchmark_dataset.py <path_full> --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+import dataset
+
+
+def notebook_load(path_full, image_size):
+    """The loading cell, load_dataset and the standardization cell of the notebook."""
+    import cv2
+
+    x, y = [], []
+    for folder, label in dataset.CLASSES:
+        directory = os.path.join(path_full, folder)
+        for filename in os.listdir(directory):
+            img = cv2.imread(os.path.join(directory, filename))
+            if img is not None:
+                x.append(cv2.resize(img, image_size))
+                y.append(label)
+    x = np.array(x)
+    y = np.array(y).reshape(1, -1)
+    x_train, x_test, y_train, y_test = train_test_split(x, y.T, test_size=0.3, random_state=42, stratify=y.T)
+    train_set_x = x_train.reshape(x_train.shape[0], -1).T / 255.
+    test_set_x = x_test.reshape(x_test.shape[0], -1).T / 255.
+    return train_set_x, test_set_x
+
+
+def cached_load(path_full, image_size, cache_dir, workers):
+    x, y = dataset.load_images(path_full, image_size, cache_dir, workers)
+    train_set_x_orig, _, test_set_x_orig, _, _ = dataset.load_dataset(x, y)
+    train_set_x = train_set_x_orig.reshape(train_set_x_orig.shape[0], -1).T
+    test_set_x = test_set_x_orig.reshape(test_set_x_orig.shape[0], -1).T
+    return train_set_x, test_set_x
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    train_set_x, test_set_x = function(*args)
+    return time.perf_counter() - start, (train_set_x.nbytes + test_set_x.nbytes) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset loading: notebook loop vs cached loader")
+    parser.add_argument("path_full", help="directory with the pizza and not_pizza folders")
+    parser.add_argument("--size", type=int, default=128)
+    parser.add_argument("--workers", type=int, help="decoding processes (default: one per CPU)")
+    args = parser.parse_args()
+    image_size = (args.size, args.size)
+
+    cache_dir = tempfile.mkdtemp(prefix="pizza_cache_")
+    try:
+        rows = [
+            ("notebook (serial cv2, float64)", timed(notebook_load, args.path_full, image_size)),
+            ("dataset.py, cold cache", timed(cached_load, args.path_full, image_size, cache_dir, args.workers)),
+            ("dataset.py, warm cache", timed(cached_load, args.path_full, image_size, cache_dir, args.workers)),
+        ]
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print(f"{'':32} {'seconds':>9} {'train+test MiB':>15}")
+    for name, (seconds, mib) in rows:
+        print(f"{name:32} {seconds:9.3f} {mib:15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: time to reach a target accuracy with the notebook's training loop
+(float64, full-batch gradient descent) and with lr_nn (float32, shuffled
+mini-batches, Adam).
+
+The pizza dataset is downloaded from Kaggle, so the benchmark uses synthetic
+images of the same shape: pixels in 0-255 with a weak class signal spread over
+every pixel, split into train and test sets. Evaluation time is excluded from
+the training time; accuracy is checked on the training set after every update
+round (every `check_every` iterations for gradient descent, every epoch for
+mini-batches). The notebook's learning rate is the largest that still reaches
+the target on this data (0.002 and above oscillate). A second table times one
+full-batch gradient-descent iteration in each engine, the same update, to
+separate the float32/in-place gains from the mini-batch ones.
+
+Usage:
+    python benchmark_lr.py --num-px 128 --m-train 1400 --m-test 600 --target 95
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import lr_nn
+
+
+def make_dataset(m, num_px, seed, signal=1.0):
+    """Images of shape (m, num_px, num_px, 3) as uint8, and labels of shape (1, m)."""
+    rng = np.random.default_rng(seed)
+    dim = num_px * num_px * 3
+    direction = np.random.default_rng(1234).choice([-1.0, 1.0], size=dim)
+    y = rng.integers(0, 2, size=m)
+    images = np.empty((m, dim), dtype=np.uint8)
+    for i in range(m):
+        pixels = rng.normal(128, 40, size=dim) + signal * (2 * y[i] - 1) * direction
+        np.clip(pixels, 0, 255, out=pixels)
+        images[i] = pixels
+    return images.reshape(m, num_px, num_px, 3), y.reshape(1, m).astype(np.float64)
+
+
+# Notebook implementation (0_LR_NN_V2.ipynb), kept verbatim as the baseline
+
+def sigmoid(z):
+    return 1 / (1 + np.exp(-z))
+
+
+def propagate(w, b, X, Y):
+    m = X.shape[1]
+    A = sigmoid(np.dot(w.T, X) + b)
+    eps = 1e-8
+    cost = (-1 / m) * np.sum(Y * np.log(A + eps) + (1 - Y) * np.log(1 - A + eps))
+    dw = (1 / m) * np.dot(X, (A - Y).T)
+    db = (1 / m) * np.sum(A - Y)
+    return {"dw": dw, "db": db}, np.squeeze(cost)
+
+
+def predict(w, b, X):
+    m = X.shape[1]
+    Y_prediction = np.zeros((1, m))
+    w = w.reshape(X.shape[0], 1)
+    A = sigmoid(np.dot(w.T, X) + b)
+    for i in range(A.shape[1]):
+        if A[0, i] > 0.5:
+            Y_prediction[0, i] = 1
+        else:
+            Y_prediction[0, i] = 0
+    return Y_prediction
+
+
+def train_notebook(X, Y, learning_rate, target, max_iterations, check_every):
+    """Full-batch gradient descent as in the notebook; returns (seconds, iterations, w, b)."""
+    w, b = np.zeros((X.shape[0], 1)), 0.0
+    elapsed = 0.0
+    for i in range(1, max_iterations + 1):
+        start = time.perf_counter()
+        grads, cost = propagate(w, b, X, Y)
+        w = w - learning_rate * grads["dw"]
+        b = b - learning_rate * grads["db"]
+        elapsed += time.perf_counter() - start
+        if i % check_every == 0 and lr_nn.accuracy(lr_nn.predict(w, b, X), Y) >= target:
+            break
+    return elapsed, i, w, b
+
+
+def train_lr_nn(X, Y, learning_rate, target, max_epochs, batch_size, optimizer):
+    """lr_nn.optimize with an early-stopping callback; returns (seconds, epochs, w, b)."""
+    evaluation = {"seconds": 0.0, "epochs": 0}
+
+    def reached(epoch, params):
+        start = time.perf_counter()
+        evaluation["epochs"] = epoch + 1
+        done = lr_nn.accuracy(lr_nn.predict(params["w"], params["b"], X), Y) >= target
+        evaluation["seconds"] += time.perf_counter() - start
+        return done
+
+    w, b = lr_nn.initialize_with_zeros(X.shape[0])
+    start = time.perf_counter()
+    params, _, _ = lr_nn.optimize(w, b, X, Y, max_epochs, learning_rate, batch_size=batch_size,
+                                  optimizer=optimizer, cost_every=max_epochs + 1, callback=reached)
+    elapsed = time.perf_counter() - start - evaluation["seconds"]
+    return elapsed, evaluation["epochs"], params["w"], params["b"]
+
+
+def time_gd_iteration(X64, X32, Y, iterations):
+    """Seconds per full-batch GD iteration: notebook loop vs lr_nn.optimize."""
+    w, b = np.zeros((X64.shape[0], 1)), 0.0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        grads, cost = propagate(w, b, X64, Y)
+        w = w - 0.001 * grads["dw"]
+        b = b - 0.001 * grads["db"]
+    notebook = (time.perf_counter() - start) / iterations
+
+    w, b = lr_nn.initialize_with_zeros(X32.shape[0])
+    start = time.perf_counter()
+    lr_nn.optimize(w, b, X32, Y, iterations, 0.001)
+    return notebook, (time.perf_counter() - start) / iterations
+
+
+def time_predict(w, b, X, repeats=5):
+    best = {}
+    for name, function in (("loop", predict), ("vectorized", lr_nn.predict)):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function(w, b, X)
+            timings.append(time.perf_counter() - start)
+        best[name] = min(timings)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training time to a target accuracy: notebook vs lr_nn")
+    parser.add_argument("--num-px", type=int, default=128)
+    parser.add_argument("--m-train", type=int, default=1400)
+    parser.add_argument("--m-test", type=int, default=600)
+    parser.add_argument("--target", type=float, default=95.0, help="train accuracy to reach, in %%")
+    parser.add_argument("--gd-learning-rate", type=float, default=0.001)
+    parser.add_argument("--gd-max-iterations", type=int, default=2000)
+    parser.add_argument("--check-every", type=int, default=10)
+    parser.add_argument("--learning-rate", type=float, default=0.0005)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--optimizer", choices=lr_nn.OPTIMIZERS, default="adam")
+    parser.add_argument("--max-epochs", type=int, default=50)
+    args = parser.parse_args()
+
+    train_orig, Y_train = make_dataset(args.m_train, args.num_px, seed=0)
+    test_orig, Y_test = make_dataset(args.m_test, args.num_px, seed=1)
+    # Notebook preprocessing: float64, (features, examples)
+    X_train64 = train_orig.reshape(train_orig.shape[0], -1).T / 255
+    X_test64 = test_orig.reshape(test_orig.shape[0], -1).T / 255
+    X_train32 = lr_nn.flatten_images(train_orig)
+    X_test32 = lr_nn.flatten_images(test_orig)
+    print(f"{args.m_train} train / {args.m_test} test images of {args.num_px}x{args.num_px}x3, "
+          f"target train accuracy {args.target}%")
+    print(f"X_train: {X_train64.nbytes / 2**20:.0f} MiB as float64, {X_train32.nbytes / 2**20:.0f} MiB as float32\n")
+
+    results = [
+        ("notebook: float64 full-batch GD",
+         train_notebook(X_train64, Y_train, args.gd_learning_rate, args.target,
+                        args.gd_max_iterations, args.check_every), X_test64, "iterations"),
+        (f"lr_nn: float32 {args.optimizer}, batch {args.batch_size}",
+         train_lr_nn(X_train32, Y_train, args.learning_rate, args.target, args.max_epochs,
+                     args.batch_size, args.optimizer), X_test32, "epochs"),
+    ]
+    print(f"{'':38} {'seconds':>9} {'steps':>12} {'train %':>8} {'test %':>7}")
+    for name, (seconds, steps, w, b), X_test, unit in results:
+        X_train = X_train64 if X_test is X_test64 else X_train32
+        train_acc = lr_nn.accuracy(lr_nn.predict(w, b, X_train), Y_train)
+        test_acc = lr_nn.accuracy(lr_nn.predict(w, b, X_test), Y_test)
+        print(f"{name:38} {seconds:9.2f} {steps:>5} {unit:6} {train_acc:8.1f} {test_acc:7.1f}")
+    speedup = results[0][1][0] / results[1][1][0]
+    print(f"\nSpeed-up to {args.target}% train accuracy: {speedup:.1f}x")
+
+    notebook, engine = time_gd_iteration(X_train64, X_train32, Y_train, args.check_every)
+    print(f"full-batch GD iteration: notebook {notebook * 1000:.0f} ms, lr_nn {engine * 1000:.0f} ms "
+          f"({notebook / engine:.1f}x)")
+
+    w, b = results[0][1][2], results[0][1][3]
+    timings = time_predict(w, b, X_train64)
+    print(f"predict on {args.m_train} examples: loop {timings['loop'] * 1000:.1f} ms, "
+          f"vectorized {timings['vectorized'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
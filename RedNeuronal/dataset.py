@@ -0,0 +1,202 @@
+"""
+Cached, parallel loader for the pizza / not-pizza images.
+
+The first call decodes and resizes every image in a process pool and writes the
+result once to a .npy cache: uint8 images of shape (m, num_px, num_px, 3) and
+their labels. Later calls open the cache with mmap_mode="r", so nothing is decoded
+or copied; pages are read from disk as they are used. The cache name is a hash of
+the image size and of every source file's name, size and mtime, so adding,
+removing or editing a picture builds a new cache (and the old one is removed).
+
+Pixels stay uint8: lr_nn.optimize and lr_nn.predict take the flattened uint8
+images and scale them by 1/255 one batch at a time.
+
+Usage:
+    from dataset import load_images, load_dataset
+    x, y = load_images(path_full)        # replaces the loading cell
+    train_set_x_orig, train_set_y, test_set_x_orig, test_set_y, classes = load_dataset(x, y)
+    train_set_x = train_set_x_orig.reshape(train_set_x_orig.shape[0], -1).T   # still uint8
+
+    python dataset.py <path_full>        # builds the cache ahead of time
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Sub-directory of path_full and its label, in the order the notebook loads them
+CLASSES = (("pizza", 1), ("not_pizza", 0))
+IMAGE_SIZE = (128, 128)
+# Images sent to a worker at a time
+CHUNKSIZE = 16
+
+
+def read_image(path, image_size):
+    """
+    Decode and resize one picture as the notebook does (cv2, BGR channel order).
+
+    Arguments:
+    path -- path of the image file
+    image_size -- (width, height) passed to cv2.resize
+
+    Returns:
+    image -- uint8 array of shape (height, width, 3), or None if it cannot be decoded
+    """
+    import cv2
+
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    return cv2.resize(img, image_size)
+
+
+def _decode(job):
+    reader, path, image_size = job
+    return reader(path, image_size)
+
+
+def list_images(path_full):
+    """
+    List the pictures of every class.
+
+    Returns:
+    files -- list of (path, label), pizza first, each class sorted by file name
+    """
+    files = []
+    for folder, label in CLASSES:
+        directory = os.path.join(path_full, folder)
+        files.extend((os.path.join(directory, name), label) for name in sorted(os.listdir(directory)))
+    return files
+
+
+def cache_key(files, image_size):
+    """Hash of the image size and of the name, size and mtime of every source file."""
+    digest = hashlib.sha1(repr(tuple(image_size)).encode())
+    for path, label in files:
+        stat = os.stat(path)
+        digest.update(f"{label}/{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _build_cache(files, image_size, images_path, labels_path, workers, reader):
+    width, height = image_size
+    jobs = [(reader, path, tuple(image_size)) for path, _ in files]
+    tmp_path = f"{images_path}.{os.getpid()}.tmp"
+    images = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                       shape=(len(files), height, width, 3))
+    labels = []
+    if workers == 1:
+        decoded = map(_decode, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        decoded = executor.map(_decode, jobs, chunksize=CHUNKSIZE)
+    try:
+        # Results come back in order; unreadable files are skipped, as in the notebook
+        for img, (_, label) in zip(decoded, files):
+            if img is not None:
+                images[len(labels)] = img
+                labels.append(label)
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    m = len(labels)
+    if m < len(files):
+        # The .npy header fixes the shape: copy the decoded rows into a file of the right size
+        trimmed = np.lib.format.open_memmap(f"{tmp_path}.trim", mode="w+", dtype=np.uint8,
+                                            shape=(m, height, width, 3))
+        trimmed[:] = images[:m]
+        trimmed.flush()
+        del images, trimmed
+        os.replace(f"{tmp_path}.trim", tmp_path)
+    else:
+        images.flush()
+        del images
+    # Labels are written last: a cache counts only when both files exist
+    os.replace(tmp_path, images_path)
+    np.save(f"{labels_path}.{os.getpid()}.tmp.npy", np.array(labels, dtype=np.int64))
+    os.replace(f"{labels_path}.{os.getpid()}.tmp.npy", labels_path)
+
+
+def load_images(path_full, image_size=IMAGE_SIZE, cache_dir=None, workers=None, reader=read_image):
+    """
+    Load every picture of path_full, from the cache when the source files have not changed.
+
+    Arguments:
+    path_full -- directory with the pizza and not_pizza folders
+    image_size -- (width, height) of the resized images
+    cache_dir -- where the .npy cache is kept; defaults to path_full/.cache
+    workers -- processes used to decode the images; None uses one per CPU, 1 decodes in this process
+    reader -- reader(path, image_size) returning a uint8 image or None; must be picklable
+
+    Returns:
+    x -- read-only memory-mapped uint8 array of shape (m, height, width, 3)
+    y -- labels of shape (1, m), 1 for pizza and 0 for non-pizza
+    """
+    files = list_images(path_full)
+    cache_dir = cache_dir or os.path.join(path_full, ".cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    prefix = "{}x{}".format(*image_size)
+    key = cache_key(files, image_size)
+    images_path = os.path.join(cache_dir, f"images_{prefix}_{key}.npy")
+    labels_path = os.path.join(cache_dir, f"labels_{prefix}_{key}.npy")
+
+    if not (os.path.exists(images_path) and os.path.exists(labels_path)):
+        _build_cache(files, image_size, images_path, labels_path, workers, reader)
+        # Caches of older versions of the folder
+        for stale in glob.glob(os.path.join(cache_dir, f"*_{prefix}_*.npy")):
+            if stale not in (images_path, labels_path):
+                os.remove(stale)
+
+    x = np.load(images_path, mmap_mode="r")
+    y = np.load(labels_path).reshape(1, -1)
+    return x, y
+
+
+def load_dataset(x, y, test_size=0.3, random_state=42):
+    """
+    Split the images into training and testing sets with a 70/30 ratio, stratified
+    by label: the same split as the notebook's load_dataset.
+
+    Arguments:
+    x -- images of shape (m, num_px, num_px, 3), e.g. the memory map of load_images
+    y -- labels of shape (1, m)
+
+    Returns:
+    train_set_x_orig -- training set features (number of examples, num_px, num_px, 3), uint8
+    train_set_y_orig -- training set labels (1, number of examples)
+    test_set_x_orig -- test set features (number of examples, num_px, num_px, 3), uint8
+    test_set_y_orig -- test set labels (1, number of examples)
+    classes -- np.array([b'non-pizza', b'pizza'])
+    """
+    from sklearn.model_selection import train_test_split
+
+    # Splitting the indices gives the notebook's split without copying x first;
+    # each set is then read from the memory map once, still as uint8
+    train_index, test_index = train_test_split(np.arange(y.shape[1]), test_size=test_size,
+                                               random_state=random_state, stratify=y.T)
+    classes = np.array([b'non-pizza', b'pizza'])
+    return x[train_index], y[:, train_index], x[test_index], y[:, test_index], classes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check the image cache of the pizza dataset")
+    parser.add_argument("path_full", help="directory with the pizza and not_pizza folders")
+    parser.add_argument("--size", type=int, default=IMAGE_SIZE[0], help="num_px of the resized images")
+    parser.add_argument("--cache-dir")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    x, y = load_images(args.path_full, (args.size, args.size), args.cache_dir, args.workers)
+    print(f"{x.shape[0]} images ({int(y.sum())} pizza) of shape {x.shape[1:]} "
+          f"in {time.perf_counter() - start:.3f} s: {x.filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Logistic Regression with a Neural Network mindset, as a reusable training module.
+
+Same API as 0_LR_NN_V2.ipynb (sigmoid, initialize_with_zeros, propagate,
+optimize, predict, model) with a faster training engine:
+
+- shuffled mini-batch SGD, with optional momentum or Adam updates
+- float32 storage: half the memory traffic of float64 per pass over the images
+- batch, activation, gradient and optimizer buffers allocated once and updated in place
+- vectorized predict
+- uint8 images (as cached by dataset.py) are accepted as they are and scaled by
+  1/255 one batch at a time, so the float copy of the training set is never built
+
+The matrix-vector products go through numpy's BLAS, which uses every available core.
+With batch_size=None and optimizer="gd", optimize is the notebook's full-batch
+gradient descent.
+
+Usage:
+    from lr_nn import flatten_images, model
+    train_set_x = flatten_images(train_set_x_orig)
+    d = model(train_set_x, train_set_y, test_set_x, test_set_y,
+              num_iterations=20, learning_rate=0.001, batch_size=64, optimizer="adam")
+"""
+
+import numpy as np
+
+DTYPE = np.float32
+OPTIMIZERS = ("gd", "momentum", "adam")
+PIXEL_SCALE = 1 / 255
+# Examples converted to float at a time by predict() on uint8 images
+PREDICT_BLOCK = 256
+
+
+def sigmoid(z, out=None):
+    """
+    Compute the sigmoid of z
+
+    Arguments:
+    z -- A scalar or numpy array of any size.
+    out -- optional array to write the result into (may be z itself)
+
+    Return:
+    s -- sigmoid(z)
+    """
+    with np.errstate(over="ignore"):  # exp(-z) -> inf for very negative z, and 1/inf = 0
+        if out is None:
+            return 1 / (1 + np.exp(-z))
+        np.negative(z, out=out)
+        np.exp(out, out=out)
+        out += 1
+        np.reciprocal(out, out=out)
+    return out
+
+
+def initialize_with_zeros(dim, dtype=DTYPE):
+    """
+    This function creates a vector of zeros of shape (dim, 1) for w and initializes b to 0.
+
+    Argument:
+    dim -- size of the w vector we want (or number of parameters in this case)
+    dtype -- floating point type of w
+
+    Returns:
+    w -- initialized vector of shape (dim, 1)
+    b -- initialized scalar (corresponds to the bias)
+    """
+    w = np.zeros(shape=(dim, 1), dtype=dtype)
+    b = 0.0
+    return w, b
+
+
+def flatten_images(x_orig, dtype=DTYPE):
+    """
+    Flatten and standardize images without a float64 intermediate.
+
+    Arguments:
+    x_orig -- images of shape (number of examples, num_px, num_px, 3), values 0-255
+
+    Returns:
+    X -- array of shape (num_px * num_px * 3, number of examples), values in [0, 1].
+         It is the transpose of a C-ordered (examples, features) array, so every
+         example is contiguous in memory and mini-batches are cheap to gather.
+    """
+    X = x_orig.reshape(x_orig.shape[0], -1).astype(dtype)
+    X *= dtype(PIXEL_SCALE)
+    return X.T
+
+
+class _Buffers:
+    """Work arrays for one training run, sized for the largest batch."""
+
+    def __init__(self, batch_size, dim, dtype, gather=False, raw_dtype=None):
+        # x and y receive the shuffled mini-batches; a full batch is used in place
+        if gather:
+            self.x = np.empty((batch_size, dim), dtype=dtype)
+            self.y = np.empty(batch_size, dtype=dtype)
+        # uint8 pixels are gathered here before being scaled into x
+        if raw_dtype is not None:
+            self.raw = np.empty((batch_size, dim), dtype=raw_dtype)
+        self.a = np.empty(batch_size, dtype=dtype)
+        self.dz = np.empty(batch_size, dtype=dtype)
+        self.dw = np.empty(dim, dtype=dtype)
+
+
+def _cost(A, Y):
+    eps = 1e-8
+    m = A.shape[0]
+    return float((-1 / m) * np.sum(Y * np.log(A + eps) + (1 - Y) * np.log(1 - A + eps)))
+
+
+def _propagate_rows(w, b, X_rows, Y, buffers, compute_cost=True):
+    """
+    propagate() on examples stored as rows, writing into `buffers`.
+
+    Arguments:
+    w -- weights of shape (dim,)
+    X_rows -- data of shape (batch, dim)
+    Y -- labels of shape (batch,)
+
+    Returns:
+    db -- gradient of the bias (dw is left in buffers.dw)
+    cost -- cost of the batch, or None when compute_cost is False
+    """
+    n = X_rows.shape[0]
+    A = buffers.a[:n]
+    dz = buffers.dz[:n]
+
+    # FORWARD PROPAGATION
+    np.dot(X_rows, w, out=A)
+    A += b
+    sigmoid(A, out=A)
+    cost = _cost(A, Y) if compute_cost else None
+
+    # BACKWARD PROPAGATION
+    np.subtract(A, Y, out=dz)
+    np.dot(dz, X_rows, out=buffers.dw)
+    buffers.dw *= 1 / n
+    db = float(dz.sum()) / n
+    return db, cost
+
+
+def propagate(w, b, X, Y):
+    """
+    Implement the cost function and its gradient for the propagation explained above
+
+    Arguments:
+    w -- weights, a numpy array of size (num_px * num_px * 3, 1)
+    b -- bias, a scalar
+    X -- data of size (num_px * num_px * 3, number of examples)
+    Y -- true "label" vector (containing 0 if non-pizza, 1 if pizza) of size (1, number of examples)
+
+    Return:
+    grads -- dictionary with dw (same shape as w) and db (a float)
+    cost -- negative log-likelihood cost for logistic regression
+    """
+    dtype = np.result_type(w, X, np.float32)
+    X_rows = np.asarray(X, dtype=dtype).T
+    buffers = _Buffers(X_rows.shape[0], X_rows.shape[1], dtype)
+    y = np.asarray(Y, dtype=dtype).ravel()
+    db, cost = _propagate_rows(np.asarray(w, dtype=dtype).ravel(), b, X_rows, y, buffers)
+    grads = {"dw": buffers.dw.reshape(w.shape), "db": db}
+    return grads, np.squeeze(cost)
+
+
+def optimize(w, b, X, Y, num_iterations, learning_rate, print_cost=False,
+             batch_size=None, optimizer="gd", beta1=0.9, beta2=0.999, epsilon=1e-8,
+             seed=0, cost_every=None, callback=None, dtype=DTYPE):
+    """
+    This function optimizes w and b by running a gradient descent algorithm
+
+    Arguments:
+    w -- weights, a numpy array of size (num_px * num_px * 3, 1)
+    b -- bias, a scalar
+    X -- data of shape (num_px * num_px * 3, number of examples); float, or uint8 pixels
+         that are scaled by 1/255 as each batch is gathered
+    Y -- true "label" vector, of shape (1, number of examples)
+    num_iterations -- number of passes (epochs) over the training set
+    learning_rate -- learning rate of the update rule
+    print_cost -- True to print the cost every `cost_every` epochs
+    batch_size -- examples per update; None uses the whole set (one update per epoch)
+    optimizer -- "gd" (plain gradient descent), "momentum" or "adam"
+    beta1 -- momentum / Adam first moment decay
+    beta2 -- Adam second moment decay
+    epsilon -- Adam denominator guard
+    seed -- seed for the shuffling of mini-batches
+    cost_every -- epochs between recorded costs; defaults to 100 for full batch, 1 otherwise
+    callback -- optional callback(epoch, params); training stops early if it returns True
+    dtype -- floating point type used for X, w and every buffer
+
+    Returns:
+    params -- dictionary containing the weights w and bias b
+    grads -- dictionary containing the gradients of the last update
+    costs -- list of the costs recorded during the optimization (mean batch cost of the epoch)
+    """
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f"optimizer must be one of {OPTIMIZERS}, got {optimizer!r}")
+    if np.shape(X)[-1] == 0:
+        raise ValueError("X has no examples")
+
+    # Examples as contiguous rows: no copy for arrays built with flatten_images,
+    # or for the transposed, flattened uint8 images of dataset.py
+    X_rows = np.asarray(X).T
+    pixels = np.issubdtype(X_rows.dtype, np.integer)
+    X_rows = np.ascontiguousarray(X_rows, dtype=None if pixels else dtype)
+    y = np.asarray(Y, dtype=dtype).ravel()
+    m, dim = X_rows.shape
+    full_batch = batch_size is None or batch_size >= m
+    batch_size = m if full_batch else batch_size
+    if pixels and full_batch:
+        # Every update reads every example: scale them once
+        X_rows = X_rows * dtype(PIXEL_SCALE)
+        pixels = False
+    if cost_every is None:
+        cost_every = 100 if full_batch else 1
+
+    w = np.array(w, dtype=dtype).reshape(dim)
+    b = float(b)
+    buffers = _Buffers(batch_size, dim, dtype, gather=not full_batch,
+                       raw_dtype=X_rows.dtype if pixels else None)
+    update = np.empty(dim, dtype=dtype)
+    # Gradients returned when no update runs (num_iterations=0)
+    buffers.dw.fill(0)
+    db = 0.0
+    if optimizer != "gd":
+        v_w, v_b = np.zeros(dim, dtype=dtype), 0.0
+    if optimizer == "adam":
+        s_w, s_b = np.zeros(dim, dtype=dtype), 0.0
+    rng = np.random.default_rng(seed)
+    costs = []
+    step = 0
+
+    for epoch in range(num_iterations):
+        record = epoch % cost_every == 0
+        order = None if full_batch else rng.permutation(m)
+        epoch_cost = 0.0
+
+        for start in range(0, m, batch_size):
+            if full_batch:
+                X_batch, y_batch = X_rows, y
+            else:
+                index = order[start:start + batch_size]
+                n = index.shape[0]
+                # mode="clip": with the default mode numpy copies through a temporary
+                if pixels:
+                    raw = np.take(X_rows, index, axis=0, out=buffers.raw[:n], mode="clip")
+                    X_batch = np.multiply(raw, dtype(PIXEL_SCALE), out=buffers.x[:n])
+                else:
+                    X_batch = np.take(X_rows, index, axis=0, out=buffers.x[:n], mode="clip")
+                y_batch = np.take(y, index, out=buffers.y[:n], mode="clip")
+
+            db, cost = _propagate_rows(w, b, X_batch, y_batch, buffers, compute_cost=record)
+            dw = buffers.dw
+            step += 1
+            if record:
+                epoch_cost += cost * X_batch.shape[0]
+
+            # Every array operation below writes into w, v_w, s_w or update
+            if optimizer == "gd":
+                np.multiply(dw, learning_rate, out=update)
+                b -= learning_rate * db
+            elif optimizer == "momentum":
+                v_w *= beta1
+                np.multiply(dw, 1 - beta1, out=update)
+                v_w += update
+                v_b = beta1 * v_b + (1 - beta1) * db
+                np.multiply(v_w, learning_rate, out=update)
+                b -= learning_rate * v_b
+            else:
+                v_w *= beta1
+                np.multiply(dw, 1 - beta1, out=update)
+                v_w += update
+                v_b = beta1 * v_b + (1 - beta1) * db
+                s_w *= beta2
+                np.square(dw, out=update)
+                update *= 1 - beta2
+                s_w += update
+                s_b = beta2 * s_b + (1 - beta2) * db * db
+                # Bias-corrected step: lr * v_hat / (sqrt(s_hat) + epsilon)
+                correction1 = 1 - beta1 ** step
+                correction2 = 1 - beta2 ** step
+                np.sqrt(s_w, out=update)
+                update *= 1 / np.sqrt(correction2)
+                update += epsilon
+                np.divide(v_w, update, out=update)
+                update *= learning_rate / correction1
+                b -= learning_rate * (v_b / correction1) / (np.sqrt(s_b / correction2) + epsilon)
+            w -= update
+
+        if record:
+            costs.append(epoch_cost / m)
+            if print_cost:
+                print("Cost after iteration %i: %f" % (epoch, costs[-1]))
+        if callback is not None and callback(epoch, {"w": w.reshape(dim, 1), "b": b}):
+            break
+
+    params = {"w": w.reshape(dim, 1), "b": b}
+    grads = {"dw": buffers.dw.reshape(dim, 1).copy(), "db": db}
+    return params, grads, costs
+
+
+def predict(w, b, X):
+    """
+    Predict whether the label is 0 or 1 using learned logistic regression parameters (w, b)
+
+    Arguments:
+    w -- weights, a numpy array of size (num_px * num_px * 3, 1)
+    b -- bias, a scalar
+    X -- data of size (num_px * num_px * 3, number of examples); float, or uint8 pixels
+
+    Returns:
+    Y_prediction -- a numpy array (vector) containing all predictions (0/1) for the examples in X
+    """
+    w = np.asarray(w).reshape(X.shape[0], 1)
+    if np.issubdtype(X.dtype, np.integer):
+        # Scale the weights instead of the pixels, and convert PREDICT_BLOCK images at a time
+        w = (w * PIXEL_SCALE).astype(DTYPE)
+        z = np.empty((1, X.shape[1]), dtype=DTYPE)
+        for start in range(0, X.shape[1], PREDICT_BLOCK):
+            block = X[:, start:start + PREDICT_BLOCK]
+            np.dot(w.T, block.astype(DTYPE), out=z[:, start:start + block.shape[1]])
+    else:
+        z = np.dot(w.T.astype(X.dtype, copy=False), X)
+    # sigmoid(z) > 0.5 exactly when z > 0, so the sigmoid itself is not needed
+    z += b
+    return (z > 0).astype(np.float64)
+
+
+def accuracy(Y_prediction, Y):
+    """Percentage of predictions equal to the labels."""
+    return 100 - np.mean(np.abs(Y_prediction - Y)) * 100
+
+
+def model(X_train, Y_train, X_test, Y_test, num_iterations=2000, learning_rate=0.5, print_cost=False,
+          **optimize_options):
+    """
+    Builds the logistic regression model by calling the function you've implemented previously
+
+    Arguments:
+    X_train -- training set represented by a numpy array of shape (num_px * num_px * 3, m_train)
+    Y_train -- training labels represented by a numpy array (vector) of shape (1, m_train)
+    X_test -- test set represented by a numpy array of shape (num_px * num_px * 3, m_test)
+    Y_test -- test labels represented by a numpy array (vector) of shape (1, m_test)
+    num_iterations -- number of epochs to optimize the parameters
+    learning_rate -- hyperparameter representing the learning rate used in the update rule of optimize()
+    print_cost -- Set to true to print the cost while training
+    optimize_options -- batch_size, optimizer, seed... forwarded to optimize()
+
+    Returns:
+    d -- dictionary containing information about the model.
+    """
+    w, b = initialize_with_zeros(X_train.shape[0], dtype=optimize_options.get("dtype", DTYPE))
+    parameters, grads, costs = optimize(w, b, X_train, Y_train, num_iterations, learning_rate, print_cost,
+                                        **optimize_options)
+    w = parameters["w"]
+    b = parameters["b"]
+
+    Y_prediction_test = predict(w, b, X_test)
+    Y_prediction_train = predict(w, b, X_train)
+
+    print("train accuracy: {} %".format(accuracy(Y_prediction_train, Y_train)))
+    print("test accuracy: {} %".format(accuracy(Y_prediction_test, Y_test)))
+
+    d = {"costs": costs,
+         "Y_prediction_test": Y_prediction_test,
+         "Y_prediction_train": Y_prediction_train,
+         "w": w,
+         "b": b,
+         "learning_rate": learning_rate,
+         "num_iterations": num_iterations,
+         "batch_size": optimize_options.get("batch_size"),
+         "optimizer": optimize_options.get("optimizer", "gd")}
+
+    return d
@@ -0,0 +1,97 @@
+"""
+Tests for the cached image loader, with a stand-in for cv2 that reads the
+pixel value from the file contents.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import dataset
+import lr_nn
+
+
+def fake_reader(path, image_size):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data:
+        return None
+    width, height = image_size
+    return np.full((height, width, 3), data[0], dtype=np.uint8)
+
+
+def failing_reader(path, image_size):
+    raise AssertionError("the cache should have been used")
+
+
+@pytest.fixture
+def path_full(tmp_path):
+    for folder, label in dataset.CLASSES:
+        os.makedirs(tmp_path / folder)
+        for i in range(6):
+            (tmp_path / folder / f"{i}.jpg").write_bytes(bytes([label * 100 + i]))
+    return tmp_path
+
+
+def cache_files(path_full):
+    return sorted(os.listdir(path_full / ".cache"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_images(path_full, workers):
+    x, y = dataset.load_images(str(path_full), (4, 3), workers=workers, reader=fake_reader)
+    assert x.shape == (12, 3, 4, 3) and x.dtype == np.uint8
+    assert y.tolist() == [[1] * 6 + [0] * 6]
+    assert x[:, 0, 0, 0].tolist() == [100, 101, 102, 103, 104, 105, 0, 1, 2, 3, 4, 5]
+
+
+def test_second_load_opens_the_cache(path_full):
+    first, _ = dataset.load_images(str(path_full), (4, 4), workers=1, reader=fake_reader)
+    second, y = dataset.load_images(str(path_full), (4, 4), workers=1, reader=failing_reader)
+    assert isinstance(second, np.memmap) and not second.flags.writeable
+    np.testing.assert_array_equal(first, second)
+    assert len(cache_files(path_full)) == 2
+
+
+def test_changed_file_rebuilds_the_cache(path_full):
+    dataset.load_images(str(path_full), (4, 4), workers=1, reader=fake_reader)
+    before = cache_files(path_full)
+    picture = path_full / "pizza" / "0.jpg"
+    picture.write_bytes(bytes([42]))
+    os.utime(picture, ns=(1, 1))
+
+    x, _ = dataset.load_images(str(path_full), (4, 4), workers=1, reader=fake_reader)
+    assert x[0, 0, 0, 0] == 42
+    after = cache_files(path_full)
+    assert len(after) == 2 and not set(before) & set(after)
+
+
+def test_unreadable_images_are_skipped(path_full):
+    (path_full / "not_pizza" / "broken.jpg").write_bytes(b"")
+    x, y = dataset.load_images(str(path_full), (4, 4), workers=1, reader=fake_reader)
+    assert x.shape[0] == y.shape[1] == 12
+
+
+def test_load_dataset_split(path_full):
+    x, y = dataset.load_images(str(path_full), (4, 4), workers=1, reader=fake_reader)
+    train_x, train_y, test_x, test_y, classes = dataset.load_dataset(x, y, test_size=0.5)
+    assert train_x.shape == test_x.shape == (6, 4, 4, 3)
+    assert train_y.sum() == test_y.sum() == 3
+    # Labels travel with their images
+    np.testing.assert_array_equal(train_x[:, 0, 0, 0] >= 100, train_y[0] == 1)
+    assert classes.tolist() == [b'non-pizza', b'pizza']
+
+
+def test_lr_nn_scales_uint8_pixels_per_batch():
+    images = np.random.default_rng(0).integers(0, 256, size=(200, 6, 6, 3), dtype=np.uint8)
+    Y = (images[:, 0, 0, 0] > 127).astype(np.float64).reshape(1, -1)
+    X_uint8 = images.reshape(200, -1).T
+    X_float = lr_nn.flatten_images(images)
+    w = np.zeros((X_float.shape[0], 1))
+    for batch_size in (None, 32):
+        from_uint8 = lr_nn.optimize(w, 0.0, X_uint8, Y, 3, 0.01, batch_size=batch_size, optimizer="adam")[0]
+        from_float = lr_nn.optimize(w, 0.0, X_float, Y, 3, 0.01, batch_size=batch_size, optimizer="adam")[0]
+        np.testing.assert_array_equal(from_uint8["w"], from_float["w"])
+    np.testing.assert_array_equal(lr_nn.predict(from_uint8["w"], from_uint8["b"], X_uint8),
+                                  lr_nn.predict(from_uint8["w"], from_uint8["b"], X_float))
@@ -0,0 +1,109 @@
+"""
+Tests for the logistic-regression training module against the notebook implementation.
+"""
+
+import numpy as np
+import pytest
+
+import lr_nn
+
+
+def notebook_propagate(w, b, X, Y):
+    m = X.shape[1]
+    A = 1 / (1 + np.exp(-(np.dot(w.T, X) + b)))
+    eps = 1e-8
+    cost = (-1 / m) * np.sum(Y * np.log(A + eps) + (1 - Y) * np.log(1 - A + eps))
+    return (1 / m) * np.dot(X, (A - Y).T), (1 / m) * np.sum(A - Y), cost
+
+
+def separable_data(m=400, dim=50, seed=0):
+    rng = np.random.default_rng(seed)
+    true_w = rng.normal(size=(dim, 1))
+    X = rng.normal(size=(dim, m))
+    Y = (true_w.T @ X > 0).astype(np.float64)
+    return X, Y
+
+
+def test_propagate_matches_notebook():
+    w, b, X, Y = np.array([[1.], [2.]]), 2, np.array([[1., 2., -1], [3., 4., -3.2]]), np.array([[1, 0, 1]])
+    grads, cost = lr_nn.propagate(w, b, X, Y)
+    dw, db, expected_cost = notebook_propagate(w, b, X, Y)
+    assert grads["dw"].shape == w.shape
+    np.testing.assert_allclose(grads["dw"], dw)
+    assert grads["db"] == pytest.approx(db)
+    assert cost == pytest.approx(expected_cost)
+
+
+def test_full_batch_gd_matches_notebook_loop():
+    X, Y = separable_data()
+    w, b = np.zeros((X.shape[0], 1)), 0.0
+    for _ in range(30):
+        dw, db, _ = notebook_propagate(w, b, X, Y)
+        w, b = w - 0.1 * dw, b - 0.1 * db
+
+    params, grads, costs = lr_nn.optimize(np.zeros((X.shape[0], 1)), 0.0, X, Y, 30, 0.1, dtype=np.float64)
+    np.testing.assert_allclose(params["w"], w)
+    assert params["b"] == pytest.approx(b)
+    assert grads["dw"].shape == w.shape
+    assert len(costs) == 1
+
+
+@pytest.mark.parametrize("optimizer,learning_rate", [("gd", 0.5), ("momentum", 0.5), ("adam", 0.05)])
+def test_mini_batch_optimizers_learn(optimizer, learning_rate):
+    X, Y = separable_data()
+    w, b = lr_nn.initialize_with_zeros(X.shape[0])
+    params, _, costs = lr_nn.optimize(w, b, X, Y, 20, learning_rate, batch_size=32,
+                                      optimizer=optimizer)
+    assert params["w"].dtype == np.float32
+    assert len(costs) == 20 and costs[-1] < costs[0]
+    assert lr_nn.accuracy(lr_nn.predict(params["w"], params["b"], X), Y) >= 95
+
+
+def test_callback_stops_training():
+    X, Y = separable_data()
+    epochs = []
+    lr_nn.optimize(np.zeros((X.shape[0], 1)), 0.0, X, Y, 50, 0.05, batch_size=32,
+                   callback=lambda epoch, params: epochs.append(epoch) or epoch == 2)
+    assert epochs == [0, 1, 2]
+
+
+def test_same_seed_same_result():
+    X, Y = separable_data()
+    runs = [lr_nn.optimize(np.zeros((X.shape[0], 1)), 0.0, X, Y, 3, 0.01, batch_size=16, optimizer="adam", seed=7)[0]
+            for _ in range(2)]
+    np.testing.assert_array_equal(runs[0]["w"], runs[1]["w"])
+
+
+def test_predict_matches_thresholded_sigmoid():
+    X, _ = separable_data(seed=1)
+    w = np.random.default_rng(2).normal(size=(X.shape[0], 1))
+    expected = (lr_nn.sigmoid(w.T @ X + 0.3) > 0.5).astype(np.float64)
+    np.testing.assert_array_equal(lr_nn.predict(w, 0.3, X), expected)
+
+
+def test_flatten_images_is_scaled_float32():
+    images = np.random.default_rng(0).integers(0, 256, size=(4, 8, 8, 3), dtype=np.uint8)
+    X = lr_nn.flatten_images(images)
+    assert X.shape == (8 * 8 * 3, 4) and X.dtype == np.float32
+    np.testing.assert_allclose(X, images.reshape(4, -1).T / 255, rtol=1e-6)
+
+
+def test_unknown_optimizer():
+    X, Y = separable_data()
+    with pytest.raises(ValueError):
+        lr_nn.optimize(np.zeros((X.shape[0], 1)), 0.0, X, Y, 1, 0.1, optimizer="rmsprop")
+
+
+def test_zero_iterations_returns_initial_params():
+    X, Y = separable_data(m=20, dim=5)
+    w = np.arange(5, dtype=np.float32).reshape(5, 1)
+    params, grads, costs = lr_nn.optimize(w, 0.5, X, Y, 0, 0.1)
+    np.testing.assert_array_equal(params["w"], w)
+    assert params["b"] == 0.5
+    np.testing.assert_array_equal(grads["dw"], np.zeros((5, 1)))
+    assert grads["db"] == 0.0 and costs == []
+
+
+def test_optimize_without_examples():
+    with pytest.raises(ValueError, match="no examples"):
+        lr_nn.optimize(np.zeros((5, 1)), 0.0, np.zeros((5, 0)), np.zeros((1, 0)), 10, 0.1)